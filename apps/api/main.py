@@ -2,16 +2,140 @@
 
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
-from typing import Dict, List
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
+from typing import AsyncIterator, Callable, Dict, List, Optional, TypeVar
 from datetime import datetime, timedelta
 
+import asyncio
+import logging
 import os
-from ...packages.news.pipeline import run_pipeline
-from ...packages.news import repo as news_repo
-from ...packages.banks.providers import DemoBankProvider
+from dataclasses import asdict
+from functools import partial
+from ...packages.news.pipeline import persist_results, run_pipeline
+from ...packages.news.features import HashedTfidfVectorizer
+from ...packages.news.feedhealth import default_registry as feed_health_registry
+from ...packages.news.ingest import RSS_SOURCES
+from ...packages.news.scheduler import FeedScheduler
+from ...packages.news.vectorstore import VectorStore
+from ...packages.news.window import ArticleWindow
+from ...packages.news.subscriptions import CategoryTopicCache, DigestService, SubscriptionProfile
+from ...packages.news.snapshot import SnapshotReader
+from ...packages.news.async_repo import AsyncNewsRepository
+from ...packages.banks.registry import build_default_registry
+from ...packages.banks.sync import TransactionSyncEngine
+from ...packages.banks.analytics import TransactionFrame, day_to_iso, month_to_iso
+from ...packages.banks.categorise import Categoriser
+from ...packages.banks.webhooks import HMACVerifier, WebhookIngestor, WebhookVerificationError, parse_event
 
-app = FastAPI(title="wallet.dkoded.io API")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create long‑lived resources on startup and release them on shutdown.
+
+    The bank provider registry keeps one client per provider and user, with
+    pooled HTTP sessions and cached access tokens, for the lifetime of the
+    application.  The transaction sync engine owns the local ledger that
+    transaction endpoints are served from, and the categoriser keeps its
+    memoised descriptions across requests.
+
+    With ``NEWS_POLLING=1`` a :class:`FeedScheduler` polls the configured RSS
+    feeds in the background.  New items are added to a 24‑hour
+    :class:`ArticleWindow` and the pipeline re‑runs over the live window.
+    Feed health is saved only if this process owns its file (the first of
+    the API and the news worker to load it); otherwise it is refreshed from
+    the owner's saves.  Ownership is released on shutdown.
+
+    News database queries run on the dedicated threads of an
+    :class:`AsyncNewsRepository`, never on the event loop.  Pipeline results
+    are stored by its single writer thread as well.
+
+    Bank webhooks are queued on a :class:`WebhookIngestor`, whose worker
+    task syncs the affected accounts in batches.  On shutdown the queue is
+    drained first (up to ``BANK_WEBHOOK_DRAIN_TIMEOUT`` seconds), since the
+    queued events' idempotency keys are already recorded and their
+    redeliveries would be dropped as duplicates.
+
+    News digests are served from the latest snapshot in
+    ``NEWS_SNAPSHOT_PATH`` when one exists.  A read‑only replica
+    (``NEWS_READ_ONLY=1``) serves snapshots only and never runs the pipeline,
+    so it skips loading the clustering state.
+    """
+    app.state.bank_registry = build_default_registry()
+    app.state.transaction_sync = TransactionSyncEngine(BANK_DATABASE_PATH)
+    app.state.categoriser = Categoriser()
+    app.state.bank_webhooks = WebhookIngestor(app.state.transaction_sync, app.state.bank_registry.providers_for)
+    webhook_worker = asyncio.create_task(app.state.bank_webhooks.run())
+    app.state.news_snapshots = SnapshotReader(NEWS_SNAPSHOT_PATH)
+    app.state.feed_health = feed_health_registry()
+    app.state.news_db = AsyncNewsRepository(DATABASE_PATH, wal=not NEWS_READ_ONLY)
+    if not NEWS_READ_ONLY:
+        app.state.news_vectorizer = HashedTfidfVectorizer.load(NEWS_IDF_PATH)
+        app.state.news_vectors = VectorStore(NEWS_VECTOR_PATH, app.state.news_vectorizer.n_features)
+    app.state.digests = DigestService(CategoryTopicCache(DATABASE_PATH), CATEGORIES, DATABASE_PATH)
+    app.state.feed_scheduler = None
+    polling: Optional[asyncio.Task] = None
+    if os.environ.get('NEWS_POLLING') == '1' and not NEWS_READ_ONLY:
+        app.state.news_window = ArticleWindow()
+        app.state.feed_scheduler = FeedScheduler(
+            partial(_process_new_articles, app, app.state.news_window), health=app.state.feed_health
+        )
+        polling = asyncio.create_task(app.state.feed_scheduler.run())
+    try:
+        yield
+    finally:
+        if polling is not None:
+            app.state.feed_scheduler.stop()
+            await polling
+        try:
+            await asyncio.wait_for(app.state.bank_webhooks.drain(), BANK_WEBHOOK_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Stopping with %d bank webhook events still queued", app.state.bank_webhooks.stats()['queued']
+            )
+        app.state.bank_webhooks.stop()
+        await webhook_worker
+        await app.state.bank_registry.aclose()
+        app.state.news_db.close()
+        app.state.feed_health.close()
+        if not NEWS_READ_ONLY:
+            app.state.news_vectorizer.close()
+            app.state.news_vectors.close()
+
+
+async def _process_new_articles(app: FastAPI, window: ArticleWindow, articles: List) -> None:
+    """Add newly polled articles to the live window and re‑run the pipeline over it."""
+    await _run_news_pipeline(app, articles=articles, window=window)
+
+
+async def _run_news_pipeline(app: FastAPI, **kwargs) -> Dict[str, List[Dict]]:
+    """Run the pipeline with the application's shared state and store the results.
+
+    The pipeline runs on a worker thread; its results are saved by the news
+    database's writer thread, so a large save neither occupies a reader nor
+    competes with other writes.  A digest snapshot is then published for API
+    workers and replicas, and the shared per‑category topic cache is
+    invalidated so that digests pick up the new topics.
+    """
+    if NEWS_READ_ONLY:
+        raise HTTPException(status_code=503, detail="News pipeline is disabled on read-only replicas")
+    results = await asyncio.to_thread(
+        run_pipeline,
+        use_sample=True,
+        vectorizer=app.state.news_vectorizer,
+        vector_store=app.state.news_vectors,
+        scope=NEWS_CLUSTER_SCOPE,
+        **kwargs,
+    )
+    await app.state.news_db.write(persist_results, results, DATABASE_PATH, NEWS_SNAPSHOT_PATH)
+    app.state.digests.cache.invalidate()
+    return results
+
+
+app = FastAPI(title="wallet.dkoded.io API", lifespan=lifespan)
 
 # Determine the path to the SQLite database for storing news topics.  You can
 # override this via the DATABASE_PATH environment variable.  By default it
@@ -19,41 +143,81 @@ app = FastAPI(title="wallet.dkoded.io API")
 _default_db_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
 os.makedirs(_default_db_dir, exist_ok=True)
 DATABASE_PATH = os.environ.get('DATABASE_PATH', os.path.join(_default_db_dir, 'news.db'))
+# Local ledger of synced bank transactions (override via BANK_DATABASE_PATH).
+BANK_DATABASE_PATH = os.environ.get('BANK_DATABASE_PATH', os.path.join(_default_db_dir, 'bank.db'))
+# Persistent document frequencies for news clustering (override via NEWS_IDF_PATH).
+NEWS_IDF_PATH = os.environ.get('NEWS_IDF_PATH', os.path.join(_default_db_dir, 'news_idf.npz'))
+# Memory‑mapped article vectors (override via NEWS_VECTOR_PATH).
+NEWS_VECTOR_PATH = os.environ.get('NEWS_VECTOR_PATH', os.path.join(_default_db_dir, 'news_vectors'))
+# Cluster per category ('category') or across the whole corpus ('global').
+NEWS_CLUSTER_SCOPE = os.environ.get('NEWS_CLUSTER_SCOPE', 'category')
+# Published digest snapshots (override via NEWS_SNAPSHOT_PATH).
+NEWS_SNAPSHOT_PATH = os.environ.get('NEWS_SNAPSHOT_PATH', os.path.join(_default_db_dir, 'news_snapshots'))
+# Read‑only replicas serve news from snapshots only.
+NEWS_READ_ONLY = os.environ.get('NEWS_READ_ONLY') == '1'
 
 # Define the categories known to the system.  If you add new categories to the
 # pipeline, include them here so that the API knows which to return.
 CATEGORIES = ["Greece", "Netherlands", "Data Science", "AI", "Finance"]
 
+# Webhook signing secrets per bank provider, as "name=secret,name=secret".
+# Webhooks from providers without a secret are rejected.
+BANK_WEBHOOK_VERIFIERS = {
+    name.strip(): HMACVerifier(secret.strip())
+    for name, _, secret in (
+        item.partition('=') for item in os.environ.get('BANK_WEBHOOK_SECRETS', '').split(',') if '=' in item
+    )
+}
+# Seconds to wait on shutdown for queued webhook events to be synced.
+BANK_WEBHOOK_DRAIN_TIMEOUT = float(os.environ.get('BANK_WEBHOOK_DRAIN_TIMEOUT', '30'))
+
+T = TypeVar('T')
+
+# There is no authentication yet, so all banking requests are made on behalf of
+# a single demo user.
+DEFAULT_USER_ID = 'demo'
+
 
 @app.get("/news/daily")
-async def get_daily_news() -> Dict[str, List[Dict]]:
+async def get_daily_news(request: Request) -> Dict[str, List[Dict]]:
     """Return the top topics for each category from the last 24 hours.
 
-    This endpoint first tries to fetch topics from the database.  If there are
-    no topics stored (e.g. on first run), it executes the pipeline and
-    persists the output before returning the fresh results.
+    This endpoint serves the pre‑serialised digest of the latest snapshot
+    when it covers every category.  Otherwise it fetches topics from the
+    database.  If there are no topics stored (e.g. on first run), it executes
+    the pipeline and persists the output before returning the fresh results.
     """
+    snapshot = request.app.state.news_snapshots.current()
+    if snapshot is not None and snapshot.covers(CATEGORIES):
+        return Response(snapshot.digest_json(CATEGORIES), media_type='application/json')
+    if NEWS_READ_ONLY:
+        raise HTTPException(status_code=503, detail="No news snapshot published yet")
     # Attempt to read from DB
-    digest = news_repo.fetch_daily_digest(DATABASE_PATH, CATEGORIES)
+    digest = await request.app.state.news_db.fetch_daily_digest(CATEGORIES)
     if all(digest.get(cat) for cat in CATEGORIES):
         return digest
     # If no data yet, run the pipeline and store results
-    results = run_pipeline(use_sample=True, store_to_db=True, db_path=DATABASE_PATH)
+    results = await _run_news_pipeline(request.app)
     return results
 
 
 @app.get("/news/breaking")
-async def get_breaking_news() -> List[Dict]:
+async def get_breaking_news(request: Request) -> List[Dict]:
     """Return breaking news topics with high importance in the last hour."""
+    snapshot = request.app.state.news_snapshots.current()
+    if snapshot is not None:
+        return Response(snapshot.breaking_json(categories=CATEGORIES), media_type='application/json')
+    if NEWS_READ_ONLY:
+        raise HTTPException(status_code=503, detail="No news snapshot published yet")
     # Fetch the most recent topics from the DB for all categories
     import json
     from datetime import datetime, timedelta
 
     now = datetime.utcnow()
     breaking: List[Dict] = []
+    digest = await request.app.state.news_db.fetch_daily_digest(CATEGORIES, limit=10)
     for category in CATEGORIES:
-        topics = news_repo.fetch_top_topics(category, DATABASE_PATH, limit=10)
-        for topic in topics:
+        for topic in digest[category]:
             try:
                 published = datetime.fromisoformat(topic['published'])
             except Exception:
@@ -65,20 +229,223 @@ async def get_breaking_news() -> List[Dict]:
     return breaking
 
 
+@app.get("/news/feeds/health")
+async def get_feed_health(request: Request) -> List[Dict]:
+    """Return the fetch health of every configured RSS feed.
+
+    Each entry has the feed's ``category``, circuit ``state`` (``closed``,
+    ``open`` or ``half-open``), success and failure counts, last success and
+    error, latency percentiles and current timeout.  Health written by the
+    news worker in another process is picked up on every request.
+    """
+    health = request.app.state.feed_health
+    await asyncio.to_thread(health.refresh)
+    categories = {url: category for category, urls in RSS_SOURCES.items() for url in urls}
+    return [{'category': categories[entry['url']], **entry} for entry in health.snapshot(categories)]
+
+
+class SubscriptionIn(BaseModel):
+    """Body of ``PUT /news/subscriptions/{user_id}``."""
+
+    categories: List[str]
+    min_importance: float = Field(0.0, ge=0.0, le=1.0)
+    limit: int = Field(10, ge=1, le=50)
+
+
+@app.get("/news/subscriptions/{user_id}")
+async def get_subscription(user_id: str, request: Request) -> Dict:
+    """Return a user's subscription profile (the default one if none is stored)."""
+    profile = await request.app.state.news_db.read(request.app.state.digests.profile, user_id)
+    return {**asdict(profile), 'categories': list(profile.categories)}
+
+
+@app.put("/news/subscriptions/{user_id}")
+async def put_subscription(user_id: str, subscription: SubscriptionIn, request: Request) -> Dict:
+    """Create or replace a user's subscription profile."""
+    unknown = sorted(set(subscription.categories) - set(CATEGORIES))
+    if unknown or not subscription.categories:
+        raise HTTPException(status_code=400, detail=f"Unknown or missing categories: {unknown}")
+    profile = SubscriptionProfile(user_id, tuple(subscription.categories), subscription.min_importance, subscription.limit)
+    await request.app.state.news_db.write(request.app.state.digests.subscribe, profile)
+    return {**asdict(profile), 'categories': list(profile.categories)}
+
+
+@app.get("/news/digest")
+async def get_user_digest(request: Request, user_id: str = DEFAULT_USER_ID) -> List[Dict]:
+    """Return the top topics across the user's subscribed categories.
+
+    Digests are assembled from topic lists cached once per category and
+    shared between users, merged by importance.
+    """
+    return await request.app.state.news_db.read(request.app.state.digests.digest_for, user_id)
+
+
+@app.get("/news/search")
+async def search_news(
+    request: Request,
+    q: str,
+    category: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> List[Dict]:
+    """Search stored topics by full text, best matches first.
+
+    Every word in ``q`` must match; ``category`` may be repeated to restrict
+    the search to several categories.  Each result includes its ``category``,
+    BM25 ``rank`` and a ``snippet`` with matches wrapped in ``<mark>`` tags.
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    return await request.app.state.news_db.search_topics(q, categories=category, limit=limit, offset=offset)
+
+
 @app.get("/banks/balances")
-async def get_bank_balances() -> List[Dict]:
-    """Return the user's account balances from the demo provider."""
-    provider = DemoBankProvider()
-    return provider.get_balances()
+async def get_bank_balances(request: Request) -> List[Dict]:
+    """Return the user's account balances across all configured providers.
+
+    Providers are queried concurrently; a provider that fails or times out is
+    left out of the response rather than failing the request.  Provider
+    clients come from the application‑wide registry, so no per‑request client
+    setup (token exchange, TLS handshake) takes place.
+    """
+    aggregator = request.app.state.bank_registry.aggregator(DEFAULT_USER_ID)
+    result = await aggregator.get_balances()
+    return result.items
+
+
+@app.get("/banks/transactions/{account_id}")
+async def get_bank_transactions(
+    account_id: str,
+    request: Request,
+    since: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+) -> List[Dict]:
+    """Return transactions for an account from the local ledger.
+
+    The ledger is filled by :class:`TransactionSyncEngine`.  If the account has
+    never been synced, an initial sync of the providers that were never
+    synced runs first; afterwards requests are served from the ledger without
+    contacting the provider.  Accounts that no synced provider lists get a
+    404, without another sync; new accounts are picked up by ``POST
+    /banks/sync`` or webhooks.  Ledger reads run in a worker thread.
+    """
+    engine: TransactionSyncEngine = request.app.state.transaction_sync
+    providers = request.app.state.bank_registry.providers_for(DEFAULT_USER_ID)
+    return await asyncio.to_thread(_ledger_transactions, engine, providers, account_id, since, limit)
+
+
+def _ledger_transactions(engine: TransactionSyncEngine, providers: Dict, account_id: str, since: Optional[str], limit: int) -> List[Dict]:
+    """Sync the account first if it never was, then read it from the ledger (blocking)."""
+    if not any(engine.has_synced(name, account_id) for name in providers):
+        engine.ensure_synced(providers)
+        if not any(engine.has_synced(name, account_id) for name in providers):
+            raise HTTPException(status_code=404, detail=f"Unknown bank account {account_id}")
+    return engine.transactions(account_id, since=since, limit=limit)
+
+
+async def _analyse(request: Request, account_id: Optional[str], compute: Callable[[TransactionFrame], T]) -> T:
+    """Load ledger transactions (optionally for one account) into a frame and run ``compute`` on it.
+
+    Both run in a worker thread: with a large ledger, loading the rows alone
+    would otherwise block the event loop for every other route.
+    """
+    engine: TransactionSyncEngine = request.app.state.transaction_sync
+
+    def work() -> T:
+        return compute(TransactionFrame.from_rows(engine.transaction_rows([account_id] if account_id else None)))
+
+    return await asyncio.to_thread(work)
+
+
+@app.get("/banks/analytics/spend-by-day")
+async def get_spend_by_day(request: Request, account_id: Optional[str] = None) -> List[Dict]:
+    """Return total spending per day from the ledger."""
+    days, spend = await _analyse(request, account_id, TransactionFrame.spend_by_day)
+    return [{'date': day_to_iso(d), 'spend': int(c) / 100} for d, c in zip(days, spend)]
+
+
+@app.get("/banks/analytics/spend-by-merchant")
+async def get_spend_by_merchant(request: Request, account_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    """Return the merchants with the highest total spending."""
+    pairs = await _analyse(request, account_id, lambda frame: frame.spend_by_merchant(limit=limit))
+    return [{'merchant': merchant, 'spend': cents / 100} for merchant, cents in pairs]
+
+
+@app.get("/banks/analytics/spend-by-category")
+async def get_spend_by_category(request: Request, account_id: Optional[str] = None) -> List[Dict]:
+    """Return total spending per category (groceries, rent, transport, ...)."""
+    categoriser = request.app.state.categoriser
+    pairs = await _analyse(request, account_id, lambda frame: frame.spend_by_category(categoriser))
+    return [{'category': category, 'spend': cents / 100} for category, cents in pairs]
+
+
+@app.get("/banks/analytics/monthly")
+async def get_monthly_totals(request: Request, account_id: Optional[str] = None) -> List[Dict]:
+    """Return income, spending and net flow per calendar month."""
+    months, income, spend = await _analyse(request, account_id, TransactionFrame.monthly_totals)
+    return [
+        {'month': month_to_iso(m), 'income': int(i) / 100, 'spend': int(o) / 100, 'net': int(i - o) / 100}
+        for m, i, o in zip(months, income, spend)
+    ]
+
+
+@app.get("/banks/analytics/running-balance")
+async def get_running_balance(request: Request, account_id: Optional[str] = None, opening: float = 0.0) -> List[Dict]:
+    """Return the closing balance for every day with activity.
+
+    ``opening`` is the balance before the first stored transaction.
+    """
+    days, balance = await _analyse(request, account_id, lambda frame: frame.running_balance(round(opening * 100)))
+    return [{'date': day_to_iso(d), 'balance': int(b) / 100} for d, b in zip(days, balance)]
+
+
+@app.post("/banks/sync")
+async def sync_bank_transactions(request: Request) -> Dict:
+    """Fetch new transactions for all accounts into the local ledger.
+
+    Only the delta since each account's stored cursor is requested from the
+    provider.
+    """
+    engine: TransactionSyncEngine = request.app.state.transaction_sync
+    providers = request.app.state.bank_registry.providers_for(DEFAULT_USER_ID)
+    results = await asyncio.to_thread(engine.sync_all, providers)
+    return {"status": "synced", "accounts": [asdict(r) for r in results]}
+
+
+@app.post("/banks/webhooks/{provider}", status_code=202)
+async def receive_bank_webhook(provider: str, request: Request) -> Dict:
+    """Accept a provider's transaction notification.
+
+    The raw body must be signed with the provider's secret from
+    ``BANK_WEBHOOK_SECRETS``.  Events are deduplicated by idempotency key and
+    queued; the affected accounts are synced in the background, so the
+    provider gets its acknowledgement without waiting for the sync.
+    """
+    verifier = BANK_WEBHOOK_VERIFIERS.get(provider)
+    if verifier is None or provider not in request.app.state.bank_registry.names:
+        raise HTTPException(status_code=404, detail=f"No webhook configured for provider {provider}")
+    body = await request.body()
+    try:
+        verifier.verify(request.headers, body)
+        event = parse_event(provider, body, request.headers, DEFAULT_USER_ID)
+    except WebhookVerificationError as exc:
+        raise HTTPException(status_code=401, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        queued = await request.app.state.bank_webhooks.submit(event)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Webhook queue is full", headers={'Retry-After': '1'})
+    return {"status": "queued" if queued else "duplicate", "event_id": event.event_id}
 
 
 @app.post("/news/update")
-async def update_news() -> Dict:
+async def update_news(request: Request) -> Dict:
     """Trigger the news pipeline manually and persist the results.
 
     This endpoint runs the pipeline with sample data (or live RSS if configured),
     stores the output to the SQLite database, and returns a simple status
     message indicating success along with the list of updated categories.
     """
-    results = run_pipeline(use_sample=True, store_to_db=True, db_path=DATABASE_PATH)
+    results = await _run_news_pipeline(request.app)
     return {"status": "updated", "categories": list(results.keys())}
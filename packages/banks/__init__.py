@@ -4,7 +4,22 @@ This package defines a minimal interface for interacting with banking APIs and
 includes stub implementations for Plaid, TrueLayer and Tink.  Each provider
 class implements the same methods, enabling the rest of the application to
 interact with bank data without caring about the underlying provider.
+
+Async counterparts live in :mod:`.aio`, and :class:`ProviderAggregator` queries
+several providers concurrently.  :class:`ProviderRegistry` keeps long‑lived
+clients with pooled HTTP sessions, cached access tokens, rate‑limited
+schedulers and balance caches, and :class:`TransactionSyncEngine` mirrors
+transactions into a local ledger.  :class:`WebhookIngestor` keeps the ledger
+up to date from provider webhooks instead of polling.
 """
 
-from .base import BankProvider  # noqa: F401
+from .base import BankProvider, HTTPBankProvider  # noqa: F401
 from .providers import PlaidProvider, TrueLayerProvider, TinkProvider, DemoBankProvider  # noqa: F401
+from .aio import AsyncBankProvider, SyncProviderAdapter, as_async  # noqa: F401
+from .aggregate import ProviderAggregator, AggregateResult  # noqa: F401
+from .cache import CachedProvider  # noqa: F401
+from .ratelimit import TokenBucket, ProviderScheduler, RateLimitedProvider  # noqa: F401
+from .registry import ProviderRegistry, build_default_registry  # noqa: F401
+from .sync import TransactionSyncEngine, SyncResult  # noqa: F401
+from .synthetic import SyntheticBankProvider, SyntheticBankDataset  # noqa: F401
+from .webhooks import HMACVerifier, WebhookEvent, WebhookIngestor, WebhookVerificationError, parse_event  # noqa: F401
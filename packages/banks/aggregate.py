@@ -0,0 +1,115 @@
+"""Concurrent aggregation across several banking providers.
+
+A user may hold accounts at more than one provider (e.g. Plaid, TrueLayer and
+Tink).  :class:`ProviderAggregator` fans each request out to every configured
+provider at once, applies a per‑provider timeout and merges the results.  A
+provider that fails or times out does not fail the whole request: its error is
+recorded in :attr:`AggregateResult.errors` and the remaining providers' data is
+still returned.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Union
+import asyncio
+import logging
+
+from .aio import AsyncBankProvider, as_async
+from .base import BankProvider
+
+
+logger = logging.getLogger(__name__)
+
+# Default number of seconds to wait for a single provider before giving up.
+DEFAULT_TIMEOUT = 10.0
+
+
+@dataclass
+class AggregateResult:
+    """Merged output of a fan‑out call.
+
+    Attributes
+    ----------
+    items: list of dict
+        Records returned by all providers that answered in time.  Each record
+        is tagged with a ``provider`` key naming its source.
+    errors: dict
+        Mapping from provider name to a short description of why it did not
+        contribute (exception message or ``'timeout'``).
+    """
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def partial(self) -> bool:
+        """True when at least one provider failed to answer."""
+        return bool(self.errors)
+
+
+class ProviderAggregator:
+    """Query several providers concurrently and merge their results.
+
+    Parameters
+    ----------
+    providers: mapping
+        Mapping from provider name to a :class:`BankProvider` or
+        :class:`AsyncBankProvider`.  Synchronous providers are wrapped so that
+        they run in worker threads.
+    timeout: float, default 10.0
+        Seconds to wait for each provider before treating it as failed.
+    timeouts: mapping, optional
+        Per‑provider overrides of ``timeout`` keyed by provider name.
+    """
+
+    def __init__(
+        self,
+        providers: Mapping[str, Union[BankProvider, AsyncBankProvider]],
+        timeout: float = DEFAULT_TIMEOUT,
+        timeouts: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        self.providers: Dict[str, AsyncBankProvider] = {name: as_async(p) for name, p in providers.items()}
+        self.timeout = timeout
+        self.timeouts: Dict[str, float] = dict(timeouts or {})
+
+    async def _call(self, name: str, call: Callable[[AsyncBankProvider], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        timeout = self.timeouts.get(name, self.timeout)
+        return await asyncio.wait_for(call(self.providers[name]), timeout=timeout)
+
+    async def _fan_out(self, call: Callable[[AsyncBankProvider], Awaitable[List[Dict[str, Any]]]]) -> AggregateResult:
+        names = list(self.providers)
+        outcomes = await asyncio.gather(*(self._call(name, call) for name in names), return_exceptions=True)
+        result = AggregateResult()
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                logger.warning("Bank provider %s timed out", name)
+                result.errors[name] = 'timeout'
+                continue
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome
+                logger.warning("Bank provider %s failed: %s", name, outcome)
+                result.errors[name] = str(outcome) or type(outcome).__name__
+                continue
+            for item in outcome:
+                tagged = dict(item)
+                tagged.setdefault('provider', name)
+                result.items.append(tagged)
+        return result
+
+    async def get_accounts(self) -> AggregateResult:
+        """Return the accounts of every provider."""
+        return await self._fan_out(lambda p: p.get_accounts())
+
+    async def get_balances(self) -> AggregateResult:
+        """Return the balances of every provider."""
+        return await self._fan_out(lambda p: p.get_balances())
+
+    async def get_transactions(self, account_id: str) -> AggregateResult:
+        """Return the transactions for ``account_id`` from every provider.
+
+        Providers that do not know the account are expected to return an empty
+        list, so the merged result only contains the owning provider's data.
+        """
+        return await self._fan_out(lambda p: p.get_transactions(account_id))
@@ -0,0 +1,77 @@
+"""Asynchronous banking provider interface.
+
+Real banking APIs are network bound, so querying several providers one after
+the other (or from inside an ``async`` route with blocking calls) wastes most
+of the request time waiting on sockets.  This module defines
+:class:`AsyncBankProvider`, the coroutine counterpart of
+:class:`~packages.banks.base.BankProvider`, and :class:`SyncProviderAdapter`,
+which exposes any existing synchronous provider through the async interface by
+running its calls in a worker thread.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Union
+import asyncio
+
+from .base import BankProvider
+
+
+class AsyncBankProvider(ABC):
+    """Abstract base class for asynchronous banking providers.
+
+    The methods mirror :class:`~packages.banks.base.BankProvider` and return
+    the same payloads, but are coroutines so that many providers can be
+    awaited concurrently without blocking the event loop.
+    """
+
+    @abstractmethod
+    async def get_balances(self) -> List[Dict[str, Any]]:
+        """Return a list of account balance objects."""
+
+    @abstractmethod
+    async def get_transactions(self, account_id: str) -> List[Dict[str, Any]]:
+        """Return a list of recent transactions for the given account."""
+
+    @abstractmethod
+    async def get_accounts(self) -> List[Dict[str, Any]]:
+        """Return a list of accounts available to the user."""
+
+
+class SyncProviderAdapter(AsyncBankProvider):
+    """Expose a synchronous :class:`BankProvider` through the async interface.
+
+    Each call is executed with :func:`asyncio.to_thread`, so a slow provider
+    only occupies a worker thread and never stalls the event loop.
+
+    Parameters
+    ----------
+    provider: BankProvider
+        The synchronous provider to wrap.
+    """
+
+    def __init__(self, provider: BankProvider) -> None:
+        self.provider = provider
+
+    async def get_balances(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.provider.get_balances)
+
+    async def get_transactions(self, account_id: str) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.provider.get_transactions, account_id)
+
+    async def get_accounts(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.provider.get_accounts)
+
+
+def as_async(provider: Union[BankProvider, AsyncBankProvider]) -> AsyncBankProvider:
+    """Return ``provider`` as an :class:`AsyncBankProvider`.
+
+    Async providers are returned unchanged; synchronous providers are wrapped
+    in a :class:`SyncProviderAdapter`.
+    """
+    if isinstance(provider, AsyncBankProvider):
+        return provider
+    if isinstance(provider, BankProvider):
+        return SyncProviderAdapter(provider)
+    raise TypeError(f"Unsupported provider type: {type(provider).__name__}")
@@ -3,7 +3,16 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+import os
+
+from .session import AccessToken, TokenCache, create_session
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+# Seconds to wait for a provider's token endpoint.
+TOKEN_TIMEOUT = 10.0
 
 
 class BankProvider(ABC):
@@ -34,3 +43,120 @@ class BankProvider(ABC):
     @abstractmethod
     def get_accounts(self) -> List[Dict[str, Any]]:
         """Return a list of accounts available to the user."""
+
+    def get_transactions_since(self, account_id: str, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return the transactions added since ``cursor`` and the next cursor.
+
+        The default implementation treats the cursor as an ISO date
+        high‑water mark: it calls :meth:`get_transactions` and keeps the
+        transactions dated on or after the cursor.  The boundary day is
+        included because transactions can post late; re‑delivering them is
+        harmless since the ledger upserts by transaction ID.  Providers with a
+        native delta API (e.g. Plaid's ``/transactions/sync``) should override
+        this and return their own opaque cursor.
+
+        Parameters
+        ----------
+        account_id: str
+            The account to fetch.
+        cursor: str, optional
+            Cursor returned by the previous call, or ``None`` for a full sync.
+
+        Returns
+        -------
+        tuple
+            ``(transactions, next_cursor)``.
+        """
+        transactions = self.get_transactions(account_id)
+        if cursor is not None:
+            transactions = [tx for tx in transactions if str(tx.get('date', '')) >= cursor]
+        next_cursor = cursor
+        for tx in transactions:
+            date = str(tx.get('date') or '')
+            if date and (next_cursor is None or date > next_cursor):
+                next_cursor = date
+        return transactions, next_cursor
+
+
+class HTTPBankProvider(BankProvider):
+    """Base class for providers that talk to a remote HTTP API.
+
+    Instances are meant to be long‑lived: one client per provider and user,
+    sharing a pooled HTTP session and an access‑token cache (see
+    :mod:`packages.banks.session` and :class:`~packages.banks.registry.ProviderRegistry`).
+    ``requests`` is only imported once a session is created, so using the
+    package with non‑HTTP providers does not require it.
+
+    Access tokens are obtained with the OAuth 2.0 client‑credentials grant
+    against :attr:`token_url`.  Providers that authenticate differently
+    override :meth:`fetch_access_token`.
+
+    Parameters
+    ----------
+    user_id: str
+        Identifier of the user whose data this client accesses.
+    session: requests.Session, optional
+        Pooled HTTP session to issue requests with.  A new one is created when
+        omitted.
+    token_cache: TokenCache, optional
+        Cache used by :meth:`access_token`.  A private cache is created when
+        omitted.
+    client_id, client_secret: str, optional
+        OAuth client credentials.  Default to the ``<NAME>_CLIENT_ID`` and
+        ``<NAME>_CLIENT_SECRET`` environment variables, e.g.
+        ``TINK_CLIENT_ID``.
+    """
+
+    #: Short provider name, used to namespace cached tokens and credentials.
+    name = 'http'
+    #: OAuth token endpoint of the provider.
+    token_url: Optional[str] = None
+    #: OAuth scope requested with the client‑credentials grant, if any.
+    scope: Optional[str] = None
+
+    def __init__(
+        self,
+        user_id: str,
+        session: Optional[requests.Session] = None,
+        token_cache: Optional[TokenCache] = None,
+        *,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+    ) -> None:
+        self.user_id = user_id
+        self.session = session if session is not None else create_session()
+        self.token_cache = token_cache if token_cache is not None else TokenCache()
+        prefix = self.name.upper()
+        self.client_id = client_id if client_id is not None else os.environ.get(f'{prefix}_CLIENT_ID')
+        self.client_secret = client_secret if client_secret is not None else os.environ.get(f'{prefix}_CLIENT_SECRET')
+
+    def fetch_access_token(self) -> AccessToken:
+        """Exchange the client credentials for a new access token.
+
+        It is only called when the cached token is missing or about to
+        expire.
+
+        Raises
+        ------
+        ValueError
+            If the provider has no token endpoint or no credentials are
+            configured.
+        requests.HTTPError
+            If the token endpoint rejects the request.
+        """
+        if not self.token_url:
+            raise ValueError(f"{type(self).__name__} has no OAuth token endpoint")
+        if not self.client_id or not self.client_secret:
+            prefix = self.name.upper()
+            raise ValueError(f"Set {prefix}_CLIENT_ID and {prefix}_CLIENT_SECRET to authenticate with {self.name}")
+        data = {'grant_type': 'client_credentials', 'client_id': self.client_id, 'client_secret': self.client_secret}
+        if self.scope:
+            data['scope'] = self.scope
+        response = self.session.post(self.token_url, data=data, timeout=TOKEN_TIMEOUT)
+        response.raise_for_status()
+        payload = response.json()
+        return AccessToken.from_expires_in(payload['access_token'], payload.get('expires_in', 3600))
+
+    def access_token(self) -> str:
+        """Return a valid access token, refreshing it ahead of expiry."""
+        return self.token_cache.get(f"{self.name}:{self.user_id}", self.fetch_access_token)
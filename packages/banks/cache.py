@@ -0,0 +1,126 @@
+"""Balance and account caching with a staleness policy.
+
+Dashboards reload often, but balances and account lists change slowly.
+:class:`CachedProvider` wraps an :class:`~packages.banks.aio.AsyncBankProvider`
+and serves cached balances and accounts according to two thresholds:
+
+* younger than ``refresh_after``: served from the cache;
+* between ``refresh_after`` and ``max_staleness``: served from the cache while
+  a background refresh is queued at low priority (refresh‑ahead);
+* older than ``max_staleness`` or missing: fetched before responding.
+
+Concurrent requests for the same data share a single upstream call, and all
+upstream calls go through the provider's
+:class:`~packages.banks.ratelimit.ProviderScheduler`, so a burst of dashboard
+loads never turns into a burst of provider requests.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from .aio import AsyncBankProvider
+from .ratelimit import PRIORITY_INTERACTIVE, PRIORITY_REFRESH, ProviderScheduler
+
+
+logger = logging.getLogger(__name__)
+
+# Default maximum age (seconds) of cached balances and accounts.
+DEFAULT_MAX_STALENESS = 300.0
+
+
+@dataclass
+class _Entry:
+    value: List[Dict[str, Any]]
+    fetched_at: float
+
+
+class CachedProvider(AsyncBankProvider):
+    """Serve balances and accounts from a cache with refresh‑ahead.
+
+    Transactions are not cached (they are served from the ledger, see
+    :mod:`packages.banks.sync`) but are still routed through the scheduler.
+
+    Parameters
+    ----------
+    provider: AsyncBankProvider
+        The provider to wrap.
+    scheduler: ProviderScheduler, optional
+        Scheduler for outbound calls.  Without one, calls are made directly.
+    max_staleness: float, default 300.0
+        Maximum age in seconds of data served without waiting for the
+        provider.
+    refresh_after: float, optional
+        Age in seconds after which a background refresh is started.  Defaults
+        to half of ``max_staleness``.
+    """
+
+    def __init__(
+        self,
+        provider: AsyncBankProvider,
+        scheduler: Optional[ProviderScheduler] = None,
+        *,
+        max_staleness: float = DEFAULT_MAX_STALENESS,
+        refresh_after: Optional[float] = None,
+    ) -> None:
+        self.provider = provider
+        self.scheduler = scheduler
+        self.max_staleness = max_staleness
+        self.refresh_after = refresh_after if refresh_after is not None else max_staleness / 2
+        self._entries: Dict[str, _Entry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def _call(self, func: Callable[[], Awaitable[List[Dict[str, Any]]]], priority: int) -> List[Dict[str, Any]]:
+        if self.scheduler is None:
+            return await func()
+        return await self.scheduler.submit(func, priority)
+
+    def _load(self, key: str, func: Callable[[], Awaitable[List[Dict[str, Any]]]], priority: int) -> asyncio.Task:
+        """Start (or join) the single in‑flight fetch for ``key``."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, func, priority))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return task
+
+    async def _fetch(self, key: str, func: Callable[[], Awaitable[List[Dict[str, Any]]]], priority: int) -> List[Dict[str, Any]]:
+        value = await self._call(func, priority)
+        self._entries[key] = _Entry(value=value, fetched_at=time.monotonic())
+        return value
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background refresh failed: %s", task.exception())
+
+    async def _get(self, key: str, func: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+            if age < self.max_staleness:
+                if age >= self.refresh_after and key not in self._inflight:
+                    self._load(key, func, PRIORITY_REFRESH).add_done_callback(self._log_refresh_failure)
+                return entry.value
+        # Shield the shared fetch so one cancelled caller does not cancel it for the others
+        return await asyncio.shield(self._load(key, func, PRIORITY_INTERACTIVE))
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop cached data (``'balances'``, ``'accounts'`` or everything)."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_balances(self) -> List[Dict[str, Any]]:
+        return await self._get('balances', self.provider.get_balances)
+
+    async def get_accounts(self) -> List[Dict[str, Any]]:
+        return await self._get('accounts', self.provider.get_accounts)
+
+    async def get_transactions(self, account_id: str) -> List[Dict[str, Any]]:
+        return await self._call(lambda: self.provider.get_transactions(account_id), PRIORITY_INTERACTIVE)
@@ -0,0 +1,200 @@
+"""Rule‑based categorisation of bank transactions.
+
+Providers only give a free‑text ``description`` for most transactions, e.g.
+``"CARD PAYMENT TO TESCO STORES 3297 ON 12/03"``.  :class:`Categoriser` maps
+such descriptions to spending categories (groceries, rent, transport, ...)
+using merchant keywords and aliases:
+
+* all keywords are compiled into a single Aho–Corasick automaton, so a
+  description is scanned once regardless of how many rules exist;
+* descriptions are normalised (case, digits, punctuation, boilerplate words)
+  so that variants of the same merchant collapse to the same string;
+* results are memoised by raw and by normalised description.  Transaction
+  histories repeat the same merchants constantly, so most lookups in a batch
+  are dictionary hits.
+
+When several keywords match, the longest (most specific) one wins; ties go to
+the rule listed first.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+import re
+
+
+# Category -> merchant keywords and aliases.  Keywords match whole words of the
+# normalised description (see :func:`normalise_description`).
+DEFAULT_RULES: Dict[str, List[str]] = {
+    'groceries': [
+        'tesco', 'sainsbury', 'sainsburys', 'asda', 'aldi', 'lidl', 'albert heijn', 'ah to go', 'jumbo',
+        'plus supermarkt', 'carrefour', 'sklavenitis', 'ab vassilopoulos', 'masoutis', 'spar', 'coop',
+        'whole foods', 'supermarket', 'supermarkt',
+    ],
+    'rent': ['rent', 'huur', 'landlord', 'letting agent', 'enoikio'],
+    'transport': [
+        'uber', 'bolt', 'lyft', 'ns reizigers', 'ns groep', 'ov chipkaart', 'gvb', 'ret', 'tfl', 'trainline',
+        'shell', 'bp', 'esso', 'texaco', 'oasa', 'aegean', 'klm', 'ryanair', 'easyjet', 'parking',
+    ],
+    'eating_out': [
+        'restaurant', 'cafe', 'starbucks', 'costa', 'mcdonalds', 'burger king', 'kfc', 'deliveroo',
+        'thuisbezorgd', 'just eat', 'uber eats', 'efood', 'wolt', 'pizza',
+    ],
+    'utilities': ['vattenfall', 'eneco', 'essent', 'dei', 'british gas', 'edf', 'water', 'ziggo', 'kpn', 'vodafone', 'cosmote', 'energy'],
+    'subscriptions': ['netflix', 'spotify', 'disney plus', 'apple com bill', 'google storage', 'youtube premium', 'amazon prime', 'patreon'],
+    'shopping': ['amazon', 'amzn mktp', 'bol com', 'zalando', 'ikea', 'hema', 'action', 'primark', 'h m', 'zara', 'mediamarkt', 'coolblue'],
+    'health': ['pharmacy', 'apotheek', 'boots', 'etos', 'kruidvat', 'dentist', 'tandarts', 'hospital', 'gym', 'basic fit'],
+    'income': ['salary', 'salaris', 'payroll', 'wages', 'dividend', 'interest'],
+    'transfers': ['transfer', 'tikkie', 'revolut', 'wise', 'paypal', 'savings'],
+    'cash': ['atm', 'cash withdrawal', 'geldautomaat'],
+}
+
+DEFAULT_CATEGORY = 'other'
+
+# Words that carry no merchant information and are dropped during normalisation.
+_NOISE_WORDS = frozenset({
+    'card', 'payment', 'payments', 'to', 'from', 'pos', 'purchase', 'debit', 'credit', 'contactless',
+    'ref', 'reference', 'on', 'at', 'ltd', 'bv', 'inc', 'gmbh', 'sa', 'nl', 'gb', 'gr', 'eur', 'gbp', 'usd',
+    'betaalautomaat', 'ideal', 'sepa', 'visa', 'mastercard', 'maestro',
+})
+_NON_ALPHA = re.compile(r'[^a-z]+')
+
+
+def normalise_description(description: str) -> str:
+    """Return a canonical form of a transaction description.
+
+    Lower‑cases the text, replaces digits and punctuation with spaces and drops
+    boilerplate words such as ``card payment``, so
+    ``"CARD PAYMENT TO TESCO STORES 3297 ON 12/03"`` becomes ``"tesco stores"``.
+    """
+    words = _NON_ALPHA.sub(' ', description.lower()).split()
+    return ' '.join(w for w in words if w not in _NOISE_WORDS)
+
+
+class _Automaton:
+    """Aho–Corasick automaton over whole‑word keywords.
+
+    Keywords and input are wrapped in single spaces, so a match can only start
+    and end on word boundaries.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, str]]) -> None:
+        # Node 0 is the root.  ``best`` holds (length, -rule_index, category) of
+        # the best keyword ending at the node or any of its suffixes.
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.best: List[Optional[Tuple[int, int, str]]] = [None]
+        for index, (keyword, category) in enumerate(keywords):
+            pattern = f" {keyword} "
+            node = 0
+            for char in pattern:
+                nxt = self.goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.best.append(None)
+                node = nxt
+            candidate = (len(pattern), -index, category)
+            if self.best[node] is None or candidate > self.best[node]:
+                self.best[node] = candidate
+        self._link()
+
+    def _link(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                target = self.goto[state].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                inherited = self.best[self.fail[child]]
+                if inherited is not None and (self.best[child] is None or inherited > self.best[child]):
+                    self.best[child] = inherited
+
+    def search(self, text: str) -> Optional[str]:
+        """Return the category of the best keyword in ``text``, if any."""
+        goto, fail, best = self.goto, self.fail, self.best
+        node = 0
+        found: Optional[Tuple[int, int, str]] = None
+        for char in f" {text} ":
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = best[node]
+            if match is not None and (found is None or match > found):
+                found = match
+        return found[2] if found is not None else None
+
+
+class Categoriser:
+    """Assign spending categories to transaction descriptions.
+
+    Parameters
+    ----------
+    rules: mapping, optional
+        Mapping from category to keywords/aliases.  Defaults to
+        :data:`DEFAULT_RULES`.
+    default: str, default 'other'
+        Category returned when no keyword matches.
+    max_cache_size: int, default 1000000
+        Maximum number of memoised descriptions; the memo is cleared when it
+        grows beyond this size.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Mapping[str, Iterable[str]]] = None,
+        default: str = DEFAULT_CATEGORY,
+        max_cache_size: int = 1_000_000,
+    ) -> None:
+        rules = DEFAULT_RULES if rules is None else rules
+        keywords = [
+            (normalise_description(keyword), category)
+            for category, aliases in rules.items()
+            for keyword in aliases
+        ]
+        self.categories: List[str] = list(rules)
+        self.default = default
+        self.max_cache_size = max_cache_size
+        self._automaton = _Automaton((k, c) for k, c in keywords if k)
+        self._raw: Dict[str, str] = {}
+        self._normalised: Dict[str, str] = {}
+
+    def _miss(self, description: str) -> str:
+        if len(self._raw) >= self.max_cache_size:
+            self._raw.clear()
+            self._normalised.clear()
+        normalised = normalise_description(description)
+        category = self._normalised.get(normalised)
+        if category is None:
+            category = self._automaton.search(normalised) or self.default
+            self._normalised[normalised] = category
+        self._raw[description] = category
+        return category
+
+    def categorise(self, description: str) -> str:
+        """Return the category of a single description."""
+        category = self._raw.get(description)
+        return category if category is not None else self._miss(description)
+
+    def categorise_batch(self, descriptions: Iterable[str]) -> List[str]:
+        """Return the category of every description, in order."""
+        raw = self._raw
+        miss = self._miss
+        out: List[str] = []
+        append = out.append
+        for description in descriptions:
+            category = raw.get(description)
+            append(category if category is not None else miss(description))
+        return out
+
+    def clear_cache(self) -> None:
+        """Forget all memoised descriptions."""
+        self._raw.clear()
+        self._normalised.clear()
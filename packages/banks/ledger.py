@@ -0,0 +1,265 @@
+"""Local SQLite ledger of bank transactions.
+
+The ledger stores every transaction fetched from a provider, keyed by
+``(provider, id)``, together with a per‑account sync cursor.  Writes are
+idempotent upserts, so fetching the same transaction twice simply refreshes
+the stored row.  Transaction endpoints are served from the ledger instead of
+re‑downloading the full history from the provider on every request.
+
+The database schema is created automatically if it does not exist.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import os
+
+
+def init_ledger(db_path: str) -> None:
+    """Initialise the ledger database and create tables if necessary."""
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with sqlite3.connect(db_path) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS transactions (
+                provider TEXT NOT NULL,
+                id TEXT NOT NULL,
+                account_id TEXT NOT NULL,
+                date TEXT NOT NULL,
+                amount REAL NOT NULL,
+                description TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (provider, id)
+            );
+            """
+        )
+        # Transactions are always read per account in date order
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_transactions_account_date
+            ON transactions (account_id, date DESC);
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_state (
+                provider TEXT NOT NULL,
+                account_id TEXT NOT NULL,
+                cursor TEXT,
+                last_synced TEXT NOT NULL,
+                PRIMARY KEY (provider, account_id)
+            );
+            """
+        )
+        # Idempotency keys of received webhooks (see packages.banks.webhooks)
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS webhook_events (
+                provider TEXT NOT NULL,
+                event_id TEXT NOT NULL,
+                received_at TEXT NOT NULL,
+                PRIMARY KEY (provider, event_id)
+            );
+            """
+        )
+        conn.commit()
+
+
+def apply_delta(db_path: str, provider: str, account_id: str, transactions: Iterable[Dict[str, Any]], cursor: Optional[str]) -> int:
+    """Upsert a batch of transactions and advance the account's cursor.
+
+    Both changes are committed in a single transaction, so a crash can never
+    advance the cursor past transactions that were not stored.
+
+    Parameters
+    ----------
+    db_path: str
+        Path to the SQLite database file.
+    provider: str
+        Name of the provider the transactions came from.
+    account_id: str
+        The account that was synced.
+    transactions: iterable of dict
+        Transactions as returned by the provider.  Each must have an ``id``.
+    cursor: str, optional
+        The cursor to store for the next sync.
+
+    Returns
+    -------
+    int
+        The number of transactions written.
+    """
+    now = datetime.utcnow().isoformat()
+    rows = [
+        (
+            provider,
+            str(tx['id']),
+            str(tx.get('account_id') or account_id),
+            str(tx.get('date') or ''),
+            float(tx.get('amount') or 0.0),
+            str(tx.get('description') or ''),
+            json.dumps(tx, default=str),
+            now,
+        )
+        for tx in transactions
+    ]
+    with sqlite3.connect(db_path) as conn:
+        cur = conn.cursor()
+        cur.executemany(
+            """
+            INSERT INTO transactions (provider, id, account_id, date, amount, description, data, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (provider, id) DO UPDATE SET
+                account_id = excluded.account_id,
+                date = excluded.date,
+                amount = excluded.amount,
+                description = excluded.description,
+                data = excluded.data,
+                updated_at = excluded.updated_at;
+            """,
+            rows,
+        )
+        cur.execute(
+            """
+            INSERT INTO sync_state (provider, account_id, cursor, last_synced)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (provider, account_id) DO UPDATE SET
+                cursor = excluded.cursor,
+                last_synced = excluded.last_synced;
+            """,
+            (provider, account_id, cursor, now),
+        )
+        conn.commit()
+    return len(rows)
+
+
+def fetch_sync_state(db_path: str, provider: str, account_id: str) -> Optional[Dict[str, Any]]:
+    """Return ``{'cursor': ..., 'last_synced': ...}`` for an account, or ``None`` if never synced."""
+    if not os.path.exists(db_path):
+        return None
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute(
+            "SELECT cursor, last_synced FROM sync_state WHERE provider = ? AND account_id = ?;",
+            (provider, account_id),
+        ).fetchone()
+    if row is None:
+        return None
+    return {'cursor': row[0], 'last_synced': row[1]}
+
+
+# sync_state row marking that a provider's account list has been synced
+PROVIDER_MARKER = ''
+
+
+def mark_provider_synced(db_path: str, provider: str) -> None:
+    """Record that every account ``provider`` listed has been synced once."""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO sync_state (provider, account_id, cursor, last_synced)
+            VALUES (?, ?, NULL, ?)
+            ON CONFLICT (provider, account_id) DO UPDATE SET last_synced = excluded.last_synced;
+            """,
+            (provider, PROVIDER_MARKER, datetime.utcnow().isoformat()),
+        )
+        conn.commit()
+
+
+def record_webhook_event(db_path: str, provider: str, event_id: str) -> bool:
+    """Record a webhook's idempotency key.
+
+    Returns True the first time ``(provider, event_id)`` is recorded and False
+    for a redelivery.
+    """
+    with sqlite3.connect(db_path) as conn:
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO webhook_events (provider, event_id, received_at) VALUES (?, ?, ?);",
+            (provider, event_id, datetime.utcnow().isoformat()),
+        )
+        conn.commit()
+        return cur.rowcount == 1
+
+
+def fetch_transactions(
+    db_path: str,
+    account_id: str,
+    *,
+    provider: Optional[str] = None,
+    since: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Return stored transactions for an account, most recent first.
+
+    Parameters
+    ----------
+    db_path: str
+        Path to the SQLite database file.
+    account_id: str
+        The account to read.
+    provider: str, optional
+        Restrict to transactions from this provider.
+    since: str, optional
+        Only return transactions dated on or after this ISO date.
+    limit: int, optional
+        Maximum number of transactions to return.
+
+    Returns
+    -------
+    list of dict
+        The transactions as originally returned by the provider, each tagged
+        with a ``provider`` key.  An empty list is returned if the database
+        does not exist.
+    """
+    if not os.path.exists(db_path):
+        return []
+    query = "SELECT provider, data FROM transactions WHERE account_id = ?"
+    params: List[Any] = [account_id]
+    if provider is not None:
+        query += " AND provider = ?"
+        params.append(provider)
+    if since is not None:
+        query += " AND date >= ?"
+        params.append(since)
+    query += " ORDER BY date DESC, id"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(int(limit))
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(query + ";", params).fetchall()
+    transactions: List[Dict[str, Any]] = []
+    for provider_name, data in rows:
+        try:
+            tx = json.loads(data)
+        except Exception:
+            continue
+        tx.setdefault('provider', provider_name)
+        transactions.append(tx)
+    return transactions
+
+
+def fetch_transaction_rows(db_path: str, account_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, str, float, str]]:
+    """Return ``(account_id, date, amount, description)`` tuples for analytics.
+
+    Only the columns needed for aggregation are read, so the stored JSON
+    payloads are never decoded.  Rows are returned in date order.
+    """
+    if not os.path.exists(db_path):
+        return []
+    query = "SELECT account_id, date, amount, description FROM transactions"
+    params: List[Any] = []
+    if account_ids is not None:
+        account_ids = list(account_ids)
+        if not account_ids:
+            return []
+        query += f" WHERE account_id IN ({', '.join('?' for _ in account_ids)})"
+        params.extend(account_ids)
+    query += " ORDER BY date;"
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(query, params).fetchall()
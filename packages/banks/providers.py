@@ -9,9 +9,24 @@ from __future__ import annotations
 
 from typing import List, Dict, Any
 from datetime import datetime
+import os
 import random
 
-from .base import BankProvider
+from .base import BankProvider, HTTPBankProvider
+from .session import AccessToken
+
+# Plaid item access tokens do not expire; re-read the configured one this often.
+PLAID_TOKEN_TTL = 24 * 3600.0
+
+
+def plaid_access_tokens() -> Dict[str, str]:
+    """Plaid item access tokens per user, from ``PLAID_ACCESS_TOKENS``."""
+    return {
+        user.strip(): token.strip()
+        for user, _, token in (
+            item.partition('=') for item in os.environ.get('PLAID_ACCESS_TOKENS', '').split(',') if '=' in item
+        )
+    }
 
 
 class DemoBankProvider(BankProvider):
@@ -66,8 +81,23 @@ class DemoBankProvider(BankProvider):
         return self.accounts
 
 
-class PlaidProvider(BankProvider):
-    """Placeholder for a Plaid banking provider."""
+class PlaidProvider(HTTPBankProvider):
+    """Placeholder for a Plaid banking provider.
+
+    Plaid has no client‑credentials grant: requests carry the client ID and
+    secret plus a per‑item access token obtained through Plaid Link, which
+    does not expire.  Until Link tokens are stored per user, the item tokens
+    are configured in ``PLAID_ACCESS_TOKENS`` as ``user=token,user=token``;
+    users without an entry have no Plaid item.
+    """
+
+    name = 'plaid'
+
+    def fetch_access_token(self) -> AccessToken:
+        token = plaid_access_tokens().get(self.user_id)
+        if not token:
+            raise ValueError(f"No Plaid item for user {self.user_id}; add it to PLAID_ACCESS_TOKENS")
+        return AccessToken.from_expires_in(token, PLAID_TOKEN_TTL)
 
     def get_balances(self) -> List[Dict[str, Any]]:
         # TODO: integrate Plaid API
@@ -80,9 +110,12 @@ class PlaidProvider(BankProvider):
         return []
 
 
-class TrueLayerProvider(BankProvider):
+class TrueLayerProvider(HTTPBankProvider):
     """Placeholder for a TrueLayer banking provider."""
 
+    name = 'truelayer'
+    token_url = 'https://auth.truelayer.com/connect/token'
+
     def get_balances(self) -> List[Dict[str, Any]]:
         # TODO: integrate TrueLayer API
         return []
@@ -94,9 +127,12 @@ class TrueLayerProvider(BankProvider):
         return []
 
 
-class TinkProvider(BankProvider):
+class TinkProvider(HTTPBankProvider):
     """Placeholder for a Tink banking provider."""
 
+    name = 'tink'
+    token_url = 'https://api.tink.com/api/v1/oauth/token'
+
     def get_balances(self) -> List[Dict[str, Any]]:
         # TODO: integrate Tink API
         return []
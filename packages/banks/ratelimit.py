@@ -0,0 +1,189 @@
+"""Per‑provider rate limiting for outbound banking API calls.
+
+Banking aggregators enforce strict per‑app and per‑user request limits.  Every
+outbound call to a provider draws a token from that provider's
+:class:`TokenBucket`.  Async callers go through a :class:`ProviderScheduler`,
+which queues calls and releases them in priority order as tokens become
+available, so interactive requests overtake background refreshes.  Blocking
+callers (e.g. the transaction sync engine running in a worker thread) use
+:class:`RateLimitedProvider`, which waits on the same bucket.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+import asyncio
+import itertools
+import threading
+import time
+
+from .base import BankProvider
+
+
+T = TypeVar('T')
+
+# Default sustained request rate (per second) and burst size per provider.
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+
+# Scheduler priorities: lower values are dispatched first.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_REFRESH = 10
+
+
+class TokenBucket:
+    """Thread‑safe token bucket.
+
+    Parameters
+    ----------
+    rate: float
+        Tokens added per second (the sustained request rate).
+    capacity: float
+        Maximum number of tokens (the permitted burst).
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it.
+
+        The bucket may go into debt, so concurrent reservations are served in
+        order and each caller sleeps exactly as long as needed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class ProviderScheduler:
+    """Queue async provider calls and release them at the bucket's rate.
+
+    Calls are dispatched in priority order (then submission order).  The
+    worker task is started lazily on the first :meth:`submit`, inside the
+    running event loop.
+
+    Parameters
+    ----------
+    bucket: TokenBucket
+        The provider's token bucket.
+    """
+
+    def __init__(self, bucket: TokenBucket) -> None:
+        self.bucket = bucket
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._counter = itertools.count()
+        self._running: set = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of calls waiting for a token."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _ensure_worker(self) -> asyncio.PriorityQueue:
+        if self._queue is None or self._worker is None or self._worker.done():
+            if self._queue is None:
+                self._queue = asyncio.PriorityQueue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self._queue
+
+    async def submit(self, func: Callable[[], Awaitable[T]], priority: int = PRIORITY_INTERACTIVE) -> T:
+        """Run ``func()`` once a token is available and return its result."""
+        queue = self._ensure_worker()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((priority, next(self._counter), func, future))
+        return await future
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        while True:
+            _priority, _seq, func, future = await self._queue.get()
+            if future.cancelled():
+                continue
+            delay = self.bucket.reserve()
+            if delay:
+                await asyncio.sleep(delay)
+            # Keep a reference so the dispatched call is not garbage collected
+            task = asyncio.ensure_future(self._dispatch(func, future))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    @staticmethod
+    async def _dispatch(func: Callable[[], Awaitable[Any]], future: asyncio.Future) -> None:
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def aclose(self) -> None:
+        """Stop the worker and fail any calls still waiting in the queue."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._worker = None
+        for task in list(self._running):
+            task.cancel()
+        if self._queue is not None:
+            while not self._queue.empty():
+                *_rest, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Provider scheduler closed"))
+
+
+class RateLimitedProvider(BankProvider):
+    """Blocking wrapper that draws a token from ``bucket`` before every call.
+
+    Parameters
+    ----------
+    provider: BankProvider
+        The provider to wrap.
+    bucket: TokenBucket
+        The provider's token bucket, shared with its async scheduler.
+    """
+
+    def __init__(self, provider: BankProvider, bucket: TokenBucket) -> None:
+        self.provider = provider
+        self.bucket = bucket
+
+    def _wait(self) -> None:
+        delay = self.bucket.reserve()
+        if delay:
+            time.sleep(delay)
+
+    def get_balances(self) -> List[Dict[str, Any]]:
+        self._wait()
+        return self.provider.get_balances()
+
+    def get_transactions(self, account_id: str) -> List[Dict[str, Any]]:
+        self._wait()
+        return self.provider.get_transactions(account_id)
+
+    def get_accounts(self) -> List[Dict[str, Any]]:
+        self._wait()
+        return self.provider.get_accounts()
+
+    def get_transactions_since(self, account_id: str, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        self._wait()
+        return self.provider.get_transactions_since(account_id, cursor)
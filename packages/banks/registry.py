@@ -0,0 +1,244 @@
+"""Registry of long‑lived banking provider clients.
+
+Creating a provider per request would repeat the OAuth token exchange and the
+TLS handshake on every call.  :class:`ProviderRegistry` instead keeps one
+client per provider and user for the lifetime of the application.  All clients
+of a provider share a pooled HTTP session, and all clients share one
+:class:`~packages.banks.session.TokenCache`.  Each provider also has one token
+bucket and scheduler through which all of its outbound calls are made, and
+async access goes through a per‑user balance/account cache (see
+:mod:`packages.banks.cache`).  The API creates the registry in its lifespan
+hook and closes it on shutdown.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, TYPE_CHECKING
+import logging
+import os
+import threading
+
+from .aggregate import DEFAULT_TIMEOUT, ProviderAggregator
+from .aio import as_async
+from .base import BankProvider
+from .cache import DEFAULT_MAX_STALENESS, CachedProvider
+from .ratelimit import DEFAULT_BURST, DEFAULT_RATE, ProviderScheduler, RateLimitedProvider, TokenBucket
+from .session import DEFAULT_POOL_SIZE, DEFAULT_REFRESH_MARGIN, TokenCache, create_session
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+
+logger = logging.getLogger(__name__)
+
+#: Signature of a provider factory: ``factory(user_id, session, token_cache)``.
+ProviderFactory = Callable[[str, 'requests.Session', TokenCache], BankProvider]
+
+# Upper bound on the number of cached (provider, user) clients.
+DEFAULT_MAX_CLIENTS = 10_000
+
+
+class ProviderRegistry:
+    """Keep one provider client per provider and user.
+
+    Parameters
+    ----------
+    factories: mapping, optional
+        Mapping from provider name to a factory building a client for a user.
+        More can be added later with :meth:`register`.
+    pool_size: int, default 10
+        Connection pool size of each provider's HTTP session.
+    refresh_margin: float, default 60.0
+        Seconds before expiry at which cached access tokens are refreshed.
+    max_clients: int, default 10000
+        Maximum number of clients kept alive; the least recently used client
+        is dropped when the limit is exceeded.
+    timeout: float, default 10.0
+        Per‑provider timeout used by :meth:`aggregator`.
+    rate_limits: mapping, optional
+        Per‑provider ``(rate, burst)`` overrides of the default token bucket
+        (5 requests per second, bursts of 10).
+    max_staleness: float, default 300.0
+        Maximum age in seconds of cached balances and accounts.
+    refresh_after: float, optional
+        Age in seconds after which cached data is refreshed in the background.
+    """
+
+    def __init__(
+        self,
+        factories: Optional[Mapping[str, ProviderFactory]] = None,
+        *,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+        timeout: float = DEFAULT_TIMEOUT,
+        rate_limits: Optional[Mapping[str, Tuple[float, float]]] = None,
+        max_staleness: float = DEFAULT_MAX_STALENESS,
+        refresh_after: Optional[float] = None,
+    ) -> None:
+        self.factories: Dict[str, ProviderFactory] = dict(factories or {})
+        self.pool_size = pool_size
+        self.max_clients = max_clients
+        self.timeout = timeout
+        self.token_cache = TokenCache(refresh_margin=refresh_margin)
+        self._sessions: Dict[str, requests.Session] = {}
+        self.rate_limits: Dict[str, Tuple[float, float]] = dict(rate_limits or {})
+        self.max_staleness = max_staleness
+        self.refresh_after = refresh_after
+        self._clients: OrderedDict[Tuple[str, str], BankProvider] = OrderedDict()
+        self._cached: OrderedDict[Tuple[str, str], CachedProvider] = OrderedDict()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._schedulers: Dict[str, ProviderScheduler] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: ProviderFactory) -> None:
+        """Register (or replace) the factory for provider ``name``."""
+        with self._lock:
+            self.factories[name] = factory
+            for clients in (self._clients, self._cached):
+                for key in [k for k in clients if k[0] == name]:
+                    del clients[key]
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the registered providers."""
+        return list(self.factories)
+
+    def _session(self, name: str) -> requests.Session:
+        session = self._sessions.get(name)
+        if session is None:
+            session = self._sessions[name] = create_session(self.pool_size)
+        return session
+
+    def bucket(self, name: str) -> TokenBucket:
+        """Return the token bucket shared by all outbound calls to ``name``."""
+        with self._lock:
+            return self._bucket(name)
+
+    def _bucket(self, name: str) -> TokenBucket:
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            rate, burst = self.rate_limits.get(name, (DEFAULT_RATE, DEFAULT_BURST))
+            bucket = self._buckets[name] = TokenBucket(rate, burst)
+        return bucket
+
+    def scheduler(self, name: str) -> ProviderScheduler:
+        """Return the async call scheduler of provider ``name``."""
+        with self._lock:
+            scheduler = self._schedulers.get(name)
+            if scheduler is None:
+                scheduler = self._schedulers[name] = ProviderScheduler(self._bucket(name))
+            return scheduler
+
+    def _lru_get(self, cache: OrderedDict, key: Tuple[str, str], build: Callable[[], object]):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+                return value
+        value = build()
+        with self._lock:
+            value = cache.setdefault(key, value)
+            while len(cache) > self.max_clients:
+                cache.popitem(last=False)
+        return value
+
+    def _build(self, name: str, user_id: str) -> BankProvider:
+        try:
+            factory = self.factories[name]
+        except KeyError:
+            raise KeyError(f"Unknown bank provider: {name}") from None
+        with self._lock:
+            session = self._session(name)
+        return factory(user_id, session, self.token_cache)
+
+    def get(self, name: str, user_id: str) -> BankProvider:
+        """Return the client for provider ``name`` and ``user_id``, creating it once.
+
+        The returned client is the raw provider; use :meth:`providers_for` or
+        :meth:`aggregator` to make rate‑limited calls.
+        """
+        return self._lru_get(self._clients, (name, user_id), lambda: self._build(name, user_id))
+
+    def cached(self, name: str, user_id: str) -> CachedProvider:
+        """Return the cached, scheduled async client for ``name`` and ``user_id``."""
+        return self._lru_get(
+            self._cached,
+            (name, user_id),
+            lambda: CachedProvider(
+                as_async(self.get(name, user_id)),
+                self.scheduler(name),
+                max_staleness=self.max_staleness,
+                refresh_after=self.refresh_after,
+            ),
+        )
+
+    def providers_for(self, user_id: str, names: Optional[Iterable[str]] = None) -> Dict[str, BankProvider]:
+        """Return rate‑limited blocking clients of ``user_id`` keyed by provider name."""
+        return {
+            name: RateLimitedProvider(self.get(name, user_id), self.bucket(name))
+            for name in (names if names is not None else self.names)
+        }
+
+    def aggregator(self, user_id: str, names: Optional[Iterable[str]] = None) -> ProviderAggregator:
+        """Return a :class:`ProviderAggregator` over the cached clients of ``user_id``."""
+        names = names if names is not None else self.names
+        return ProviderAggregator({name: self.cached(name, user_id) for name in names}, timeout=self.timeout)
+
+    async def aclose(self) -> None:
+        """Stop the schedulers, then release everything as :meth:`close` does."""
+        with self._lock:
+            schedulers, self._schedulers = self._schedulers, {}
+        for scheduler in schedulers.values():
+            await scheduler.aclose()
+        self.close()
+
+    def close(self) -> None:
+        """Drop all clients and close the pooled HTTP sessions."""
+        with self._lock:
+            self._clients.clear()
+            self._cached.clear()
+            sessions, self._sessions = self._sessions, {}
+        for name, session in sessions.items():
+            try:
+                session.close()
+            except Exception as exc:
+                logger.warning("Failed to close HTTP session for %s: %s", name, exc)
+        self.token_cache.clear()
+
+
+def _default_factories() -> Dict[str, ProviderFactory]:
+    from .providers import DemoBankProvider, PlaidProvider, TinkProvider, TrueLayerProvider
+    from .synthetic import SyntheticBankProvider
+
+    return {
+        'demo': lambda user_id, session, tokens: DemoBankProvider(),
+        'synthetic': lambda user_id, session, tokens: SyntheticBankProvider(user_id),
+        'plaid': lambda user_id, session, tokens: PlaidProvider(user_id, session, tokens),
+        'truelayer': lambda user_id, session, tokens: TrueLayerProvider(user_id, session, tokens),
+        'tink': lambda user_id, session, tokens: TinkProvider(user_id, session, tokens),
+    }
+
+
+def build_default_registry(names: Optional[Iterable[str]] = None, **kwargs) -> ProviderRegistry:
+    """Create a registry for the built‑in providers.
+
+    Parameters
+    ----------
+    names: iterable of str, optional
+        Providers to enable.  Defaults to the comma‑separated
+        ``BANK_PROVIDERS`` environment variable, or ``'demo'`` if unset.
+    **kwargs
+        Passed through to :class:`ProviderRegistry`.
+    """
+    if names is None:
+        names = [n.strip() for n in os.environ.get('BANK_PROVIDERS', 'demo').split(',') if n.strip()]
+    available = _default_factories()
+    factories: Dict[str, ProviderFactory] = {}
+    for name in names:
+        if name not in available:
+            logger.warning("Ignoring unknown bank provider %s", name)
+            continue
+        factories[name] = available[name]
+    return ProviderRegistry(factories, **kwargs)
@@ -0,0 +1,114 @@
+"""Shared HTTP sessions and access‑token caching for banking providers.
+
+Banking APIs authenticate with short‑lived OAuth access tokens and are served
+over TLS.  Creating a fresh client for every request repeats both the token
+exchange and the TLS handshake.  The helpers in this module let long‑lived
+provider clients share a pooled :class:`requests.Session` and cache access
+tokens until shortly before they expire.  ``requests`` is imported by
+:func:`create_session` rather than at module level, so token caching works
+without it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, TYPE_CHECKING
+import threading
+import time
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+
+# Number of pooled connections kept per host by default.
+DEFAULT_POOL_SIZE = 10
+# Refresh tokens this many seconds before they actually expire.
+DEFAULT_REFRESH_MARGIN = 60.0
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Return a :class:`requests.Session` with a connection pool of ``pool_size``.
+
+    The session keeps TCP/TLS connections alive between calls, so only the
+    first request to each host pays for the handshake.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+@dataclass(frozen=True)
+class AccessToken:
+    """An OAuth access token and its absolute expiry time.
+
+    Attributes
+    ----------
+    value: str
+        The bearer token.
+    expires_at: float
+        Expiry as a :func:`time.monotonic` timestamp.
+    """
+
+    value: str
+    expires_at: float
+
+    @classmethod
+    def from_expires_in(cls, value: str, expires_in: float) -> 'AccessToken':
+        """Build a token from the relative ``expires_in`` seconds of an OAuth response."""
+        return cls(value=value, expires_at=time.monotonic() + float(expires_in))
+
+
+class TokenCache:
+    """Thread‑safe cache of access tokens that refreshes ahead of expiry.
+
+    Parameters
+    ----------
+    refresh_margin: float, default 60.0
+        A cached token is considered stale this many seconds before it
+        expires, so callers never send a token that is about to lapse.
+    """
+
+    def __init__(self, refresh_margin: float = DEFAULT_REFRESH_MARGIN) -> None:
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[str, AccessToken] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _fresh(self, key: str) -> Optional[AccessToken]:
+        token = self._tokens.get(key)
+        if token is not None and token.expires_at - self.refresh_margin > time.monotonic():
+            return token
+        return None
+
+    def get(self, key: str, fetch: Callable[[], AccessToken]) -> str:
+        """Return a valid token for ``key``, calling ``fetch`` to refresh it.
+
+        Concurrent callers for the same key wait for a single refresh instead
+        of each performing their own token exchange.
+        """
+        token = self._fresh(key)
+        if token is not None:
+            return token.value
+        with self._lock_for(key):
+            token = self._fresh(key)
+            if token is None:
+                token = fetch()
+                self._tokens[key] = token
+            return token.value
+
+    def invalidate(self, key: str) -> None:
+        """Forget the token for ``key`` (e.g. after a 401 response)."""
+        self._tokens.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget all cached tokens."""
+        self._tokens.clear()
@@ -0,0 +1,125 @@
+"""Incremental transaction synchronisation.
+
+:class:`TransactionSyncEngine` keeps the local ledger (see
+:mod:`packages.banks.ledger`) up to date.  For every account it remembers the
+cursor returned by the provider's last delta and only asks for transactions
+added since then, so an account with years of history is downloaded once and
+afterwards costs a small delta per sync.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+import logging
+import threading
+
+from . import ledger
+from .base import BankProvider
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncResult:
+    """Outcome of syncing one account.
+
+    Attributes
+    ----------
+    provider: str
+        Name of the provider.
+    account_id: str
+        The synced account.
+    fetched: int
+        Number of transactions received in the delta (and upserted).
+    cursor: str, optional
+        The cursor stored for the next sync.
+    error: str, optional
+        Error message if the sync failed; the stored cursor is unchanged.
+    """
+
+    provider: str
+    account_id: str
+    fetched: int = 0
+    cursor: Optional[str] = None
+    error: Optional[str] = None
+
+
+class TransactionSyncEngine:
+    """Fetch transaction deltas from providers into the local ledger.
+
+    Parameters
+    ----------
+    db_path: str
+        Path to the ledger SQLite database.  The schema is created on first
+        use.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        ledger.init_ledger(db_path)
+        self._initial_sync = threading.Lock()
+
+    def sync_account(self, name: str, provider: BankProvider, account_id: str) -> SyncResult:
+        """Fetch the delta for one account and upsert it into the ledger."""
+        state = ledger.fetch_sync_state(self.db_path, name, account_id)
+        cursor = state['cursor'] if state else None
+        try:
+            transactions, next_cursor = provider.get_transactions_since(account_id, cursor)
+        except Exception as exc:
+            logger.warning("Failed to sync %s account %s: %s", name, account_id, exc)
+            return SyncResult(provider=name, account_id=account_id, cursor=cursor, error=str(exc) or type(exc).__name__)
+        fetched = ledger.apply_delta(self.db_path, name, account_id, transactions, next_cursor)
+        return SyncResult(provider=name, account_id=account_id, fetched=fetched, cursor=next_cursor)
+
+    def sync_provider(self, name: str, provider: BankProvider) -> List[SyncResult]:
+        """Sync every account the provider exposes."""
+        try:
+            accounts = provider.get_accounts()
+        except Exception as exc:
+            logger.warning("Failed to list %s accounts: %s", name, exc)
+            return []
+        results = [self.sync_account(name, provider, str(account['account_id'])) for account in accounts]
+        ledger.mark_provider_synced(self.db_path, name)
+        return results
+
+    def sync_all(self, providers: Mapping[str, BankProvider]) -> List[SyncResult]:
+        """Sync every account of every provider in ``providers``."""
+        results: List[SyncResult] = []
+        for name, provider in providers.items():
+            results.extend(self.sync_provider(name, provider))
+        return results
+
+    def has_synced(self, name: str, account_id: str) -> bool:
+        """Return True if the account has been synced at least once."""
+        return ledger.fetch_sync_state(self.db_path, name, account_id) is not None
+
+    def provider_synced(self, name: str) -> bool:
+        """Return True if every account of the provider has been synced at least once."""
+        return ledger.fetch_sync_state(self.db_path, name, ledger.PROVIDER_MARKER) is not None
+
+    def ensure_synced(self, providers: Mapping[str, BankProvider]) -> List[SyncResult]:
+        """Sync the providers whose accounts were never synced, each at most once.
+
+        Callers on other threads wait for a sync in progress instead of
+        starting their own.  A provider whose account list cannot be fetched
+        is tried again on the next call.
+        """
+        with self._initial_sync:
+            results: List[SyncResult] = []
+            for name, provider in providers.items():
+                if not self.provider_synced(name):
+                    results.extend(self.sync_provider(name, provider))
+            return results
+
+    def transactions(self, account_id: str, **kwargs) -> List[Dict]:
+        """Return the ledger's transactions for ``account_id``.
+
+        Keyword arguments are passed to :func:`packages.banks.ledger.fetch_transactions`.
+        """
+        return ledger.fetch_transactions(self.db_path, account_id, **kwargs)
+
+    def transaction_rows(self, account_ids: Optional[List[str]] = None) -> List[Tuple[str, str, float, str]]:
+        """Return ledger rows in the shape expected by :meth:`TransactionFrame.from_rows`."""
+        return ledger.fetch_transaction_rows(self.db_path, account_ids)
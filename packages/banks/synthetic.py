@@ -0,0 +1,262 @@
+"""Deterministic synthetic bank data for benchmarks and load tests.
+
+:class:`DemoBankProvider` only returns a handful of random transactions dated
+today, which is neither realistic nor reproducible.  This module generates
+arbitrarily large, seeded transaction histories behind the regular
+:class:`~packages.banks.base.BankProvider` interface:
+
+* merchants are drawn from a catalogue with skewed popularity, per‑merchant
+  log‑normal amounts and weekday effects (more eating out at weekends);
+* salary and rent recur monthly on fixed days;
+* descriptions carry store numbers and card references like real statements.
+
+Every account's history is generated lazily from its own seed, so the same
+``(seed, user, account)`` always yields the same transactions, and
+:meth:`SyntheticBankDataset.iter_transactions` can stream tens of millions of
+rows without holding them in memory.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import random
+
+from .base import BankProvider
+
+
+# (description template, category, log‑normal mu, sigma, popularity weight)
+MERCHANTS: List[Tuple[str, str, float, float, float]] = [
+    ("CARD PAYMENT TO TESCO STORES {store}", 'groceries', 3.2, 0.6, 9.0),
+    ("ALBERT HEIJN {store} AMSTERDAM", 'groceries', 3.0, 0.7, 9.0),
+    ("LIDL {store}", 'groceries', 2.9, 0.6, 6.0),
+    ("JUMBO {store}", 'groceries', 3.0, 0.6, 5.0),
+    ("SKLAVENITIS {store} ATHINA", 'groceries', 3.1, 0.6, 3.0),
+    ("STARBUCKS {store}", 'eating_out', 1.6, 0.4, 5.0),
+    ("DELIVEROO {ref}", 'eating_out', 3.1, 0.4, 3.0),
+    ("THUISBEZORGD.NL {ref}", 'eating_out', 3.2, 0.4, 3.0),
+    ("RESTAURANT DE KAS {store}", 'eating_out', 4.0, 0.5, 1.0),
+    ("UBER *TRIP {ref}", 'transport', 2.7, 0.5, 4.0),
+    ("NS GROEP IZ NS REIZIGERS {ref}", 'transport', 2.4, 0.6, 4.0),
+    ("SHELL {store}", 'transport', 4.0, 0.3, 2.0),
+    ("AMZN MKTP NL*{ref}", 'shopping', 3.4, 0.9, 4.0),
+    ("BOL.COM {ref}", 'shopping', 3.5, 0.8, 2.0),
+    ("IKEA {store}", 'shopping', 4.2, 0.8, 0.5),
+    ("NETFLIX.COM", 'subscriptions', 2.7, 0.05, 0.4),
+    ("SPOTIFY {ref}", 'subscriptions', 2.4, 0.05, 0.4),
+    ("VATTENFALL KLANTENSERVICE {ref}", 'utilities', 4.6, 0.2, 0.4),
+    ("ZIGGO SERVICES {ref}", 'utilities', 3.8, 0.1, 0.4),
+    ("KRUIDVAT {store}", 'health', 2.6, 0.6, 2.0),
+    ("BASIC-FIT {ref}", 'health', 3.3, 0.05, 0.4),
+    ("GELDAUTOMAAT {store}", 'cash', 3.9, 0.5, 1.0),
+    ("TIKKIE {ref}", 'transfers', 2.8, 0.8, 1.5),
+]
+
+_WEEKEND_BOOST = {'eating_out': 2.0, 'shopping': 1.5}
+
+
+def _weekday_weights() -> List[List[float]]:
+    """Cumulative merchant weights for each weekday (Mon=0 .. Sun=6)."""
+    tables = []
+    for weekday in range(7):
+        total = 0.0
+        cumulative = []
+        for _tpl, category, _mu, _sigma, weight in MERCHANTS:
+            total += weight * (_WEEKEND_BOOST.get(category, 1.0) if weekday >= 5 else 1.0)
+            cumulative.append(total)
+        tables.append(cumulative)
+    return tables
+
+
+_WEEKDAY_TABLES = _weekday_weights()
+
+
+class SyntheticBankProvider(BankProvider):
+    """A seeded provider with realistic, arbitrarily long transaction histories.
+
+    Parameters
+    ----------
+    user_id: str, default 'user-0'
+        Identifier of the simulated user; part of every account ID.
+    seed: int, default 0
+        Global seed.  Together with the user and account ID it determines all
+        generated data.
+    accounts: int, default 2
+        Number of accounts of the user.
+    transactions_per_account: int, default 1000
+        Number of transactions per account.
+    days: int, default 365
+        Length of the history in days.
+    end_date: date, optional
+        Last day of the history.  Defaults to 2024‑12‑31 so that output does
+        not depend on when it is generated.
+    currency: str, default 'EUR'
+        Currency of all accounts.
+    """
+
+    def __init__(
+        self,
+        user_id: str = 'user-0',
+        *,
+        seed: int = 0,
+        accounts: int = 2,
+        transactions_per_account: int = 1000,
+        days: int = 365,
+        end_date: Optional[date] = None,
+        currency: str = 'EUR',
+    ) -> None:
+        self.user_id = user_id
+        self.seed = seed
+        self.transactions_per_account = transactions_per_account
+        self.days = max(1, days)
+        self.end_date = end_date or date(2024, 12, 31)
+        self.start_date = self.end_date - timedelta(days=self.days - 1)
+        self.currency = currency
+        self.accounts = [
+            {
+                'account_id': f'{user_id}-acc-{i:02d}',
+                'account_type': 'checking' if i == 0 else 'savings',
+                'currency': currency,
+                'name': 'Main Checking' if i == 0 else f'Savings {i}',
+            }
+            for i in range(accounts)
+        ]
+        self._balances: Dict[str, float] = {}
+
+    def _rng(self, account_id: str) -> random.Random:
+        return random.Random(f"{self.seed}/{self.user_id}/{account_id}")
+
+    def iter_transactions(self, account_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield the account's transactions in chronological order.
+
+        Transactions are generated on the fly; nothing is kept in memory.  The
+        checking account (``-acc-00``) additionally receives a monthly rent
+        payment and salary on top of ``transactions_per_account``.
+        """
+        rng = self._rng(account_id)
+        is_checking = account_id.endswith('-acc-00')
+        salary = round(rng.uniform(2500, 6000), 2)
+        rent = round(rng.uniform(900, 2200), 2)
+        merchants = range(len(MERCHANTS))
+        # Spread the transactions uniformly over the history (a Poisson process
+        # conditioned on the count).  Times are drawn as sorted uniforms, one
+        # at a time: the next one is the minimum of the ``remaining`` uniforms
+        # left after ``position``, so the stream stays chronological and
+        # never runs past the end of the history.
+        count = self.transactions_per_account
+        position = 0.0
+        month = None
+        salary_paid = False
+        for seq in range(count):
+            remaining = count - seq
+            position += (1.0 - position) * (1.0 - (1.0 - rng.random()) ** (1.0 / remaining))
+            day = self.start_date + timedelta(days=min(int(position * self.days), self.days - 1))
+            if is_checking:
+                # Recurring items are emitted before the first transaction that
+                # follows their due date, which keeps the stream chronological
+                if (day.year, day.month) != month:
+                    month = (day.year, day.month)
+                    salary_paid = False
+                    yield self._tx(account_id, f'{day:%Y%m}-rent', max(day.replace(day=1), self.start_date), -rent, 'HUUR WONING AMSTERDAM')
+                if day.day >= 25 and not salary_paid:
+                    salary_paid = True
+                    yield self._tx(account_id, f'{day:%Y%m}-salary', day.replace(day=25), salary, 'SALARY ACME BV')
+                index = rng.choices(merchants, cum_weights=_WEEKDAY_TABLES[day.weekday()])[0]
+                template, _category, mu, sigma, _weight = MERCHANTS[index]
+                amount = -round(rng.lognormvariate(mu, sigma), 2)
+                description = template.format(store=rng.randint(100, 999), ref=rng.randint(10 ** 5, 10 ** 6 - 1))
+            else:
+                amount = round(rng.choice((1, 1, 1, -1)) * rng.lognormvariate(4.5, 0.8), 2)
+                description = 'SAVINGS TRANSFER' if amount > 0 else 'TRANSFER TO CHECKING'
+            yield self._tx(account_id, f'{seq:09d}', day, amount, description)
+
+    @staticmethod
+    def _tx(account_id: str, suffix: str, day: date, amount: float, description: str) -> Dict[str, Any]:
+        return {
+            'id': f'{account_id}-{suffix}',
+            'date': day.isoformat(),
+            'amount': amount,
+            'description': description,
+            'account_id': account_id,
+        }
+
+    def get_accounts(self) -> List[Dict[str, Any]]:
+        return self.accounts
+
+    def get_balances(self) -> List[Dict[str, Any]]:
+        balances = []
+        for account in self.accounts:
+            account_id = account['account_id']
+            if account_id not in self._balances:
+                opening = round(self._rng(account_id + '/opening').uniform(500, 20000), 2)
+                self._balances[account_id] = round(opening + sum(tx['amount'] for tx in self.iter_transactions(account_id)), 2)
+            balances.append({
+                'account_id': account_id,
+                'currency': self.currency,
+                'amount': self._balances[account_id],
+                'last_updated': datetime.combine(self.end_date, time(23, 59)).isoformat(),
+            })
+        return balances
+
+    def get_transactions(self, account_id: str) -> List[Dict[str, Any]]:
+        if not any(a['account_id'] == account_id for a in self.accounts):
+            return []
+        return list(self.iter_transactions(account_id))
+
+    def get_transactions_since(self, account_id: str, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        if not any(a['account_id'] == account_id for a in self.accounts):
+            return [], cursor
+        transactions = [tx for tx in self.iter_transactions(account_id) if cursor is None or tx['date'] >= cursor]
+        next_cursor = max((tx['date'] for tx in transactions), default=cursor)
+        return transactions, next_cursor
+
+
+class SyntheticBankDataset:
+    """N users × M accounts × K transactions of synthetic data.
+
+    Parameters
+    ----------
+    users: int
+        Number of simulated users.
+    accounts_per_user: int, default 2
+        Accounts per user.
+    transactions_per_account: int, default 1000
+        Transactions per account.
+    seed: int, default 0
+        Global seed.
+    **kwargs
+        Further arguments for :class:`SyntheticBankProvider` (``days``,
+        ``end_date``, ``currency``).
+    """
+
+    def __init__(self, users: int, accounts_per_user: int = 2, transactions_per_account: int = 1000, seed: int = 0, **kwargs) -> None:
+        self.users = users
+        self.accounts_per_user = accounts_per_user
+        self.transactions_per_account = transactions_per_account
+        self.seed = seed
+        self.kwargs = kwargs
+
+    def __len__(self) -> int:
+        return self.users
+
+    def provider(self, index: int) -> SyntheticBankProvider:
+        """Return the provider of the ``index``‑th user."""
+        if not 0 <= index < self.users:
+            raise IndexError(index)
+        return SyntheticBankProvider(
+            f'user-{index}',
+            seed=self.seed,
+            accounts=self.accounts_per_user,
+            transactions_per_account=self.transactions_per_account,
+            **self.kwargs,
+        )
+
+    def __iter__(self) -> Iterator[SyntheticBankProvider]:
+        for index in range(self.users):
+            yield self.provider(index)
+
+    def iter_transactions(self) -> Iterator[Dict[str, Any]]:
+        """Stream every transaction of every user and account."""
+        for provider in self:
+            for account in provider.get_accounts():
+                yield from provider.iter_transactions(account['account_id'])
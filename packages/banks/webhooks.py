@@ -0,0 +1,313 @@
+"""Push‑based transaction updates from provider webhooks.
+
+Polling every provider for every user keeps bank data fresh at the cost of
+one delta request per account per sync, most of which return nothing.  Plaid,
+TrueLayer and Tink can instead notify us when an account has new
+transactions.  This module handles those notifications:
+
+* :class:`HMACVerifier` checks the signature of the raw request body;
+* :func:`parse_event` turns a payload into a :class:`WebhookEvent`;
+* :class:`WebhookIngestor` drops redeliveries by idempotency key, queues
+  events in process and drains the queue in batches.  Events of a batch are
+  coalesced per account, so a burst of notifications for one account costs a
+  single delta fetch through :meth:`TransactionSyncEngine.sync_account`.
+
+Events whose payload names no account sync every account of the user.  An
+event lost in a crash after it was acknowledged only delays its transactions
+until the next event or sync of that account, since deltas are cursor based.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+
+from . import ledger
+from .base import BankProvider
+from .sync import SyncResult, TransactionSyncEngine
+
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = 'X-Webhook-Signature'
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+DEFAULT_TOLERANCE = 300.0
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_MAX_BATCH = 500
+DEFAULT_MAX_DELAY = 0.5
+
+#: Signature of a provider lookup: ``providers_for(user_id, names)``.
+ProviderLookup = Callable[[str, List[str]], Mapping[str, BankProvider]]
+
+
+class WebhookVerificationError(ValueError):
+    """Raised when a webhook's signature is missing, invalid or expired."""
+
+
+class HMACVerifier:
+    """Verify ``t=<unix time>,v1=<hex HMAC‑SHA256>`` signatures.
+
+    The MAC covers ``"<t>.<body>"``, so a captured request cannot be replayed
+    after ``tolerance`` seconds.  Providers that sign differently (Plaid's
+    JWTs, TrueLayer's JWS) need their own verifier with the same
+    :meth:`verify` method.
+
+    Parameters
+    ----------
+    secret: str or bytes
+        The shared signing secret configured with the provider.
+    tolerance: float, default 300.0
+        Maximum age in seconds of a signature's timestamp.
+    clock: callable
+        Wall‑clock time source (overridable for tests).
+    """
+
+    def __init__(self, secret, *, tolerance: float = DEFAULT_TOLERANCE, clock: Callable[[], float] = time.time) -> None:
+        self.secret = secret.encode() if isinstance(secret, str) else bytes(secret)
+        self.tolerance = tolerance
+        self.clock = clock
+
+    def _mac(self, timestamp: str, body: bytes) -> str:
+        return hmac.new(self.secret, timestamp.encode() + b'.' + body, hashlib.sha256).hexdigest()
+
+    def sign(self, body: bytes, timestamp: Optional[float] = None) -> str:
+        """Return the signature header value for ``body``."""
+        t = str(int(self.clock() if timestamp is None else timestamp))
+        return f't={t},v1={self._mac(t, body)}'
+
+    def verify(self, headers: Mapping[str, str], body: bytes) -> None:
+        """Raise :class:`WebhookVerificationError` unless ``body`` is correctly signed."""
+        header = headers.get(SIGNATURE_HEADER) or headers.get(SIGNATURE_HEADER.lower())
+        if not header:
+            raise WebhookVerificationError("Missing webhook signature")
+        parts = dict(item.split('=', 1) for item in header.split(',') if '=' in item)
+        timestamp, signature = parts.get('t', ''), parts.get('v1', '')
+        # compare_digest only accepts ASCII strings
+        if not (timestamp.isascii() and signature.isascii()):
+            raise WebhookVerificationError("Malformed webhook signature")
+        try:
+            age = abs(self.clock() - int(timestamp))
+        except ValueError:
+            raise WebhookVerificationError("Malformed webhook signature") from None
+        if age > self.tolerance:
+            raise WebhookVerificationError("Webhook signature has expired")
+        if not hmac.compare_digest(self._mac(timestamp, body), signature):
+            raise WebhookVerificationError("Invalid webhook signature")
+
+
+@dataclass(frozen=True)
+class WebhookEvent:
+    """A normalised transaction notification.
+
+    Attributes
+    ----------
+    provider: str
+        Name of the provider that sent it.
+    event_id: str
+        Idempotency key; redeliveries carry the same one.
+    user_id: str
+        The user whose accounts changed.
+    account_ids: tuple of str
+        The affected accounts; empty means all accounts of the user.
+    event_type: str
+        The provider's event type, for logging.
+    """
+
+    provider: str
+    event_id: str
+    user_id: str
+    account_ids: Tuple[str, ...] = ()
+    event_type: str = ''
+
+
+def parse_event(provider: str, body: bytes, headers: Mapping[str, str], default_user: str) -> WebhookEvent:
+    """Build a :class:`WebhookEvent` from a verified request.
+
+    The idempotency key is the ``Idempotency-Key`` header, or the payload's
+    ``event_id``, ``id`` or ``webhook_id``.  Accounts come from
+    ``account_ids`` or ``account_id``, and the type from ``event_type``,
+    ``type`` or ``webhook_code``.
+
+    Raises
+    ------
+    ValueError
+        If the body is not a JSON object, carries no idempotency key, or its
+        accounts are not a list of string or integer IDs.
+    """
+    try:
+        payload: Dict[str, Any] = json.loads(body)
+    except ValueError:
+        raise ValueError("Webhook body is not valid JSON") from None
+    if not isinstance(payload, dict):
+        raise ValueError("Webhook body must be a JSON object")
+    event_id = (
+        headers.get(IDEMPOTENCY_HEADER) or headers.get(IDEMPOTENCY_HEADER.lower())
+        or payload.get('event_id') or payload.get('id') or payload.get('webhook_id')
+    )
+    if not event_id:
+        raise ValueError("Webhook has no idempotency key")
+    accounts = payload.get('account_ids')
+    if accounts is None:
+        accounts = [payload['account_id']] if payload.get('account_id') else []
+    elif not isinstance(accounts, list):
+        raise ValueError("Webhook account_ids must be a list")
+    if not all(isinstance(account, (str, int)) and not isinstance(account, bool) for account in accounts):
+        raise ValueError("Webhook account IDs must be strings or integers")
+    return WebhookEvent(
+        provider=provider,
+        event_id=str(event_id),
+        user_id=str(payload.get('user_id') or default_user),
+        account_ids=tuple(str(account) for account in accounts),
+        event_type=str(payload.get('event_type') or payload.get('type') or payload.get('webhook_code') or ''),
+    )
+
+
+class WebhookIngestor:
+    """Queue webhook events and sync the affected accounts in batches.
+
+    Parameters
+    ----------
+    engine: TransactionSyncEngine
+        Engine whose ledger receives the deltas and idempotency keys.
+    providers_for: callable
+        ``providers_for(user_id, names)`` returning blocking provider clients
+        by name, e.g. :meth:`ProviderRegistry.providers_for`.
+    max_queue: int, default 10000
+        Events queued before :meth:`submit` refuses new ones.
+    max_batch: int, default 500
+        Maximum number of events drained into one batch.
+    max_delay: float, default 0.5
+        Seconds to wait for more events after the first one of a batch.
+    """
+
+    def __init__(
+        self,
+        engine: TransactionSyncEngine,
+        providers_for: ProviderLookup,
+        *,
+        max_queue: int = DEFAULT_QUEUE_SIZE,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        self.engine = engine
+        self.providers_for = providers_for
+        self.max_batch = max(1, int(max_batch))
+        self.max_delay = max_delay
+        self.queue: 'asyncio.Queue[WebhookEvent]' = asyncio.Queue(maxsize=max_queue)
+        # Queue slots held by submit() calls still recording their key
+        self._reserved = 0
+        self._stopped: Optional[asyncio.Event] = None
+        self.counters = {'received': 0, 'duplicates': 0, 'batches': 0, 'accounts_synced': 0, 'errors': 0}
+
+    async def submit(self, event: WebhookEvent) -> bool:
+        """Queue ``event`` unless it is a redelivery.
+
+        Returns False for a duplicate.  Raises ``asyncio.QueueFull`` when the
+        queue is full, before the idempotency key is recorded, so the
+        provider's retry is not mistaken for a duplicate.  A slot is reserved
+        while the key is recorded, so concurrent calls cannot all pass the
+        check and then overflow the queue.
+        """
+        if self.queue.maxsize > 0 and self.queue.qsize() + self._reserved >= self.queue.maxsize:
+            raise asyncio.QueueFull
+        self._reserved += 1
+        try:
+            first = await asyncio.to_thread(ledger.record_webhook_event, self.engine.db_path, event.provider, event.event_id)
+        finally:
+            self._reserved -= 1
+        if not first:
+            self.counters['duplicates'] += 1
+            return False
+        self.counters['received'] += 1
+        # Only run() takes events out, so the reserved slot is still free
+        self.queue.put_nowait(event)
+        return True
+
+    async def _fill(self, batch: List[WebhookEvent]) -> List[WebhookEvent]:
+        """Add events arriving within ``max_delay`` seconds to ``batch``."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def sync_batch(self, batch: List[WebhookEvent]) -> List[SyncResult]:
+        """Fetch the deltas of every account named in ``batch``, once each (blocking)."""
+        accounts: Dict[Tuple[str, str], Set[str]] = {}
+        whole: Set[Tuple[str, str]] = set()
+        for event in batch:
+            key = (event.user_id, event.provider)
+            if event.account_ids:
+                accounts.setdefault(key, set()).update(event.account_ids)
+            else:
+                whole.add(key)
+        results: List[SyncResult] = []
+        for user_id, name in sorted(set(accounts) | whole):
+            try:
+                provider = self.providers_for(user_id, [name])[name]
+            except KeyError:
+                logger.warning("Ignoring webhooks for unknown bank provider %s", name)
+                continue
+            if (user_id, name) in whole:
+                results.extend(self.engine.sync_provider(name, provider))
+            else:
+                results.extend(
+                    self.engine.sync_account(name, provider, account_id) for account_id in sorted(accounts[(user_id, name)])
+                )
+        return results
+
+    async def run(self) -> None:
+        """Drain the queue in batches until :meth:`stop` is called."""
+        self._stopped = asyncio.Event()
+        stopped = asyncio.create_task(self._stopped.wait())
+        try:
+            while not self._stopped.is_set():
+                # Only the wait for a batch's first event is interrupted by stop()
+                first = asyncio.create_task(self.queue.get())
+                await asyncio.wait({first, stopped}, return_when=asyncio.FIRST_COMPLETED)
+                if not first.done():
+                    first.cancel()
+                    break
+                batch = await self._fill([first.result()])
+                try:
+                    results = await asyncio.to_thread(self.sync_batch, batch)
+                except Exception as exc:
+                    logger.warning("Syncing a webhook batch failed: %s", exc)
+                    self.counters['errors'] += 1
+                else:
+                    self.counters['batches'] += 1
+                    self.counters['accounts_synced'] += len(results)
+                    self.counters['errors'] += sum(1 for result in results if result.error)
+                for _ in batch:
+                    self.queue.task_done()
+        finally:
+            stopped.cancel()
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been synced."""
+        await self.queue.join()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of received, duplicate and synced events and the queue length."""
+        return {**self.counters, 'queued': self.queue.qsize()}
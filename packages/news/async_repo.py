@@ -0,0 +1,103 @@
+"""Awaitable access to the news database for async code.
+
+The functions in :mod:`packages.news.repo` use blocking ``sqlite3`` calls.
+Called from an ``async def`` route they stall the event loop, and with it
+every other request, for as long as a query runs or waits for a write lock.
+
+:class:`AsyncNewsRepository` runs them on dedicated threads instead:
+
+* reads go to a small pool of reader threads;
+* writes go to a single writer thread, so a large save of pipeline results
+  (the API passes :func:`~packages.news.pipeline.persist_results` to
+  :meth:`~AsyncNewsRepository.write`) never occupies a reader and writes are
+  serialised the way SQLite needs them;
+* the database is switched to WAL mode, so readers keep answering from the
+  last committed state while a write transaction is open.
+
+The pools are separate from asyncio's default executor, which runs the news
+pipeline and bank syncs, so database queries do not queue behind them.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar
+import asyncio
+import logging
+import sqlite3
+
+from . import repo as news_repo
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+DEFAULT_READERS = 4
+
+
+class AsyncNewsRepository:
+    """Non‑blocking interface to the news database.
+
+    Parameters
+    ----------
+    db_path: str
+        Path to the SQLite database file.
+    readers: int, default 4
+        Number of reader threads.
+    wal: bool, default True
+        Switch the database to WAL mode on creation.
+    """
+
+    def __init__(self, db_path: str, *, readers: int = DEFAULT_READERS, wal: bool = True) -> None:
+        self.db_path = db_path
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='news-db-read')
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='news-db-write')
+        if wal:
+            try:
+                mode = news_repo.enable_wal(db_path)
+                if mode.lower() != 'wal':
+                    logger.warning("News database journal mode is %s; readers may block on writes", mode)
+            except sqlite3.Error as exc:
+                logger.warning("Failed to enable WAL for the news database: %s", exc)
+
+    async def read(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking read ``func(*args, **kwargs)`` on a reader thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._readers, partial(func, *args, **kwargs))
+
+    async def write(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking write ``func(*args, **kwargs)`` on the writer thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._writer, partial(func, *args, **kwargs))
+
+    async def fetch_top_topics(self, category: str, limit: int = 4) -> List[Dict]:
+        return await self.read(news_repo.fetch_top_topics, category, self.db_path, limit)
+
+    async def fetch_daily_digest(self, categories: List[str], limit: int = 4) -> Dict[str, List[Dict]]:
+        return await self.read(news_repo.fetch_daily_digest, self.db_path, categories, limit)
+
+    async def search_topics(
+        self,
+        query: str,
+        *,
+        categories: Optional[Sequence[str]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Dict]:
+        return await self.read(
+            news_repo.search_topics, self.db_path, query, categories=categories, limit=limit, offset=offset
+        )
+
+    async def fetch_subscription(self, user_id: str) -> Optional[Dict]:
+        return await self.read(news_repo.fetch_subscription, self.db_path, user_id)
+
+    async def save_subscription(self, user_id: str, categories: List[str], min_importance: float, limit: int) -> None:
+        await self.write(news_repo.save_subscription, self.db_path, user_id, categories, min_importance, limit)
+
+    async def save_pipeline_output(self, results: Dict[str, List[Dict]]) -> None:
+        await self.write(news_repo.save_pipeline_output, results, self.db_path)
+
+    def close(self) -> None:
+        """Wait for queued operations and stop the threads."""
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
@@ -0,0 +1,291 @@
+"""Columnar storage of articles.
+
+A list of :class:`~packages.news.datatypes.Article` objects costs several
+hundred bytes per article: every instance carries its own ``datetime`` and
+its own copies of publisher and category names, although a corpus has only a
+handful of each.  :class:`ArticleBatch` stores the same data column by column:
+
+* ``title``, ``link``, ``description``: :class:`TextColumn`, i.e. one
+  contiguous UTF‑8 buffer per field plus an int64 offsets array;
+* ``published``: int64 microseconds since the Unix epoch (naive UTC);
+* ``publisher_code``: int32 index into :attr:`ArticleBatch.publishers`;
+* ``category_code``: int32 index into :attr:`ArticleBatch.categories`, or
+  ``-1`` for articles without a category.
+
+The pipeline stages accept batches directly (see
+:func:`~packages.news.classify.classify_articles`,
+:func:`~packages.news.cluster.cluster_articles` and
+:func:`~packages.news.score.score_clusters`), and recency, coverage and
+category filters become vectorised NumPy operations.  Iterating over a batch
+or indexing it with an integer yields ordinary :class:`Article` objects, so
+code written for lists keeps working.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .datatypes import Article
+
+
+_EPOCH = datetime(1970, 1, 1)
+UNCATEGORISED = -1
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Convert a naive UTC (or aware) datetime to epoch microseconds."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_epoch_us(value: int) -> datetime:
+    """Convert epoch microseconds to a naive UTC datetime."""
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+class TextColumn:
+    """A sequence of strings stored as one contiguous UTF‑8 buffer and offsets.
+
+    Item ``i`` is ``data[offsets[i]:offsets[i + 1]].decode()``.  A single
+    ``str`` would be widened to two or four bytes per character by the first
+    non‑Latin‑1 character, so the buffer is kept as bytes.
+    """
+
+    __slots__ = ('data', 'offsets')
+
+    def __init__(self, data: bytes, offsets: np.ndarray) -> None:
+        self.data = data
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str]) -> 'TextColumn':
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+        return cls(b''.join(encoded), offsets)
+
+    def __len__(self) -> int:
+        return int(self.offsets.shape[0]) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        data = self.data
+        bounds = self.offsets.tolist()
+        for start, end in zip(bounds, bounds[1:]):
+            yield data[start:end].decode('utf-8')
+
+    def take(self, indices: np.ndarray) -> 'TextColumn':
+        data = self.data
+        bounds = self.offsets
+        chunks = [data[bounds[i]:bounds[i + 1]] for i in np.asarray(indices).tolist()]
+        offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        if chunks:
+            np.cumsum(np.fromiter(map(len, chunks), dtype=np.int64, count=len(chunks)), out=offsets[1:])
+        return TextColumn(b''.join(chunks), offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.nbytes
+
+
+def _intern(value: Optional[str], vocabulary: List[str], codes: Dict[str, int]) -> int:
+    if value is None:
+        return UNCATEGORISED
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(vocabulary)
+        vocabulary.append(value)
+    return code
+
+
+class ArticleBatch:
+    """Column‑oriented collection of articles.
+
+    Build instances with :meth:`from_articles`; the constructor takes
+    ready‑made columns as described in the module docstring.
+    """
+
+    def __init__(
+        self,
+        title: TextColumn,
+        link: TextColumn,
+        description: TextColumn,
+        published: np.ndarray,
+        publisher_code: np.ndarray,
+        publishers: Sequence[str],
+        category_code: np.ndarray,
+        categories: Sequence[str],
+    ) -> None:
+        self.title = title
+        self.link = link
+        self.description = description
+        self.published = np.asarray(published, dtype=np.int64)
+        self.publisher_code = np.asarray(publisher_code, dtype=np.int32)
+        self.publishers = list(publishers)
+        self.category_code = np.asarray(category_code, dtype=np.int32)
+        self.categories = list(categories)
+        self._category_index = {name: code for code, name in enumerate(self.categories)}
+
+    @classmethod
+    def from_articles(cls, articles: Iterable[Article]) -> 'ArticleBatch':
+        """Build a batch from articles.
+
+        ``articles`` is consumed once, so a generator such as
+        :func:`~packages.news.jsonl.read_articles_jsonl` can be loaded
+        without materialising the :class:`Article` objects.
+        """
+        titles: List[str] = []
+        links: List[str] = []
+        descriptions: List[str] = []
+        published: List[int] = []
+        publishers: List[str] = []
+        publisher_codes: List[int] = []
+        publisher_index: Dict[str, int] = {}
+        categories: List[str] = []
+        category_codes: List[int] = []
+        category_index: Dict[str, int] = {}
+        for article in articles:
+            titles.append(article.title)
+            links.append(article.link)
+            descriptions.append(article.description)
+            published.append(to_epoch_us(article.published))
+            publisher_codes.append(_intern(article.publisher, publishers, publisher_index))
+            category_codes.append(_intern(article.category or None, categories, category_index))
+        return cls(
+            TextColumn.from_strings(titles),
+            TextColumn.from_strings(links),
+            TextColumn.from_strings(descriptions),
+            np.asarray(published, dtype=np.int64),
+            np.asarray(publisher_codes, dtype=np.int32),
+            publishers,
+            np.asarray(category_codes, dtype=np.int32),
+            categories,
+        )
+
+    @classmethod
+    def empty(cls) -> 'ArticleBatch':
+        return cls.from_articles([])
+
+    def __len__(self) -> int:
+        return int(self.published.shape[0])
+
+    def __iter__(self) -> Iterator[Article]:
+        for i in range(len(self)):
+            yield self.article(i)
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray, Sequence[int]]) -> Union[Article, 'ArticleBatch']:
+        """Return the article at an integer index, or a batch for a slice, mask or index array."""
+        if isinstance(index, (int, np.integer)):
+            return self.article(int(index))
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self))[index])
+        index = np.asarray(index)
+        if index.dtype == bool:
+            return self.filter(index)
+        return self.take(index)
+
+    def article(self, index: int) -> Article:
+        """Materialise the article at ``index``."""
+        if index < 0:
+            index += len(self)
+        return Article(
+            title=self.title[index],
+            link=self.link[index],
+            description=self.description[index],
+            published=from_epoch_us(self.published[index]),
+            publisher=self.publishers[self.publisher_code[index]],
+            category=self.category(index),
+        )
+
+    def category(self, index: int) -> Optional[str]:
+        code = int(self.category_code[index])
+        return None if code == UNCATEGORISED else self.categories[code]
+
+    def publisher(self, index: int) -> str:
+        return self.publishers[self.publisher_code[index]]
+
+    def set_category(self, index: int, category: Optional[str]) -> None:
+        """Assign a category to the article at ``index``."""
+        self.category_code[index] = _intern(category, self.categories, self._category_index)
+
+    def texts(self) -> List[str]:
+        """Return ``"title description"`` for each article, as used for matching and clustering."""
+        return [f"{title} {description}" for title, description in zip(self.title, self.description)]
+
+    def take(self, indices: Union[np.ndarray, Sequence[int]]) -> 'ArticleBatch':
+        """Return a new batch with the articles at ``indices``, in that order.
+
+        Publisher and category dictionaries are shared with this batch, so
+        codes stay comparable between the two.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        batch = ArticleBatch(
+            self.title.take(indices),
+            self.link.take(indices),
+            self.description.take(indices),
+            self.published[indices],
+            self.publisher_code[indices],
+            (),
+            self.category_code[indices],
+            (),
+        )
+        batch.publishers = self.publishers
+        batch.categories = self.categories
+        batch._category_index = self._category_index
+        return batch
+
+    def filter(self, mask: np.ndarray) -> 'ArticleBatch':
+        """Return the articles for which ``mask`` is true."""
+        return self.take(np.flatnonzero(mask))
+
+    def since(self, cutoff: datetime) -> 'ArticleBatch':
+        """Return the articles published at or after ``cutoff``."""
+        return self.filter(self.published >= to_epoch_us(cutoff))
+
+    def by_category(self) -> Dict[Optional[str], 'ArticleBatch']:
+        """Split the batch by category, in order of first appearance."""
+        codes = self.category_code
+        if not len(codes):
+            return {}
+        order = np.argsort(codes, kind='stable')
+        unique, starts = np.unique(codes[order], return_index=True)
+        groups = np.split(order, starts[1:])
+        # dict order follows the first article of each category, like a setdefault loop
+        firsts = [group[0] for group in groups]
+        result: Dict[Optional[str], ArticleBatch] = {}
+        for position in np.argsort(firsts, kind='stable'):
+            code = int(unique[position])
+            name = None if code == UNCATEGORISED else self.categories[code]
+            result[name] = self.take(groups[position])
+        return result
+
+    def latest_index(self) -> int:
+        """Index of the most recently published article (the first one on ties)."""
+        return int(np.argmax(self.published))
+
+    def latest(self) -> datetime:
+        return from_epoch_us(self.published.max())
+
+    def source_count(self) -> int:
+        """Number of distinct publishers in the batch."""
+        return int(np.unique(self.publisher_code).shape[0])
+
+    def sources(self) -> List[str]:
+        return [self.publishers[code] for code in np.unique(self.publisher_code).tolist()]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns (excluding dictionaries)."""
+        return (
+            self.title.nbytes + self.link.nbytes + self.description.nbytes
+            + self.published.nbytes + self.publisher_code.nbytes + self.category_code.nbytes
+        )
@@ -9,9 +9,12 @@ wish to use a more sophisticated model or ruleset.
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Union
 import re
 
+import numpy as np
+
+from .batch import ArticleBatch, UNCATEGORISED
 from .datatypes import Article
 
 
@@ -24,24 +27,28 @@ CATEGORY_KEYWORDS = {
 }
 
 
-def classify_articles(articles: Iterable[Article]) -> None:
+def _classify_text(text: str) -> str:
+    """Return the first category whose keywords match ``text`` (lower case)."""
+    for cat, patterns in CATEGORY_KEYWORDS.items():
+        for pattern in patterns:
+            if re.search(pattern.lower(), text):
+                return cat
+    return 'Unknown'
+
+
+def classify_articles(articles: Union[Iterable[Article], ArticleBatch]) -> None:
     """Assign categories to articles lacking them based on keywords.
 
     This function modifies the articles in place.  Articles with an existing
-    category are left unchanged.
+    category are left unchanged.  An :class:`ArticleBatch` is updated through
+    its category codes, so only uncategorised rows are materialised as text.
     """
+    if isinstance(articles, ArticleBatch):
+        for index in np.flatnonzero(articles.category_code == UNCATEGORISED).tolist():
+            text = f"{articles.title[index]} {articles.description[index]}".lower()
+            articles.set_category(index, _classify_text(text))
+        return
     for article in articles:
         if article.category:
             continue
-        text = f"{article.title} {article.description}".lower()
-        assigned = False
-        for cat, patterns in CATEGORY_KEYWORDS.items():
-            for pattern in patterns:
-                if re.search(pattern.lower(), text):
-                    article.category = cat
-                    assigned = True
-                    break
-            if assigned:
-                break
-        if not article.category:
-            article.category = 'Unknown'
+        article.category = _classify_text(f"{article.title} {article.description}".lower())
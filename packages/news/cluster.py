@@ -8,50 +8,136 @@ similarity of article titles and descriptions.
 
 from __future__ import annotations
 
-from typing import List, Iterable
+from collections.abc import Sequence
+from typing import Callable, List, Iterable, Optional, Tuple, Union
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import DBSCAN
-from sklearn.metrics.pairwise import cosine_distances
 import numpy as np
+from scipy import sparse
 
+from .batch import ArticleBatch
 from .datatypes import Article
+from .features import HashedTfidfVectorizer
 
 
-def cluster_articles(articles: Iterable[Article], eps: float = 0.5, min_samples: int = 1) -> List[List[Article]]:
+def cluster_articles(
+    articles: Union[Iterable[Article], ArticleBatch],
+    eps: float = 0.5,
+    min_samples: int = 1,
+    vectorizer: Optional[HashedTfidfVectorizer] = None,
+    vectors=None,
+) -> List:
     """Group similar articles into clusters using TF‑IDF and DBSCAN.
 
     Parameters
     ----------
-    articles: iterable of Article
-        A list of articles to cluster.
+    articles: iterable of Article or ArticleBatch
+        A list of articles to cluster.  A batch is clustered from its text
+        columns without materialising articles.
     eps: float, default 0.5
         The maximum cosine distance between two samples for them to be considered in the same neighbourhood.  A smaller value yields more clusters.
     min_samples: int, default 1
         The number of samples in a neighbourhood for a point to be considered as a core point.
+    vectorizer: HashedTfidfVectorizer, optional
+        Shared vectoriser with persistent IDF statistics.  The articles are
+        added to its statistics and vectorised without refitting.  When
+        omitted, a ``TfidfVectorizer`` is fitted on the articles alone.
+    vectors: sparse matrix, optional
+        Precomputed L2‑normalised vectors, one row per article (e.g. from
+        :class:`~packages.news.vectorstore.VectorStore`).  Takes precedence
+        over ``vectorizer``.
 
     Returns
     -------
-    list of list of Article
-        A list of clusters, each containing the articles that were grouped together.
+    list of list of Article, or list of ArticleBatch
+        A list of clusters, each containing the articles that were grouped
+        together.  For a batch input each cluster is itself a batch.
     """
-    articles = list(articles)
-    if not articles:
-        return []
+    return cluster_articles_with_vectors(articles, eps, min_samples, vectorizer, vectors)[0]
+
+
+def cluster_articles_with_vectors(
+    articles: Union[Iterable[Article], ArticleBatch],
+    eps: float = 0.5,
+    min_samples: int = 1,
+    vectorizer: Optional[HashedTfidfVectorizer] = None,
+    vectors=None,
+) -> Tuple[List, 'ClusterVectors']:
+    """Like :func:`cluster_articles`, but also return the features it used.
+
+    Returns
+    -------
+    clusters: list
+        As returned by :func:`cluster_articles`.
+    vectors: ClusterVectors
+        The TF‑IDF rows of each cluster's articles, aligned with ``clusters``,
+        and the transform into the same feature space.
+        :func:`~packages.news.summarize.summarize_clusters` uses them to score
+        sentences without tokenising the articles again.
+    """
+    is_batch = isinstance(articles, ArticleBatch)
+    if not is_batch:
+        articles = list(articles)
+    if not len(articles):
+        return [], ClusterVectors(sparse.csr_matrix((0, 0)), [], None)
 
     # Build corpus from title + description
-    corpus = [f"{a.title} {a.description}" for a in articles]
-    vectorizer = TfidfVectorizer(stop_words='english')
-    X = vectorizer.fit_transform(corpus)
-    # Compute cosine distances (1 - similarity)
-    distance_matrix = cosine_distances(X)
-    # DBSCAN expects distances; metric='precomputed' uses the distance matrix directly
-    db = DBSCAN(eps=eps, min_samples=min_samples, metric='precomputed')
-    labels = db.fit_predict(distance_matrix)
-
-    clusters: dict[int, List[Article]] = {}
-    for label, article in zip(labels, articles):
-        clusters.setdefault(label, []).append(article)
-    # Convert to list and sort clusters by recency (most recent first)
-    cluster_list = list(clusters.values())
-    cluster_list.sort(key=lambda cl: max(a.published for a in cl), reverse=True)
-    return cluster_list
+    corpus = articles.texts() if is_batch else [f"{a.title} {a.description}" for a in articles]
+    transform = vectorizer.transform if vectorizer is not None else None
+    if vectors is not None:
+        X = vectors
+    elif vectorizer is None:
+        tfidf = TfidfVectorizer(stop_words='english')
+        X = tfidf.fit_transform(corpus)
+        transform = tfidf.transform
+    else:
+        X = vectorizer.fit_transform(corpus)
+    X = sparse.csr_matrix(X)
+    # Cosine distances are computed in bounded‑memory chunks rather than as a
+    # full n×n matrix, which matters when a whole corpus is clustered at once
+    db = DBSCAN(eps=eps, min_samples=min_samples, metric='cosine', algorithm='brute')
+    labels = db.fit_predict(X)
+    # Row indices per label, labels in order of first appearance
+    by_label = np.argsort(labels, kind='stable')
+    _labels, starts = np.unique(labels[by_label], return_index=True)
+    members = sorted(np.split(by_label, starts[1:]), key=lambda rows: rows[0])
+
+    if is_batch:
+        clusters = [articles.take(rows) for rows in members]
+        latest = [int(batch.published.max()) for batch in clusters]
+    else:
+        clusters = [[articles[i] for i in rows] for rows in members]
+        latest = [max(a.published for a in cluster) for cluster in clusters]
+    # Sort clusters by recency (most recent first)
+    order = sorted(range(len(clusters)), key=latest.__getitem__, reverse=True)
+    return [clusters[i] for i in order], ClusterVectors(X, [members[i] for i in order], transform)
+
+
+class ClusterVectors(Sequence):
+    """Per‑cluster rows of the clustered feature matrix.
+
+    Item ``i`` is the sparse matrix of cluster ``i``'s article vectors,
+    sliced on access, so only the clusters that are used (e.g. summarised)
+    cost anything.  ``transform`` maps texts into the same feature space, or
+    is None when the clustering only had precomputed vectors.
+    """
+
+    def __init__(
+        self,
+        matrix: sparse.csr_matrix,
+        members: List[np.ndarray],
+        transform: Optional[Callable[[Sequence[str]], sparse.csr_matrix]],
+    ) -> None:
+        self.matrix = matrix
+        self.members = members
+        self.transform = transform
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __getitem__(self, index: int) -> sparse.csr_matrix:
+        return self.matrix[self.members[index]]
+
+    def stack(self, indices: Sequence[int]) -> sparse.csr_matrix:
+        """Rows of several clusters in one slice, in the order of ``indices``."""
+        return self.matrix[np.concatenate([self.members[i] for i in indices])]
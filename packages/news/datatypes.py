@@ -1,6 +1,8 @@
 """Data classes used by the news engine.
 
 The `Article` data class represents a single news article after normalisation.
+It is slotted to keep per‑instance overhead low; large collections are better
+held in a columnar :class:`~packages.news.batch.ArticleBatch`.
 """
 
 from dataclasses import dataclass
@@ -8,7 +10,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Article:
     """Represents a normalised news article.
 
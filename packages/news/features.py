@@ -0,0 +1,206 @@
+"""Hashed TF‑IDF features with incrementally maintained IDF statistics.
+
+:func:`~packages.news.cluster.cluster_articles` used to fit a new
+``TfidfVectorizer`` per category on every run, so vocabulary building and IDF
+fitting were repeated each time and vectors from different runs lived in
+different spaces.  :class:`HashedTfidfVectorizer` uses a fixed feature space
+instead: tokens are hashed into ``n_features`` columns (scikit‑learn's
+:class:`~sklearn.feature_extraction.text.HashingVectorizer`, with the same
+tokenisation and English stop words as before), and document frequencies are
+counted per column and updated as new documents arrive.
+
+* Transforming a document costs O(tokens); nothing is refitted.
+* Vectors from different runs and categories share one space and are directly
+  comparable; they only drift as far as the IDF statistics do.
+* The counts are small (one int32 per feature) and are persisted with
+  :meth:`HashedTfidfVectorizer.save`, by default to ``data/news_idf.npz``.
+
+The file has a single owner (see :mod:`packages.news.ownership`): the first
+process to load it, normally the news worker.  :meth:`~HashedTfidfVectorizer.checkpoint`
+saves the owner's counts, and makes every other process reload them instead,
+so processes never overwrite each other's counts.  Documents counted by a
+non‑owner only affect its own vectors until the next reload.
+
+Weights follow scikit‑learn's defaults: raw term counts times the smoothed IDF
+``log((1 + n) / (1 + df)) + 1``, L2‑normalised per row.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+import os
+import tempfile
+import threading
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from .ownership import WriterLock
+
+
+DEFAULT_N_FEATURES = 2 ** 20
+DEFAULT_IDF_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'news_idf.npz')
+
+
+class HashedTfidfVectorizer:
+    """TF‑IDF over a fixed hashed feature space with incremental IDF.
+
+    Parameters
+    ----------
+    n_features: int, default 2**20
+        Size of the hashed feature space.  Must match the persisted counts.
+    path: str, optional
+        File used by :meth:`save` and :meth:`load`.
+    stop_words: str or list, default 'english'
+        Passed to the underlying :class:`HashingVectorizer`.
+    """
+
+    def __init__(self, n_features: int = DEFAULT_N_FEATURES, *, path: Optional[str] = None, stop_words='english') -> None:
+        self.n_features = int(n_features)
+        self.path = path
+        self._hasher = HashingVectorizer(
+            n_features=self.n_features, stop_words=stop_words, alternate_sign=False, norm=None
+        )
+        self.df = np.zeros(self.n_features, dtype=np.int32)
+        self.n_documents = 0
+        self._lock = threading.Lock()
+        self._writer = WriterLock(f'{path}.lock') if path else None
+        self._mtime: Optional[int] = None
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_IDF_PATH, **kwargs) -> 'HashedTfidfVectorizer':
+        """Load persisted counts from ``path``, or start empty if it does not exist.
+
+        The returned instance owns the file unless another process already
+        does (see :attr:`owner`).
+        """
+        n_features = kwargs.pop('n_features', DEFAULT_N_FEATURES)
+        if os.path.exists(path):
+            with np.load(path) as data:
+                n_features = int(data['n_features'])
+        vectorizer = cls(n_features, path=path, **kwargs)
+        vectorizer._writer.acquire()
+        vectorizer.refresh()
+        return vectorizer
+
+    @property
+    def owner(self) -> bool:
+        """True if this instance may write :attr:`path`."""
+        return self._writer is not None and self._writer.acquire()
+
+    def refresh(self) -> bool:
+        """Reload the counts from :attr:`path` if it was saved since the last load or save.
+
+        Returns True if the counts were replaced.  In‑memory counts not yet
+        saved are discarded, so the owner only calls this on load.
+        """
+        if not self.path:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+        with np.load(self.path) as data:
+            if int(data['n_features']) != self.n_features:
+                raise ValueError(f"{self.path} has {int(data['n_features'])} features, expected {self.n_features}")
+            df = data['df'].astype(np.int32, copy=True)
+            n_documents = int(data['n_documents'])
+        with self._lock:
+            self.df, self.n_documents, self._mtime = df, n_documents, mtime
+        return True
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Persist the document frequencies atomically.
+
+        Saves are serialised with updates, and each writes its own temporary
+        file, so concurrent saves from several threads cannot collide.
+
+        Raises
+        ------
+        RuntimeError
+            If ``path`` is the shared :attr:`path` and another process owns it.
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path to save the vectorizer to")
+        if path == self.path and not self.owner:
+            raise RuntimeError(f"{path} is owned by another process")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'{os.path.basename(path)}.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as handle:
+                    np.savez(handle, df=self.df, n_documents=self.n_documents, n_features=self.n_features)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            if path == self.path:
+                self._mtime = os.stat(path).st_mtime_ns
+
+    def checkpoint(self) -> bool:
+        """Save the counts if this process owns :attr:`path`, otherwise reload the owner's.
+
+        Returns True if the counts were saved.
+        """
+        if not self.path:
+            return False
+        if self.owner:
+            self.save()
+            return True
+        self.refresh()
+        return False
+
+    def close(self) -> None:
+        """Give up ownership of :attr:`path` (the counts stay usable in memory)."""
+        if self._writer is not None:
+            self._writer.release()
+
+    def counts(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        """Raw hashed term counts, one row per text."""
+        return self._hasher.transform(texts)
+
+    def partial_fit(self, texts: Iterable[str]) -> 'HashedTfidfVectorizer':
+        """Add ``texts`` to the document‑frequency statistics."""
+        self._update(self.counts(texts))
+        return self
+
+    def _update(self, counts: sparse.csr_matrix) -> None:
+        with self._lock:
+            # Column indices are unique within a row, so each occurrence is one document
+            np.add.at(self.df, counts.indices, 1)
+            self.n_documents += counts.shape[0]
+
+    def idf(self) -> np.ndarray:
+        """Smoothed inverse document frequency per feature."""
+        return np.log((1.0 + self.n_documents) / (1.0 + self.df)) + 1.0
+
+    def _weight(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        n, df = self.n_documents, self.df
+        weighted = counts.astype(np.float64)
+        # Only the IDF of features actually present is computed
+        weighted.data *= np.log((1.0 + n) / (1.0 + df[weighted.indices])) + 1.0
+        # L2‑normalise rows in place (sklearn's normalize adds validation overhead per call)
+        rows = np.repeat(np.arange(weighted.shape[0]), np.diff(weighted.indptr))
+        norms = np.sqrt(np.bincount(rows, weights=weighted.data ** 2, minlength=weighted.shape[0]))
+        norms[norms == 0] = 1.0
+        weighted.data /= norms[rows]
+        return weighted
+
+    def transform(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        """TF‑IDF vectors for ``texts`` using the current statistics."""
+        return self._weight(self.counts(texts))
+
+    def fit_transform(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        """Update the statistics with ``texts`` and return their vectors.
+
+        Unlike scikit‑learn's vectorisers this does not refit: the counts
+        accumulate across calls.  Documents passed twice are counted twice.
+        """
+        counts = self.counts(texts)
+        self._update(counts)
+        return self._weight(counts)
@@ -0,0 +1,356 @@
+"""Per‑feed health tracking, circuit breaking and adaptive timeouts.
+
+Fetching a dead or slow feed with a fixed 10‑second timeout costs those 10
+seconds on every run, forever.  :class:`FeedHealthRegistry` records every
+fetch of every feed (latency, failures, last success) and uses it to:
+
+* skip feeds that keep failing: after ``failure_threshold`` consecutive
+  failures the feed's circuit opens, and it is only probed again after a
+  backoff that doubles with every further failure, up to ``max_backoff``.
+  A successful probe closes the circuit;
+* derive each feed's timeout from its observed latency: ``multiplier`` times
+  its 95th percentile, between ``min_timeout`` and ``default_timeout``.  The
+  timeout doubles with each consecutive failure, so a feed that has become
+  slower is not cut off for good.  Feeds without enough history get
+  ``default_timeout``.
+
+The registry is persisted as JSON, so the news worker and the API, which run
+in different processes, share it.  Like the IDF statistics (see
+:mod:`packages.news.ownership`), the file has a single owner: the process
+holding ``<file>.lock`` saves it, and the others only read it.
+:meth:`FeedHealthRegistry.refresh` merges the owner's changes into the local
+state, keeping whichever record of a feed saw the more recent fetch, so a
+read‑only process does not lose the fetches it made itself.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from .ownership import WriterLock
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_FEED_HEALTH_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'news_feed_health.json'
+)
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MIN_TIMEOUT = 1.0
+DEFAULT_MULTIPLIER = 3.0
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_BASE_BACKOFF = 60.0
+DEFAULT_MAX_BACKOFF = 6 * 3600.0
+# Successful fetches needed before the timeout adapts, and latencies kept per feed
+MIN_SAMPLES = 5
+LATENCY_WINDOW = 50
+
+
+@dataclass
+class FeedHealth:
+    """Fetch history of a single feed.  Times are Unix timestamps."""
+
+    url: str
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_success: Optional[float] = None
+    last_failure: Optional[float] = None
+    last_error: Optional[str] = None
+    open_until: Optional[float] = None
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW), repr=False)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile ``q`` (0–100) of recent successful fetches, in seconds."""
+        return float(np.percentile(self.latencies, q)) if self.latencies else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'successes': self.successes,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'last_success': self.last_success,
+            'last_failure': self.last_failure,
+            'last_error': self.last_error,
+            'open_until': self.open_until,
+            'latencies': list(self.latencies),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FeedHealth':
+        health = cls(**{key: value for key, value in data.items() if key != 'latencies'})
+        health.latencies.extend(data.get('latencies', ()))
+        return health
+
+    @property
+    def last_fetch(self) -> Optional[float]:
+        """Time of the most recent fetch, successful or not."""
+        times = [t for t in (self.last_success, self.last_failure) if t is not None]
+        return max(times) if times else None
+
+
+class FeedHealthRegistry:
+    """Health of every fetched feed, with circuit breaking and adaptive timeouts.
+
+    Parameters
+    ----------
+    path: str, optional
+        JSON file the registry is saved to (by its owner) and refreshed from.
+    failure_threshold: int, default 3
+        Consecutive failures after which a feed's circuit opens.
+    base_backoff, max_backoff: float
+        Seconds before the first probe of an open circuit, and the cap of the
+        doubling backoff.
+    default_timeout, min_timeout: float
+        Bounds of the adaptive timeout; feeds without history get
+        ``default_timeout``.
+    multiplier: float, default 3.0
+        Timeout as a multiple of the feed's 95th‑percentile latency.
+    clock: callable
+        Wall‑clock time source (overridable for simulations).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        default_timeout: float = DEFAULT_TIMEOUT,
+        min_timeout: float = DEFAULT_MIN_TIMEOUT,
+        multiplier: float = DEFAULT_MULTIPLIER,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.multiplier = multiplier
+        self.clock = clock
+        self.feeds: Dict[str, FeedHealth] = {}
+        self._lock = threading.Lock()
+        self._writer = WriterLock(f'{path}.lock') if path else None
+        self._mtime: Optional[int] = None
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_FEED_HEALTH_PATH, **kwargs) -> 'FeedHealthRegistry':
+        """Load the registry saved at ``path``, or start empty if it does not exist.
+
+        The returned registry owns the file unless another process already
+        does (see :attr:`owner`).
+        """
+        registry = cls(path, **kwargs)
+        registry._writer.acquire()
+        registry.refresh()
+        return registry
+
+    @property
+    def owner(self) -> bool:
+        """True if this registry may write :attr:`path`."""
+        return self._writer is not None and self._writer.acquire()
+
+    def refresh(self) -> bool:
+        """Merge ``path`` into the registry if it was saved since the last load or save.
+
+        For each feed, the record with the more recent fetch wins, so fetches
+        recorded locally but not yet saved (or never saved, by a read‑only
+        process) are kept.  An unreadable file is logged and ignored until it
+        changes again.  Returns True if the file was merged.
+        """
+        if not self.path:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                saved = [FeedHealth.from_dict(item) for item in json.load(handle).get('feeds', [])]
+        except (OSError, ValueError, TypeError, AttributeError) as exc:
+            logger.warning("Ignoring unreadable feed health file %s: %s", self.path, exc)
+            self._mtime = mtime
+            return False
+        with self._lock:
+            for health in saved:
+                local = self.feeds.get(health.url)
+                if local is None or (health.last_fetch or 0.0) >= (local.last_fetch or 0.0):
+                    self.feeds[health.url] = health
+            self._mtime = mtime
+        return True
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Persist the registry atomically.
+
+        Raises
+        ------
+        RuntimeError
+            If ``path`` is the shared :attr:`path` and another process owns it.
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path to save the feed health to")
+        if path == self.path and not self.owner:
+            raise RuntimeError(f"{path} is owned by another process")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {'feeds': [health.to_dict() for health in self.feeds.values()]}
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'{os.path.basename(path)}.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                    json.dump(data, handle)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            if path == self.path:
+                self._mtime = os.stat(path).st_mtime_ns
+
+    def checkpoint(self) -> bool:
+        """Save the registry if this process owns :attr:`path`, otherwise merge the owner's.
+
+        Returns True if the registry was saved.
+        """
+        if not self.path:
+            return False
+        if self.owner:
+            self.save()
+            return True
+        self.refresh()
+        return False
+
+    def close(self) -> None:
+        """Give up ownership of :attr:`path` (the registry stays usable in memory)."""
+        if self._writer is not None:
+            self._writer.release()
+
+    def _get(self, url: str) -> FeedHealth:
+        health = self.feeds.get(url)
+        if health is None:
+            health = self.feeds[url] = FeedHealth(url)
+        return health
+
+    def _backoff(self, health: FeedHealth) -> float:
+        exponent = max(0, health.consecutive_failures - self.failure_threshold)
+        return min(self.max_backoff, self.base_backoff * 2.0 ** min(exponent, 32))
+
+    def state(self, url: str) -> str:
+        """``'closed'`` (fetched normally), ``'open'`` (skipped) or ``'half-open'`` (due for a probe)."""
+        with self._lock:
+            return self._state(self.feeds.get(url))
+
+    def _state(self, health: Optional[FeedHealth]) -> str:
+        if health is None or health.consecutive_failures < self.failure_threshold:
+            return 'closed'
+        if health.open_until is not None and self.clock() < health.open_until:
+            return 'open'
+        return 'half-open'
+
+    def allow(self, url: str) -> bool:
+        """Return True if ``url`` should be fetched now.
+
+        A half‑open feed is allowed one probe: its circuit is reopened for
+        the current backoff until the probe's outcome is recorded, so
+        concurrent callers do not probe it at the same time.
+        """
+        with self._lock:
+            health = self.feeds.get(url)
+            state = self._state(health)
+            if state == 'half-open':
+                health.open_until = self.clock() + self._backoff(health)
+            return state != 'open'
+
+    def timeout(self, url: str) -> float:
+        """Timeout in seconds for the next fetch of ``url``."""
+        with self._lock:
+            health = self.feeds.get(url)
+            if health is None or len(health.latencies) < MIN_SAMPLES:
+                return self.default_timeout
+            adaptive = self.multiplier * health.percentile(95) * 2.0 ** min(health.consecutive_failures, 10)
+            return min(self.default_timeout, max(self.min_timeout, adaptive))
+
+    def record_success(self, url: str, latency: float) -> None:
+        """Record a successful fetch taking ``latency`` seconds; closes the circuit."""
+        with self._lock:
+            health = self._get(url)
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.open_until = None
+            health.last_success = self.clock()
+            health.latencies.append(latency)
+
+    def record_failure(self, url: str, error: str) -> None:
+        """Record a failed fetch; opens the circuit after ``failure_threshold`` in a row."""
+        with self._lock:
+            health = self._get(url)
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.last_failure = self.clock()
+            health.last_error = error
+            if health.consecutive_failures >= self.failure_threshold:
+                health.open_until = health.last_failure + self._backoff(health)
+
+    def snapshot(self, urls: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Health of ``urls`` (default: every known feed) for reporting.
+
+        Times are ISO 8601 (UTC) and latencies milliseconds; feeds without
+        history are reported as closed with no fetches.
+        """
+        def iso(timestamp: Optional[float]) -> Optional[str]:
+            return None if timestamp is None else datetime.utcfromtimestamp(timestamp).isoformat()
+
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None else round(seconds * 1000, 1)
+
+        report = []
+        for url in (list(self.feeds) if urls is None else urls):
+            timeout = self.timeout(url)
+            with self._lock:
+                health = self.feeds.get(url) or FeedHealth(url)
+                state = self._state(self.feeds.get(url))
+                report.append({
+                    'url': url,
+                    'state': state,
+                    'successes': health.successes,
+                    'failures': health.failures,
+                    'consecutive_failures': health.consecutive_failures,
+                    'last_success': iso(health.last_success),
+                    'last_failure': iso(health.last_failure),
+                    'last_error': health.last_error,
+                    'latency_p50_ms': ms(health.percentile(50)),
+                    'latency_p95_ms': ms(health.percentile(95)),
+                    'timeout_s': round(timeout, 2),
+                    'retry_at': iso(health.open_until) if state == 'open' else None,
+                })
+        return report
+
+
+_default: Optional[FeedHealthRegistry] = None
+_default_lock = threading.Lock()
+
+
+def default_registry() -> FeedHealthRegistry:
+    """The process‑wide registry, loaded from ``NEWS_FEED_HEALTH_PATH`` (or ``data/news_feed_health.json``)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = FeedHealthRegistry.load(os.environ.get('NEWS_FEED_HEALTH_PATH', DEFAULT_FEED_HEALTH_PATH))
+        return _default
@@ -7,19 +7,25 @@ network access is unavailable.  Each article is converted into a normalised
 
 from __future__ import annotations
 
-from typing import List, Dict, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterable, Optional
 from datetime import datetime
 import logging
+import time
 import xml.etree.ElementTree as ET
 
 import requests
 
 from .datatypes import Article
+from .feedhealth import FeedHealthRegistry, default_registry
 from .sample_data import load_sample_articles
 
 
 logger = logging.getLogger(__name__)
 
+# Feeds fetched at the same time by fetch_articles_from_feeds
+DEFAULT_FETCH_WORKERS = 8
+
 # Mapping from category to a list of RSS feed URLs.  These feeds are not used
 # in this offline environment, but they illustrate how to configure the
 # ingestion layer when network access is available.  Replace or extend these
@@ -52,13 +58,15 @@ def _parse_rss(content: bytes, category: str) -> List[Article]:
         Raw XML content of the RSS feed.
     category: str
         Category name to assign to each article.
+
+    Raises
+    ------
+    xml.etree.ElementTree.ParseError
+        If ``content`` is not well‑formed XML; callers record this as a
+        failed fetch of the feed.
     """
     articles: List[Article] = []
-    try:
-        root = ET.fromstring(content)
-    except ET.ParseError as exc:
-        logger.warning("Failed to parse RSS feed: %s", exc)
-        return articles
+    root = ET.fromstring(content)
 
     # RSS items may be nested under channel/item or rss/channel/item
     for item in root.iter('item'):
@@ -87,25 +95,59 @@ def _parse_rss(content: bytes, category: str) -> List[Article]:
     return articles
 
 
-def fetch_articles_from_feeds() -> List[Article]:
+def _fetch_feed(url: str, category: str, health: FeedHealthRegistry) -> List[Article]:
+    """Fetch and parse one feed, recording the outcome in ``health``.
+
+    A response that is not a parsable feed counts as a failure, like a
+    network error.
+    """
+    start = time.perf_counter()
+    try:
+        resp = requests.get(url, timeout=health.timeout(url))
+        resp.raise_for_status()
+        latency = time.perf_counter() - start
+        articles = _parse_rss(resp.content, category)
+    except Exception as exc:
+        logger.info("Skipping RSS feed %s: %s", url, exc)
+        health.record_failure(url, str(exc) or type(exc).__name__)
+        return []
+    health.record_success(url, latency)
+    return articles
+
+
+def fetch_articles_from_feeds(
+    health: Optional[FeedHealthRegistry] = None, max_workers: int = DEFAULT_FETCH_WORKERS
+) -> List[Article]:
     """Fetch articles from the configured RSS feeds.
 
     When network access is disabled, this function will return an empty list.
     If network access is available, it attempts to download each configured feed
     and parse it into a list of :class:`Article` objects.
+
+    Feeds are fetched concurrently by up to ``max_workers`` threads, so a
+    run takes as long as the slowest feed rather than the sum of all of
+    them.  Each fetch is recorded in ``health`` (default: the process‑wide
+    :func:`~packages.news.feedhealth.default_registry`), which also supplies
+    the feed's timeout and skips feeds whose circuit is open.
     """
-    all_articles: List[Article] = []
+    health = health if health is not None else default_registry()
+    targets = []
     for category, feeds in RSS_SOURCES.items():
         for url in feeds:
-            try:
-                resp = requests.get(url, timeout=10)
-                resp.raise_for_status()
-            except Exception as exc:
-                logger.info("Skipping RSS feed %s: %s", url, exc)
-                continue
-            articles = _parse_rss(resp.content, category)
-            all_articles.extend(articles)
-    return all_articles
+            if health.allow(url):
+                targets.append((url, category))
+            else:
+                logger.info("Skipping RSS feed %s: circuit open after repeated failures", url)
+    if not targets:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as pool:
+        batches = list(pool.map(lambda target: _fetch_feed(*target, health), targets))
+    try:
+        # Saved by the owning process only; others pick up its saves
+        health.checkpoint()
+    except OSError as exc:
+        logger.warning("Failed to save feed health: %s", exc)
+    return [article for batch in batches for article in batch]
 
 
 def load_articles(use_sample: bool = True) -> List[Article]:
@@ -0,0 +1,100 @@
+"""JSON Lines serialisation of articles and topics.
+
+Articles are written one JSON object per line with the same field names as
+:class:`~packages.news.datatypes.Article`; ``published`` is an ISO 8601
+string.  Reading is streaming, so files larger than memory can be processed
+article by article.  Pipeline topics are written one per line with their
+``category`` added.  The path ``'-'`` stands for stdin/stdout.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, IO, Iterable, Iterator, Union
+import json
+import logging
+import sys
+
+from .datatypes import Article
+
+
+logger = logging.getLogger(__name__)
+
+PathOrFile = Union[str, IO[str]]
+
+
+def article_to_dict(article: Article) -> Dict[str, Any]:
+    """Return a JSON‑serialisable dictionary for ``article``."""
+    return {
+        'title': article.title,
+        'link': article.link,
+        'description': article.description,
+        'published': article.published.isoformat(),
+        'publisher': article.publisher,
+        'category': article.category,
+    }
+
+
+def article_from_dict(data: Dict[str, Any]) -> Article:
+    """Build an :class:`Article` from a dictionary produced by :func:`article_to_dict`."""
+    published = data.get('published')
+    return Article(
+        title=data.get('title') or '',
+        link=data.get('link') or '',
+        description=data.get('description') or '',
+        published=datetime.fromisoformat(published) if published else datetime.utcnow(),
+        publisher=data.get('publisher') or '',
+        category=data.get('category') or None,
+    )
+
+
+@contextmanager
+def _open(target: PathOrFile, mode: str) -> Iterator[IO[str]]:
+    if not isinstance(target, str):
+        yield target
+    elif target == '-':
+        yield sys.stdout if 'w' in mode or 'a' in mode else sys.stdin
+    else:
+        with open(target, mode, encoding='utf-8') as handle:
+            yield handle
+
+
+def write_articles_jsonl(articles: Iterable[Article], target: PathOrFile) -> int:
+    """Write ``articles`` as JSON Lines and return how many were written."""
+    count = 0
+    with _open(target, 'w') as handle:
+        for article in articles:
+            handle.write(json.dumps(article_to_dict(article), ensure_ascii=False))
+            handle.write('\n')
+            count += 1
+    return count
+
+
+def read_articles_jsonl(source: PathOrFile) -> Iterator[Article]:
+    """Yield articles from a JSON Lines file, skipping malformed lines."""
+    with _open(source, 'r') as handle:
+        for number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield article_from_dict(json.loads(line))
+            except Exception as exc:
+                logger.warning("Skipping malformed article on line %d: %s", number, exc)
+
+
+def write_topics_jsonl(results: Dict[str, Iterable[Dict[str, Any]]], target: PathOrFile) -> int:
+    """Write per‑category topics (as returned by ``run_pipeline``) as JSON Lines.
+
+    Each line is one topic with its ``category`` added; returns the number of
+    lines written.
+    """
+    count = 0
+    with _open(target, 'w') as handle:
+        for category, topics in results.items():
+            for topic in topics:
+                handle.write(json.dumps({'category': category, **topic}, ensure_ascii=False))
+                handle.write('\n')
+                count += 1
+    return count
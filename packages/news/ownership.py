@@ -0,0 +1,82 @@
+"""Single‑writer ownership of data files shared between processes.
+
+The API and the news worker both load the persisted news state (IDF
+statistics, the vector store).  Each keeps its own in‑memory copy, so if both
+wrote the files, every save would overwrite the other process's updates.
+:class:`WriterLock` makes one of them the owner: an exclusive, non‑blocking
+``flock`` on ``<file>.lock`` that is held for the owner's lifetime.  Other
+processes use the files read‑only and reload them when the owner saves.
+
+The operating system releases the lock when the owning process exits, so a
+crashed owner never leaves a stale lock behind.  Where ``fcntl`` is not
+available (Windows) every caller is treated as the owner.
+"""
+
+from __future__ import annotations
+
+from typing import IO, Optional
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class WriterLock:
+    """Advisory, process‑exclusive lock marking the single writer of a file.
+
+    Parameters
+    ----------
+    path: str
+        The lock file, conventionally ``<data file>.lock``.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._handle: Optional[IO[str]] = None
+        self._held = False
+        self._guard = threading.Lock()
+
+    @property
+    def held(self) -> bool:
+        """True if this instance is the writer."""
+        return self._held
+
+    def acquire(self) -> bool:
+        """Try to become the writer without blocking.
+
+        Returns True if this instance holds the lock (now or already), False
+        if another holder has it.
+        """
+        with self._guard:
+            if self._held:
+                return True
+            if fcntl is None:
+                self._held = True
+                return True
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            handle = open(self.path, 'a+', encoding='utf-8')
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return False
+            # Record the owner for whoever wonders why their process is read‑only
+            handle.seek(0)
+            handle.truncate()
+            handle.write(f'{os.getpid()}\n')
+            handle.flush()
+            self._handle = handle
+            self._held = True
+            return True
+
+    def release(self) -> None:
+        """Give up ownership; a no‑op if the lock is not held."""
+        with self._guard:
+            if self._handle is not None:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+                self._handle.close()
+                self._handle = None
+            self._held = False
@@ -5,22 +5,48 @@ summarisation of news articles.  It exposes a single function
 :func:`run_pipeline` which returns a dictionary containing the top topics per
 category.  Each topic includes the best headline, a summary, a list of
 sources, importance score and publication time.
+
+The per‑category stages (:func:`cluster_category`, :func:`score_category`
+and :func:`summarize_category`) are public, so tools that time or profile
+the stages individually (``scripts/run_pipeline.py``) run the same code.
+:func:`persist_results` is the write step on its own, for callers that keep
+database writes on a thread of their own.
 """
 
 from __future__ import annotations
 
-from typing import Dict, List, Iterable
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 from .ingest import load_articles
 from .classify import classify_articles
-from .cluster import cluster_articles
+from .cluster import cluster_articles_with_vectors
 from .score import score_clusters
-from .summarize import summarize_cluster
+from .summarize import summarize_clusters
+from .batch import ArticleBatch
 from .datatypes import Article
+from .features import HashedTfidfVectorizer
+from .vectorstore import VectorStore, article_key
+from .window import ArticleWindow
+from .snapshot import publish_from_db, publish_snapshot
+
+
+# Topics kept per category
+TOP_TOPICS = 4
 
 
-def run_pipeline(use_sample: bool = True, *, store_to_db: bool = False, db_path: str = None) -> Dict[str, List[Dict]]:
+def run_pipeline(
+    use_sample: bool = True,
+    *,
+    store_to_db: bool = False,
+    db_path: str = None,
+    articles: Optional[Iterable[Article]] = None,
+    vectorizer: Optional[HashedTfidfVectorizer] = None,
+    vector_store: Optional[VectorStore] = None,
+    scope: str = 'category',
+    window: Optional[ArticleWindow] = None,
+    snapshot_dir: Optional[str] = None,
+) -> Dict[str, List[Dict]]:
     """Run the news pipeline and return top topics per category.
 
     Parameters
@@ -29,12 +55,38 @@ def run_pipeline(use_sample: bool = True, *, store_to_db: bool = False, db_path:
         If True, loads articles from the built‑in sample data.  If False,
         attempts to fetch from RSS feeds.  When network access is unavailable,
         this argument is ignored and sample data is used.
+    articles: iterable of Article or ArticleBatch, optional
+        Process these articles instead of ingesting, e.g. the new items found
+        by :class:`~packages.news.scheduler.FeedScheduler`.
+    vectorizer: HashedTfidfVectorizer, optional
+        Vectoriser with persistent IDF statistics used for clustering.  Its
+        statistics are updated with the articles and, when it has a ``path``,
+        checkpointed: saved by the file's owner, reloaded by other processes.
+    vector_store: VectorStore, optional
+        Used together with ``vectorizer``: vectors of articles seen before are
+        read from the store, and only new articles are vectorised (and
+        appended to it).
+    scope: {'category', 'global'}, default 'category'
+        ``'category'`` clusters each category separately.  ``'global'``
+        clusters the whole corpus once in a shared vector space and projects
+        the topics onto every category their articles belong to.  A story
+        covered in several categories then becomes one topic with one
+        summary, listed under each of them with a ``categories`` field.
+    window: ArticleWindow, optional
+        Long‑lived sliding window.  The ingested articles are added to it,
+        expired ones are evicted, and the pipeline processes the whole live
+        window; topic assignments are recorded back into it.
+    snapshot_dir: str, optional
+        Publish an immutable digest snapshot here after the run (see
+        :mod:`packages.news.snapshot`).  With ``store_to_db`` it is built
+        from the database, so it matches what the API would query; otherwise
+        from the results of this run.
 
     Returns
     -------
     dict
         A dictionary keyed by category name.  Each value is a list of up to
-        four topic dictionaries, sorted by importance descending.  Each topic
+        ``TOP_TOPICS`` (four) topic dictionaries, sorted by importance descending.  Each topic
         contains the following fields:
 
         ``headline``: The best headline for the topic (taken from the most recent article).
@@ -44,57 +96,215 @@ def run_pipeline(use_sample: bool = True, *, store_to_db: bool = False, db_path:
         ``sources``: List of unique publishers covering the topic.
         ``links``: List of URLs to the articles in the cluster.
     """
-    # Ingest articles
-    articles: List[Article] = load_articles(use_sample=use_sample)
+    # Ingest articles and store them column‑wise
+    if articles is None:
+        articles = load_articles(use_sample=use_sample)
+    if window is not None:
+        # Categorise the new articles themselves, then process the live window
+        articles = list(articles)
+        classify_articles(articles)
+        window.add(articles)
+        window.evict()
+        articles = window.batch()
+    if not isinstance(articles, ArticleBatch):
+        articles = ArticleBatch.from_articles(articles)
     # Assign categories if missing
     classify_articles(articles)
-    # Group by category
-    articles_by_category: Dict[str, List[Article]] = {}
-    for article in articles:
-        articles_by_category.setdefault(article.category, []).append(article)
-
-    results: Dict[str, List[Dict]] = {}
+    if scope == 'global':
+        results = _global_topics(articles, vectorizer, vector_store, window)
+    elif scope == 'category':
+        results = _category_topics(articles, vectorizer, vector_store, window)
+    else:
+        raise ValueError(f"Unknown clustering scope: {scope!r}")
 
-    for category, articles_in_cat in articles_by_category.items():
-        # Cluster articles within this category
-        clusters = cluster_articles(articles_in_cat)
-        # Score clusters
-        scored = score_clusters(clusters)
-        # Build topic summaries
-        topics: List[Dict] = []
-        for cluster, score in scored:
-            if not cluster:
-                continue
-            # Determine best article (most recent) for the headline
-            best_article = max(cluster, key=lambda a: a.published)
-            summary = summarize_cluster(cluster)
-            topics.append({
-                'headline': best_article.title,
-                'summary': summary,
-                'importance': round(score, 3),
-                'published': best_article.published.isoformat(),
-                'sources': list({a.publisher for a in cluster}),
-                'links': [a.link for a in cluster],
-            })
-        # Keep top 4 topics
-        results[category] = topics[:4]
+    if vectorizer is not None and vectorizer.path:
+        try:
+            vectorizer.checkpoint()
+        except (OSError, ValueError) as exc:
+            import logging
+            logging.getLogger(__name__).warning("Failed to persist IDF statistics: %s", exc)
 
     # If configured, persist the results to a SQLite database
     if store_to_db:
+        persist_results(results, db_path, snapshot_dir)
+    elif snapshot_dir is not None:
         try:
-            from . import repo as news_repo  # local import to avoid circular
-            # Derive a default DB path if not supplied
-            if db_path is None:
-                # Create a data directory relative to this file
-                import os
-                base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                data_dir = os.path.join(base_dir, 'data')
-                os.makedirs(data_dir, exist_ok=True)
-                db_path = os.path.join(data_dir, 'news.db')
-            news_repo.save_pipeline_output(results, db_path)
-        except Exception as exc:
-            # Log the error but do not interrupt the pipeline
+            publish_snapshot(results, snapshot_dir)
+        except OSError as exc:
             import logging
-            logging.getLogger(__name__).warning("Failed to persist pipeline output: %s", exc)
+            logging.getLogger(__name__).warning("Failed to publish digest snapshot: %s", exc)
+
+    return results
+
+
+def persist_results(results: Dict[str, List[Dict]], db_path: str = None, snapshot_dir: Optional[str] = None) -> None:
+    """Store pipeline results in the news database and publish a snapshot of it.
+
+    This is the write step of ``run_pipeline(store_to_db=True)``, for callers
+    that run it on a thread of their own, e.g. the API's database writer
+    (:class:`~packages.news.async_repo.AsyncNewsRepository`).  Failures are
+    logged rather than raised; no snapshot is published if the save failed,
+    since it would not match the database.
+    """
+    try:
+        from . import repo as news_repo  # local import to avoid circular
+        # Derive a default DB path if not supplied
+        if db_path is None:
+            # Create a data directory relative to this file
+            import os
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_dir = os.path.join(base_dir, 'data')
+            os.makedirs(data_dir, exist_ok=True)
+            db_path = os.path.join(data_dir, 'news.db')
+        news_repo.save_pipeline_output(results, db_path)
+    except Exception as exc:
+        # Log the error but do not interrupt the pipeline
+        import logging
+        logging.getLogger(__name__).warning("Failed to persist pipeline output: %s", exc)
+        return
+
+    if snapshot_dir is not None:
+        try:
+            publish_from_db(db_path, snapshot_dir)
+        except OSError as exc:
+            import logging
+            logging.getLogger(__name__).warning("Failed to publish digest snapshot: %s", exc)
+
+
+def _vectors(batch: ArticleBatch, vectorizer: Optional[HashedTfidfVectorizer], vector_store: Optional[VectorStore]):
+    if vector_store is not None and vectorizer is not None:
+        texts = batch.texts()
+        ids = [article_key(link, text) for link, text in zip(batch.link, texts)]
+        return vector_store.vectors_for(ids, texts, vectorizer)
+    return None
+
 
+def score_category(
+    clusters: List[ArticleBatch],
+    category: str,
+    window: Optional[ArticleWindow] = None,
+    topic_ids: Optional[List[Optional[str]]] = None,
+) -> List[Tuple[ArticleBatch, float]]:
+    """Score clusters best first, from the window's topic aggregates when there is one.
+
+    ``topic_ids`` are the clusters' topics if they were already assigned to
+    the window; otherwise they are assigned here.  Clusters whose topic was
+    evicted in the meantime are dropped.  Only these clusters' topics are
+    scored, so topics left over from earlier passes do not skew the
+    normalisation.
+    """
+    if window is None:
+        return score_clusters(clusters)
+    if topic_ids is None:
+        topic_ids = window.assign_clusters(clusters)
+    cluster_of = {topic: cluster for topic, cluster in zip(topic_ids, clusters) if topic is not None}
+    return [(cluster_of[topic], score) for topic, score in window.score_topics(category, topics=cluster_of) if topic in cluster_of]
+
+
+def _topic(cluster: ArticleBatch, summary: str) -> Dict:
+    """Build the score‑independent part of a topic dictionary."""
+    # Determine best article (most recent) for the headline
+    best_article = cluster[cluster.latest_index()]
+    return {
+        'headline': best_article.title,
+        'summary': summary,
+        'published': best_article.published.isoformat(),
+        'sources': cluster.sources(),
+        'links': list(cluster.link),
+    }
+
+
+def cluster_category(
+    articles: ArticleBatch,
+    vectorizer: Optional[HashedTfidfVectorizer] = None,
+    vector_store: Optional[VectorStore] = None,
+):
+    """Cluster the articles of one category.
+
+    Returns the clusters and their feature vectors, as
+    :func:`~packages.news.cluster.cluster_articles_with_vectors` does.
+    """
+    vectors = _vectors(articles, vectorizer, vector_store)
+    return cluster_articles_with_vectors(articles, vectorizer=vectorizer, vectors=vectors)
+
+
+def summarize_category(
+    clusters: List[ArticleBatch],
+    cluster_vectors,
+    scored: List[Tuple[ArticleBatch, float]],
+    limit: int = TOP_TOPICS,
+) -> List[Dict]:
+    """Summarise the top ``limit`` scored clusters into topic dictionaries."""
+    top = scored[:limit]
+    position = {id(cluster): i for i, cluster in enumerate(clusters)}
+    summaries = summarize_clusters(
+        [cluster for cluster, _ in top],
+        [cluster_vectors[position[id(cluster)]] for cluster, _ in top],
+        cluster_vectors.transform,
+    )
+    topics: List[Dict] = []
+    for (cluster, score), summary in zip(top, summaries):
+        topic = _topic(cluster, summary)
+        topic['importance'] = round(score, 3)
+        topics.append(topic)
+    return topics
+
+
+def _category_topics(
+    articles: ArticleBatch,
+    vectorizer: Optional[HashedTfidfVectorizer],
+    vector_store: Optional[VectorStore],
+    window: Optional[ArticleWindow] = None,
+) -> Dict[str, List[Dict]]:
+    """Cluster, score and summarise each category separately."""
+    results: Dict[str, List[Dict]] = {}
+    for category, articles_in_cat in articles.by_category().items():
+        clusters, cluster_vectors = cluster_category(articles_in_cat, vectorizer, vector_store)
+        scored = score_category(clusters, category, window)
+        results[category] = summarize_category(clusters, cluster_vectors, scored)
     return results
+
+
+def _global_topics(
+    articles: ArticleBatch,
+    vectorizer: Optional[HashedTfidfVectorizer],
+    vector_store: Optional[VectorStore],
+    window: Optional[ArticleWindow] = None,
+) -> Dict[str, List[Dict]]:
+    """Cluster the whole corpus once and project the topics onto categories.
+
+    Clusters are scored within each category they touch, so importance stays
+    comparable with per‑category runs, but each cluster is summarised once.
+    """
+    clusters, cluster_vectors = cluster_articles_with_vectors(
+        articles, vectorizer=vectorizer, vectors=_vectors(articles, vectorizer, vector_store)
+    )
+    topic_ids = window.assign_clusters(clusters) if window is not None else None
+    by_category: Dict[str, List[int]] = {}
+    cluster_categories: List[List[str]] = []
+    for index, cluster in enumerate(clusters):
+        names = [articles.categories[code] for code in dict.fromkeys(cluster.category_code.tolist())]
+        cluster_categories.append(names)
+        for name in names:
+            by_category.setdefault(name, []).append(index)
+
+    # Score per category first, so every selected cluster is summarised in one batch
+    top: Dict[str, List] = {}
+    for category, indices in by_category.items():
+        position = {id(clusters[i]): i for i in indices}
+        ids = None if topic_ids is None else [topic_ids[i] for i in indices]
+        scored = score_category([clusters[i] for i in indices], category, window, ids)
+        top[category] = [(position[id(cluster)], score) for cluster, score in scored[:TOP_TOPICS]]
+    selected = list(dict.fromkeys(index for scored in top.values() for index, _ in scored))
+    summaries = summarize_clusters(
+        [clusters[i] for i in selected], [cluster_vectors[i] for i in selected], cluster_vectors.transform
+    )
+    shared: Dict[int, Dict] = {}
+    for index, summary in zip(selected, summaries):
+        shared[index] = _topic(clusters[index], summary)
+        shared[index]['categories'] = cluster_categories[index]
+
+    return {
+        category: [{**shared[index], 'importance': round(score, 3)} for index, score in scored]
+        for category, scored in top.items()
+    }
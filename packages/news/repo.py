@@ -6,15 +6,90 @@ row in a `clusters` table.  Articles themselves are not stored; the topic
 record contains the headline, summary, importance, publication time, list of
 sources and list of links as plain text.
 
-The database schema is created automatically if it does not exist.
+The database schema is created automatically if it does not exist.  Topics
+are also indexed in an SQLite FTS5 table (``clusters_fts``) that triggers keep
+in sync with ``clusters``; :func:`search_topics` queries it with BM25 ranking.
+If the SQLite build lacks FTS5, search falls back to a ``LIKE`` scan.
 """
 
 from __future__ import annotations
 
 import sqlite3
-from typing import Dict, List
+from itertools import islice
+from typing import Dict, List, Optional, Sequence
+import logging
 import os
 import json
+import re
+
+
+logger = logging.getLogger(__name__)
+
+# Column weights for BM25 ranking: headline, summary, sources
+SEARCH_WEIGHTS = (10.0, 4.0, 1.0)
+
+# Topics per INSERT statement in save_pipeline_output
+_SAVE_CHUNK = 1000
+_INSERT_JSON = """
+    INSERT INTO clusters (category, headline, summary, importance, published, sources, links)
+    SELECT json_extract(value, '$.category'), json_extract(value, '$.headline'),
+           json_extract(value, '$.summary'), json_extract(value, '$.importance'),
+           json_extract(value, '$.published'), json_extract(value, '$.sources'),
+           json_extract(value, '$.links')
+    FROM json_each(?);
+"""
+
+# External‑content FTS5 index over clusters; the triggers mirror every
+# insert, update and delete into it.  A future articles table can be indexed
+# the same way.
+_FTS_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE clusters_fts USING fts5(
+        headline, summary, sources,
+        content='clusters', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    );
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clusters_fts_insert AFTER INSERT ON clusters BEGIN
+        INSERT INTO clusters_fts (rowid, headline, summary, sources)
+        VALUES (new.id, new.headline, new.summary, new.sources);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clusters_fts_delete AFTER DELETE ON clusters BEGIN
+        INSERT INTO clusters_fts (clusters_fts, rowid, headline, summary, sources)
+        VALUES ('delete', old.id, old.headline, old.summary, old.sources);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clusters_fts_update AFTER UPDATE ON clusters BEGIN
+        INSERT INTO clusters_fts (clusters_fts, rowid, headline, summary, sources)
+        VALUES ('delete', old.id, old.headline, old.summary, old.sources);
+        INSERT INTO clusters_fts (rowid, headline, summary, sources)
+        VALUES (new.id, new.headline, new.summary, new.sources);
+    END;
+    """,
+)
+
+
+def _has_table(cur: sqlite3.Cursor, name: str) -> bool:
+    cur.execute("SELECT 1 FROM sqlite_master WHERE name = ?;", (name,))
+    return cur.fetchone() is not None
+
+
+def _init_fts(cur: sqlite3.Cursor) -> None:
+    """Create the full‑text index and triggers, indexing existing topics once."""
+    if _has_table(cur, 'clusters_fts'):
+        return
+    try:
+        for statement in _FTS_SCHEMA:
+            cur.execute(statement)
+    except sqlite3.OperationalError as exc:
+        # SQLite compiled without FTS5
+        logger.warning("Full-text search unavailable, falling back to LIKE: %s", exc)
+        return
+    cur.execute("INSERT INTO clusters_fts (clusters_fts) VALUES ('rebuild');")
 
 
 def init_db(db_path: str) -> None:
@@ -43,9 +118,32 @@ def init_db(db_path: str) -> None:
             ON clusters (category, importance DESC);
             """
         )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS subscriptions (
+                user_id TEXT PRIMARY KEY,
+                categories TEXT NOT NULL,
+                min_importance REAL NOT NULL DEFAULT 0,
+                max_topics INTEGER NOT NULL
+            );
+            """
+        )
+        _init_fts(cur)
         conn.commit()
 
 
+def enable_wal(db_path: str) -> str:
+    """Switch the database to write‑ahead logging and return the journal mode.
+
+    In WAL mode readers are not blocked by a writer (and vice versa), so a
+    long :func:`save_pipeline_output` does not stall queries.  The setting is
+    stored in the database file.
+    """
+    init_db(db_path)
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("PRAGMA journal_mode=WAL;").fetchone()[0]
+
+
 def save_pipeline_output(results: Dict[str, List[Dict]], db_path: str) -> None:
     """Persist the results of a pipeline run into the database.
 
@@ -58,25 +156,30 @@ def save_pipeline_output(results: Dict[str, List[Dict]], db_path: str) -> None:
         Path to the SQLite database file.
     """
     init_db(db_path)
+    rows = (
+        {
+            'category': category,
+            'headline': topic['headline'],
+            'summary': topic['summary'],
+            'importance': float(topic['importance']),
+            'published': topic['published'],
+            'sources': topic['sources'],
+            'links': topic['links'],
+        }
+        for category, topics in results.items()
+        for topic in topics
+    )
     with sqlite3.connect(db_path) as conn:
-        cur = conn.cursor()
-        for category, topics in results.items():
-            for topic in topics:
-                cur.execute(
-                    """
-                    INSERT INTO clusters (category, headline, summary, importance, published, sources, links)
-                    VALUES (?, ?, ?, ?, ?, ?, ?);
-                    """,
-                    (
-                        category,
-                        topic['headline'],
-                        topic['summary'],
-                        float(topic['importance']),
-                        topic['published'],
-                        json.dumps(topic['sources']),
-                        json.dumps(topic['links']),
-                    ),
-                )
+        # Each chunk is inserted by one statement that unpacks a JSON array
+        # inside SQLite, which releases the GIL for the whole chunk instead of
+        # re‑acquiring it for every row.  Chunks are built lazily so a large
+        # save does not allocate every row at once (and trigger a full GC
+        # pause in the threads serving requests).
+        while True:
+            chunk = list(islice(rows, _SAVE_CHUNK))
+            if not chunk:
+                break
+            conn.execute(_INSERT_JSON, (json.dumps(chunk),))
         conn.commit()
 
 
@@ -114,25 +217,26 @@ def fetch_top_topics(category: str, db_path: str, limit: int = 4) -> List[Dict]:
             (category, limit),
         )
         rows = cur.fetchall()
-    topics: List[Dict] = []
-    for headline, summary, importance, published, sources_json, links_json in rows:
-        try:
-            sources = json.loads(sources_json)
-        except Exception:
-            sources = []
-        try:
-            links = json.loads(links_json)
-        except Exception:
-            links = []
-        topics.append({
-            'headline': headline,
-            'summary': summary,
-            'importance': importance,
-            'published': published,
-            'sources': sources,
-            'links': links,
-        })
-    return topics
+    return [_row_to_topic(*row) for row in rows]
+
+
+def _row_to_topic(headline: str, summary: str, importance: float, published: str, sources_json: str, links_json: str) -> Dict:
+    try:
+        sources = json.loads(sources_json)
+    except Exception:
+        sources = []
+    try:
+        links = json.loads(links_json)
+    except Exception:
+        links = []
+    return {
+        'headline': headline,
+        'summary': summary,
+        'importance': importance,
+        'published': published,
+        'sources': sources,
+        'links': links,
+    }
 
 
 def fetch_daily_digest(db_path: str, categories: List[str], limit: int = 4) -> Dict[str, List[Dict]]:
@@ -145,3 +249,156 @@ def fetch_daily_digest(db_path: str, categories: List[str], limit: int = 4) -> D
     for category in categories:
         digest[category] = fetch_top_topics(category, db_path, limit)
     return digest
+
+
+def fetch_categories(db_path: str) -> List[str]:
+    """Return the categories with stored topics, in the order they were first stored."""
+    if not os.path.exists(db_path):
+        return []
+    with sqlite3.connect(db_path) as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT category FROM clusters GROUP BY category ORDER BY MIN(id);")
+        return [row[0] for row in cur.fetchall()]
+
+
+def save_subscription(db_path: str, user_id: str, categories: List[str], min_importance: float, limit: int) -> None:
+    """Create or replace a user's subscription profile."""
+    init_db(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO subscriptions (user_id, categories, min_importance, max_topics)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET
+                categories = excluded.categories,
+                min_importance = excluded.min_importance,
+                max_topics = excluded.max_topics;
+            """,
+            (user_id, json.dumps(categories), float(min_importance), int(limit)),
+        )
+        conn.commit()
+
+
+def fetch_subscription(db_path: str, user_id: str) -> Optional[Dict]:
+    """Return a user's subscription profile, or None if there is none."""
+    if not os.path.exists(db_path):
+        return None
+    with sqlite3.connect(db_path) as conn:
+        cur = conn.cursor()
+        if not _has_table(cur, 'subscriptions'):
+            return None
+        cur.execute(
+            "SELECT categories, min_importance, max_topics FROM subscriptions WHERE user_id = ?;",
+            (user_id,),
+        )
+        row = cur.fetchone()
+    if row is None:
+        return None
+    return {'categories': json.loads(row[0]), 'min_importance': row[1], 'limit': row[2]}
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching all terms.
+
+    Each word is quoted so that user input cannot inject FTS5 syntax; a
+    trailing ``*`` on a word is kept as a prefix search.
+    """
+    terms = re.findall(r'\w+\*?', query)
+    return ' '.join(f'"{term.rstrip("*")}"' + ('*' if term.endswith('*') else '') for term in terms)
+
+
+def search_topics(
+    db_path: str,
+    query: str,
+    *,
+    categories: Optional[Sequence[str]] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[Dict]:
+    """Search stored topics by full text.
+
+    Parameters
+    ----------
+    db_path: str
+        Path to the SQLite database file.
+    query: str
+        Free text; every word must match (in the headline, summary or
+        sources).  ``word*`` matches words starting with ``word``.
+    categories: sequence of str, optional
+        Only return topics in these categories.
+    limit, offset: int
+        Pagination of the ranked results.
+
+    Returns
+    -------
+    list of dict
+        Topic dictionaries as returned by :func:`fetch_top_topics`, plus
+        ``category``, ``rank`` (BM25, lower is better) and ``snippet`` (the
+        best matching fragment with matches wrapped in ``<mark>`` tags),
+        ordered by relevance.
+    """
+    match = _fts_query(query)
+    if not match or not os.path.exists(db_path):
+        return []
+    filters = ''
+    params: List = [match]
+    if categories:
+        filters = f" AND c.category IN ({', '.join('?' * len(categories))})"
+        params.extend(categories)
+    params.extend([limit, offset])
+    with sqlite3.connect(db_path) as conn:
+        cur = conn.cursor()
+        if not _has_table(cur, 'clusters_fts'):
+            # Database created before the index existed
+            _init_fts(cur)
+            conn.commit()
+            if not _has_table(cur, 'clusters_fts'):
+                return _search_like(cur, query, categories, limit, offset)
+        cur.execute(
+            f"""
+            SELECT c.headline, c.summary, c.importance, c.published, c.sources, c.links, c.category,
+                   bm25(clusters_fts, {', '.join(map(str, SEARCH_WEIGHTS))}) AS rank,
+                   snippet(clusters_fts, -1, '<mark>', '</mark>', '…', 16)
+            FROM clusters_fts
+            JOIN clusters AS c ON c.id = clusters_fts.rowid
+            WHERE clusters_fts MATCH ?{filters}
+            ORDER BY rank
+            LIMIT ? OFFSET ?;
+            """,
+            params,
+        )
+        rows = cur.fetchall()
+    results: List[Dict] = []
+    for *topic, category, rank, snippet in rows:
+        result = _row_to_topic(*topic)
+        result.update(category=category, rank=rank, snippet=snippet)
+        results.append(result)
+    return results
+
+
+def _search_like(cur: sqlite3.Cursor, query: str, categories: Optional[Sequence[str]], limit: int, offset: int) -> List[Dict]:
+    """Unranked substring search used when FTS5 is unavailable."""
+    clauses: List[str] = []
+    params: List = []
+    for term in re.findall(r'\w+', query):
+        clauses.append("(headline LIKE ? OR summary LIKE ?)")
+        params.extend([f'%{term}%'] * 2)
+    if categories:
+        clauses.append(f"category IN ({', '.join('?' * len(categories))})")
+        params.extend(categories)
+    cur.execute(
+        f"""
+        SELECT headline, summary, importance, published, sources, links, category
+        FROM clusters
+        WHERE {' AND '.join(clauses)}
+        ORDER BY importance DESC, datetime(published) DESC
+        LIMIT ? OFFSET ?;
+        """,
+        params + [limit, offset],
+    )
+    results: List[Dict] = []
+    for *topic, category in cur.fetchall():
+        result = _row_to_topic(*topic)
+        result.update(category=category, rank=None, snippet=result['summary'])
+        results.append(result)
+    return results
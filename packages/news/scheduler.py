@@ -0,0 +1,274 @@
+"""Adaptive per‑feed polling.
+
+:func:`~packages.news.ingest.fetch_articles_from_feeds` downloads every feed
+whenever the pipeline runs, whether or not anything was published.
+:class:`FeedScheduler` instead polls each feed in ``RSS_SOURCES`` on its own
+interval:
+
+* feeds that publish new items are polled more often, aiming for about one
+  new item per poll, down to ``min_interval``;
+* quiet feeds and failing feeds back off geometrically up to
+  ``max_interval``;
+* every interval is jittered so that feeds do not synchronise;
+* conditional requests (``ETag`` / ``Last-Modified``) make unchanged feeds
+  cheap, and at most ``max_concurrency`` feeds are fetched at once;
+* fetches are recorded in a :class:`~packages.news.feedhealth.FeedHealthRegistry`,
+  which sets each feed's timeout from its observed latency and skips feeds
+  whose circuit is open.
+
+Items already seen are filtered out, and the ``on_new_articles`` callback runs
+only when a polling round finds new items.  Typically the callback runs the
+pipeline on just those articles (see ``run_pipeline(articles=...)``).
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Union
+import asyncio
+import logging
+import random
+import time
+
+import requests
+
+from .datatypes import Article
+from .feedhealth import FeedHealthRegistry, default_registry
+from .ingest import RSS_SOURCES, _parse_rss
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 60.0
+DEFAULT_MAX_INTERVAL = 3600.0
+DEFAULT_INITIAL_INTERVAL = 300.0
+DEFAULT_BACKOFF = 1.5
+DEFAULT_JITTER = 0.1
+DEFAULT_MAX_CONCURRENCY = 8
+# Number of item links remembered per feed to detect new items
+_SEEN_PER_FEED = 1000
+
+NewArticlesCallback = Callable[[List[Article]], Union[Awaitable[Any], Any]]
+
+
+@dataclass
+class FeedState:
+    """Polling state of a single feed."""
+
+    url: str
+    category: str
+    interval: float
+    next_poll: float = 0.0
+    last_polled: Optional[float] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    failures: int = 0
+    polls: int = 0
+    new_items: int = 0
+    seen: 'OrderedDict[str, None]' = field(default_factory=OrderedDict, repr=False)
+
+    def remember(self, key: str) -> bool:
+        """Record ``key`` and return True if it had not been seen before."""
+        if key in self.seen:
+            return False
+        self.seen[key] = None
+        if len(self.seen) > _SEEN_PER_FEED:
+            self.seen.popitem(last=False)
+        return True
+
+
+class FeedScheduler:
+    """Poll RSS feeds on adaptive per‑feed intervals.
+
+    Parameters
+    ----------
+    on_new_articles: callable
+        Called (and awaited if it returns an awaitable) with the new articles
+        of a polling round.  It is not called when nothing new was found.
+    sources: mapping, optional
+        Category to feed URLs; defaults to ``RSS_SOURCES``.
+    min_interval, max_interval, initial_interval: float
+        Bounds and starting value of each feed's polling interval, in seconds.
+    backoff: float
+        Factor applied to the interval after a quiet or failed poll.
+    jitter: float
+        Relative random jitter applied to every interval.
+    max_concurrency: int
+        Maximum number of feeds fetched at the same time.
+    session: requests.Session, optional
+        Session used for fetching; one is created if omitted.
+    clock: callable
+        Monotonic time source (overridable for simulations).
+    health: FeedHealthRegistry, optional
+        Per‑feed health, timeouts and circuit breakers; defaults to the
+        process‑wide :func:`~packages.news.feedhealth.default_registry`.
+    """
+
+    def __init__(
+        self,
+        on_new_articles: NewArticlesCallback,
+        sources: Optional[Mapping[str, Iterable[str]]] = None,
+        *,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        jitter: float = DEFAULT_JITTER,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        session: Optional[requests.Session] = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+        health: Optional[FeedHealthRegistry] = None,
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("min_interval must be positive and not exceed max_interval")
+        self.on_new_articles = on_new_articles
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.backoff = float(backoff)
+        self.jitter = float(jitter)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.session = session or requests.Session()
+        self.clock = clock
+        self._rng = rng or random.Random()
+        self.health = health if health is not None else default_registry()
+        self._stopped: Optional[asyncio.Event] = None
+        self.feeds: Dict[str, FeedState] = {}
+        interval = self._clamp(initial_interval)
+        for category, urls in (RSS_SOURCES if sources is None else sources).items():
+            for url in urls:
+                # Spread the first polls over the initial interval
+                self.feeds[url] = FeedState(url, category, interval, next_poll=self.clock() + self._rng.uniform(0, interval))
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1.0 + self._rng.uniform(-self.jitter, self.jitter))
+
+    def due(self, now: Optional[float] = None) -> List[FeedState]:
+        """Feeds whose next poll time has passed."""
+        now = self.clock() if now is None else now
+        return [state for state in self.feeds.values() if state.next_poll <= now]
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the next feed is due, or None without feeds."""
+        if not self.feeds:
+            return None
+        return max(0.0, min(state.next_poll for state in self.feeds.values()) - self.clock())
+
+    def _fetch(self, state: FeedState) -> Optional[List[Article]]:
+        """Fetch and parse a feed, returning None when it has not changed.
+
+        A response that cannot be parsed is recorded as a failure.
+        """
+        headers = {}
+        if state.etag:
+            headers['If-None-Match'] = state.etag
+        if state.last_modified:
+            headers['If-Modified-Since'] = state.last_modified
+        start = time.perf_counter()
+        try:
+            resp = self.session.get(state.url, headers=headers, timeout=self.health.timeout(state.url))
+            if resp.status_code != 304:
+                resp.raise_for_status()
+            latency = time.perf_counter() - start
+            articles = None if resp.status_code == 304 else _parse_rss(resp.content, state.category)
+        except Exception as exc:
+            self.health.record_failure(state.url, str(exc) or type(exc).__name__)
+            raise
+        self.health.record_success(state.url, latency)
+        if articles is not None:
+            state.etag = resp.headers.get('ETag')
+            state.last_modified = resp.headers.get('Last-Modified')
+        return articles
+
+    def _reschedule(self, state: FeedState, now: float, new_count: int, failed: bool) -> None:
+        """Adapt the feed's interval to what the poll found and schedule the next one."""
+        if failed:
+            state.failures += 1
+            # One backoff step per failure, like a quiet poll: k failures grow it by backoff ** k
+            state.interval = self._clamp(state.interval * self.backoff)
+        elif new_count:
+            state.failures = 0
+            # Aim for about one new item per poll, smoothing the estimate
+            elapsed = now - state.last_polled if state.last_polled is not None else state.interval
+            state.interval = self._clamp(0.5 * state.interval + 0.5 * elapsed / new_count)
+        else:
+            state.failures = 0
+            state.interval = self._clamp(state.interval * self.backoff)
+        state.last_polled = now
+        state.next_poll = now + self._jittered(state.interval)
+
+    async def _poll(self, state: FeedState, limit: asyncio.Semaphore) -> List[Article]:
+        if not self.health.allow(state.url):
+            # Circuit open: keep the interval and check again at the next poll
+            state.next_poll = self.clock() + self._jittered(state.interval)
+            return []
+        async with limit:
+            state.polls += 1
+            try:
+                articles = await asyncio.to_thread(self._fetch, state)
+            except Exception as exc:
+                logger.info("Polling feed %s failed: %s", state.url, exc)
+                self._reschedule(state, self.clock(), 0, failed=True)
+                return []
+        new = [a for a in articles or () if state.remember(a.link or a.title)]
+        state.new_items += len(new)
+        self._reschedule(state, self.clock(), len(new), failed=False)
+        return new
+
+    async def poll_due(self) -> List[Article]:
+        """Poll every due feed and hand new articles to the callback.
+
+        Returns the new articles (empty when nothing new was found).
+        """
+        due = self.due()
+        if not due:
+            return []
+        limit = asyncio.Semaphore(self.max_concurrency)
+        batches = await asyncio.gather(*(self._poll(state, limit) for state in due))
+        try:
+            # Saved by the owning process only; others pick up its saves
+            await asyncio.to_thread(self.health.checkpoint)
+        except OSError as exc:
+            logger.warning("Failed to save feed health: %s", exc)
+        articles = [article for batch in batches for article in batch]
+        if articles:
+            result = self.on_new_articles(articles)
+            if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+                await result
+        return articles
+
+    async def run(self) -> None:
+        """Poll feeds until :meth:`stop` is called."""
+        self._stopped = asyncio.Event()
+        while not self._stopped.is_set():
+            try:
+                await self.poll_due()
+            except Exception as exc:
+                logger.warning("Processing new articles failed: %s", exc)
+            delay = self.next_due_in()
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.max_interval if delay is None else delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per‑feed polling statistics."""
+        return [
+            {
+                'url': state.url,
+                'category': state.category,
+                'interval': round(state.interval, 1),
+                'polls': state.polls,
+                'new_items': state.new_items,
+                'failures': state.failures,
+            }
+            for state in self.feeds.values()
+        ]
@@ -9,18 +9,23 @@ components (e.g. social engagement) could be added in a real deployment.
 
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import List, Tuple, Union
 from datetime import datetime
 
+from .batch import ArticleBatch, to_epoch_us
 from .datatypes import Article
 
 
-def _compute_source_coverage(cluster: List[Article]) -> int:
+def _compute_source_coverage(cluster: Union[List[Article], ArticleBatch]) -> int:
+    if isinstance(cluster, ArticleBatch):
+        return cluster.source_count()
     return len(set(article.publisher for article in cluster))
 
 
-def _compute_recency(cluster: List[Article], now: datetime) -> float:
+def _compute_recency(cluster: Union[List[Article], ArticleBatch], now: datetime) -> float:
     """Compute the age of the most recent article in hours."""
+    if isinstance(cluster, ArticleBatch):
+        return (to_epoch_us(now) - int(cluster.published.max())) / 3_600_000_000.0
     latest = max(article.published for article in cluster)
     delta = now - latest
     return delta.total_seconds() / 3600.0  # hours
@@ -29,6 +34,8 @@ def _compute_recency(cluster: List[Article], now: datetime) -> float:
 def score_clusters(clusters: List[List[Article]]) -> List[Tuple[List[Article], float]]:
     """Score each cluster based on source coverage and recency.
 
+    Clusters may be lists of articles or :class:`ArticleBatch` instances.
+
     Returns a list of pairs `(cluster, score)` sorted by score descending.
     """
     now = datetime.utcnow()
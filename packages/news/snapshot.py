@@ -0,0 +1,401 @@
+"""Immutable, versioned digest snapshots for read‑only API workers.
+
+Every API worker used to query SQLite for the same digest on every request.
+After each run the pipeline can instead publish a snapshot (see
+``run_pipeline(snapshot_dir=...)``): one immutable file per version under
+``data/news_snapshots/`` containing
+
+* the daily digest, pre‑serialised as JSON;
+* the breaking topics as of publication, pre‑serialised as JSON;
+* a compact binary index of every topic: per‑topic JSON slices in one UTF‑8
+  blob plus columnar arrays (importance, publication time, category code), so
+  breaking news can be re‑filtered for the current time, and digests for
+  other category lists assembled, without parsing any JSON.
+
+Snapshots are written to a uniquely named temporary file and renamed into
+place, then the ``CURRENT`` pointer file is replaced the same way, so readers
+only ever see complete versions.  ``digest.json`` and ``breaking.json`` are
+also replaced atomically for static file serving.  Publishers, threads or
+processes, take an exclusive lock on ``publish.lock`` in the directory, so
+each version number is picked and written by one of them at a time.
+
+:class:`SnapshotReader` memory‑maps the current version.  A ``stat`` of the
+pointer per request detects new versions; the reader then maps the new file
+and swaps one reference, without locks.  Requests still holding the previous
+:class:`Snapshot` keep its mapping alive until they finish.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .batch import to_epoch_us
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'news_snapshots')
+# Topics kept per category: the digest shows the first DIGEST_LIMIT, breaking
+# news considers all of them (as the API does with fetch_top_topics(limit=10))
+SNAPSHOT_DEPTH = 10
+DIGEST_LIMIT = 4
+BREAKING_WINDOW = timedelta(hours=1)
+BREAKING_MIN_IMPORTANCE = 0.7
+DEFAULT_KEEP = 3
+
+# File layout: prefix (magic, header offset, header length), 8‑byte aligned
+# sections, then the JSON header describing them
+_MAGIC = b'NWSSNAP1'
+_PREFIX = struct.Struct('<8sQQ')
+_POINTER = 'CURRENT'
+_PUBLISH_LOCK = 'publish.lock'
+_NAME = re.compile(r'^digest-(\d+)\.snap$')
+# Unparseable publication times never count as recent
+_NO_TIME = np.iinfo(np.int64).min
+
+
+def _dumps(value) -> bytes:
+    # Same encoding as FastAPI's JSONResponse
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _array(parts: Iterable[bytes]) -> bytes:
+    return b'[' + b','.join(parts) + b']'
+
+
+def _with_category(topic_json: bytes, category_json: bytes) -> bytes:
+    """Append a ``category`` field to a serialised topic object."""
+    return topic_json[:-1] + b',"category":' + category_json + b'}'
+
+
+def _epoch_us(published: str) -> int:
+    try:
+        return to_epoch_us(datetime.fromisoformat(published))
+    except (TypeError, ValueError):
+        return int(_NO_TIME)
+
+
+def _breaking_rows(importance: np.ndarray, published: np.ndarray, now: datetime) -> np.ndarray:
+    """Rows published within ``BREAKING_WINDOW`` of ``now`` with high importance."""
+    age = to_epoch_us(now) - published
+    recent = (published != _NO_TIME) & (age <= BREAKING_WINDOW // timedelta(microseconds=1))
+    return np.flatnonzero(recent & (importance >= BREAKING_MIN_IMPORTANCE))
+
+
+def _write_atomic(path: str, chunks: Iterable[bytes]) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f'{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        # mkstemp creates private files; the JSON files may be served statically
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, 'wb') as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+# Without fcntl, publishers are at least serialised within the process
+_publishing = threading.Lock()
+
+
+@contextmanager
+def _publish_lock(directory: str) -> Iterator[None]:
+    """Hold the directory's publish lock, blocking until it is free.
+
+    ``flock`` locks belong to the open file, so every call opens its own
+    handle and threads of one process exclude each other as well.
+    """
+    if fcntl is None:  # pragma: no cover - Windows
+        with _publishing:
+            yield
+        return
+    with open(os.path.join(directory, _PUBLISH_LOCK), 'a+b') as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _versions(directory: str) -> List[int]:
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(int(match.group(1)) for match in map(_NAME.match, names) if match)
+
+
+def publish_snapshot(
+    topics: Dict[str, Sequence[Dict]],
+    directory: str = DEFAULT_SNAPSHOT_PATH,
+    *,
+    now: Optional[datetime] = None,
+    keep: int = DEFAULT_KEEP,
+) -> str:
+    """Write a new snapshot version and make it current.
+
+    Parameters
+    ----------
+    topics: dict
+        Category name to topics sorted by importance, as returned by
+        :func:`~packages.news.repo.fetch_daily_digest`; at most
+        ``SNAPSHOT_DEPTH`` per category are kept.
+    directory: str
+        Snapshot directory; created if missing.
+    now: datetime, optional
+        Publication time (naive UTC), used for the pre‑serialised breaking
+        topics.
+    keep: int, default 3
+        Number of versions kept; older files are removed.  Readers that still
+        map a removed version are unaffected.
+
+    Returns
+    -------
+    str
+        Path of the new snapshot file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    now = now or datetime.utcnow()
+    with _publish_lock(directory):
+        return _publish(topics, directory, now, keep)
+
+
+def _publish(topics: Dict[str, Sequence[Dict]], directory: str, now: datetime, keep: int) -> str:
+    versions = _versions(directory)
+    version = versions[-1] + 1 if versions else 1
+
+    categories = list(topics)
+    category_json = [_dumps(category) for category in categories]
+    blob: List[bytes] = []
+    importance: List[float] = []
+    published: List[int] = []
+    codes: List[int] = []
+    ranges: Dict[str, Tuple[int, int]] = {}
+    for code, category in enumerate(categories):
+        start = len(blob)
+        for topic in list(topics[category])[:SNAPSHOT_DEPTH]:
+            blob.append(_dumps(topic))
+            importance.append(float(topic['importance']))
+            published.append(_epoch_us(topic['published']))
+            codes.append(code)
+        ranges[category] = (start, len(blob))
+    importance_arr = np.asarray(importance, dtype=np.float64)
+    published_arr = np.asarray(published, dtype=np.int64)
+    offsets = np.zeros(len(blob) + 1, dtype=np.int64)
+    np.cumsum([len(part) for part in blob], out=offsets[1:])
+
+    digest = b'{' + b','.join(
+        category_json[code] + b':' + _array(blob[start:min(end, start + DIGEST_LIMIT)])
+        for code, (start, end) in enumerate(ranges.values())
+    ) + b'}'
+    breaking_rows = _breaking_rows(importance_arr, published_arr, now)
+    breaking = _array(_with_category(blob[i], category_json[codes[i]]) for i in breaking_rows)
+
+    sections = [
+        ('digest', digest),
+        ('breaking', breaking),
+        ('topics', b''.join(blob)),
+        ('offsets', offsets.tobytes()),
+        ('importance', importance_arr.tobytes()),
+        ('published', published_arr.tobytes()),
+        ('category', np.asarray(codes, dtype=np.int32).tobytes()),
+    ]
+    layout: Dict[str, Tuple[int, int]] = {}
+    position = _PREFIX.size
+    for section, data in sections:
+        layout[section] = (position, len(data))
+        position += len(data) + (-len(data) % 8)
+    header = _dumps({
+        'version': version,
+        'created': now.isoformat(),
+        'categories': categories,
+        'ranges': ranges,
+        'breaking_rows': breaking_rows.tolist(),
+        'count': len(blob),
+        'sections': layout,
+    })
+
+    def chunks():
+        yield _PREFIX.pack(_MAGIC, position, len(header))
+        for _section, data in sections:
+            yield data
+            yield b'\0' * (-len(data) % 8)
+        yield header
+
+    name = f'digest-{version:08d}.snap'
+    path = os.path.join(directory, name)
+    _write_atomic(path, chunks())
+    _write_atomic(os.path.join(directory, 'digest.json'), [digest])
+    _write_atomic(os.path.join(directory, 'breaking.json'), [breaking])
+    _write_atomic(os.path.join(directory, _POINTER), [name.encode('ascii')])
+    for old in (versions + [version])[:-max(keep, 1)]:
+        try:
+            os.remove(os.path.join(directory, f'digest-{old:08d}.snap'))
+        except OSError:
+            pass
+    logger.info("Published news snapshot %s (%d topics)", name, len(blob))
+    return path
+
+
+def publish_from_db(
+    db_path: str,
+    directory: str = DEFAULT_SNAPSHOT_PATH,
+    categories: Optional[Sequence[str]] = None,
+    **kwargs,
+) -> str:
+    """Publish a snapshot of the topics stored in the news database.
+
+    ``categories`` defaults to every category in the database, in the order
+    they were first stored.
+    """
+    from . import repo as news_repo  # local import to avoid circular
+
+    if categories is None:
+        categories = news_repo.fetch_categories(db_path)
+    return publish_snapshot(news_repo.fetch_daily_digest(db_path, list(categories), SNAPSHOT_DEPTH), directory, **kwargs)
+
+
+class Snapshot:
+    """One memory‑mapped snapshot version (read‑only).
+
+    Attributes
+    ----------
+    version: int
+        Version number, increasing with every publication.
+    created: datetime
+        Publication time.
+    categories: list of str
+        Categories in the snapshot, in digest order.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'rb') as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_offset, header_length = _PREFIX.unpack_from(self._map)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a news snapshot")
+        header = json.loads(self._map[header_offset:header_offset + header_length])
+        self.version: int = header['version']
+        self.created = datetime.fromisoformat(header['created'])
+        self.categories: List[str] = header['categories']
+        self._ranges: Dict[str, Tuple[int, int]] = {name: tuple(r) for name, r in header['ranges'].items()}
+        self._breaking_rows: List[int] = header['breaking_rows']
+        self._sections: Dict[str, Tuple[int, int]] = {name: tuple(s) for name, s in header['sections'].items()}
+        count = header['count']
+        # Zero‑copy views of the mapped columns
+        self.offsets = self._column('offsets', np.int64, count + 1)
+        self.importance = self._column('importance', np.float64, count)
+        self.published = self._column('published', np.int64, count)
+        self.category_code = self._column('category', np.int32, count)
+        self._topics_start = self._sections['topics'][0]
+
+    def _column(self, section: str, dtype, count: int) -> np.ndarray:
+        return np.frombuffer(self._map, dtype=dtype, count=count, offset=self._sections[section][0])
+
+    def _section(self, section: str) -> bytes:
+        start, length = self._sections[section]
+        return self._map[start:start + length]
+
+    def __len__(self) -> int:
+        return len(self.importance)
+
+    def topic_json(self, row: int) -> bytes:
+        start = self._topics_start
+        return self._map[start + int(self.offsets[row]):start + int(self.offsets[row + 1])]
+
+    def topic(self, row: int) -> Dict:
+        return json.loads(self.topic_json(row))
+
+    def covers(self, categories: Iterable[str]) -> bool:
+        """True when every category has at least one topic."""
+        ranges = [self._ranges.get(category, (0, 0)) for category in categories]
+        return all(end > start for start, end in ranges)
+
+    def digest_json(self, categories: Optional[Sequence[str]] = None, limit: int = DIGEST_LIMIT) -> bytes:
+        """The daily digest as JSON bytes.
+
+        The pre‑serialised digest is returned as is when ``categories`` is the
+        snapshot's own list; other lists are assembled from topic slices.
+        """
+        if (categories is None or list(categories) == self.categories) and limit == DIGEST_LIMIT:
+            return self._section('digest')
+        parts = []
+        for category in categories if categories is not None else self.categories:
+            start, end = self._ranges.get(category, (0, 0))
+            rows = range(start, min(end, start + limit))
+            parts.append(_dumps(category) + b':' + _array(self.topic_json(row) for row in rows))
+        return b'{' + b','.join(parts) + b'}'
+
+    def breaking_json(self, now: Optional[datetime] = None, categories: Optional[Sequence[str]] = None) -> bytes:
+        """Breaking topics at ``now`` (published in the last hour, importance ≥ 0.7).
+
+        Filtering uses the columnar index; the pre‑serialised list is reused
+        while it is still current.
+        """
+        rows = _breaking_rows(self.importance, self.published, now or datetime.utcnow())
+        if categories is not None and list(categories) != self.categories:
+            order = {self.categories.index(c): i for i, c in enumerate(categories) if c in self._ranges}
+            rows = sorted((row for row in rows.tolist() if int(self.category_code[row]) in order),
+                          key=lambda row: order[int(self.category_code[row])])
+        else:
+            rows = rows.tolist()
+            if rows == self._breaking_rows:
+                return self._section('breaking')
+        category_json = [_dumps(category) for category in self.categories]
+        return _array(_with_category(self.topic_json(row), category_json[self.category_code[row]]) for row in rows)
+
+
+class SnapshotReader:
+    """Serve the current snapshot of a directory, hot‑swapping new versions.
+
+    :meth:`current` costs one ``stat`` of the pointer file when nothing
+    changed.  Publication replaces the pointer with a new file, so a changed
+    inode or modification time means a new version.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SNAPSHOT_PATH) -> None:
+        self.directory = directory
+        self._pointer = os.path.join(directory, _POINTER)
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._snapshot: Optional[Snapshot] = None
+
+    def current(self) -> Optional[Snapshot]:
+        """The latest published snapshot, or None if there is none yet."""
+        try:
+            info = os.stat(self._pointer)
+        except FileNotFoundError:
+            return self._snapshot
+        stamp = (info.st_ino, info.st_mtime_ns)
+        if stamp != self._stamp:
+            try:
+                with open(self._pointer, encoding='ascii') as handle:
+                    name = handle.read().strip()
+                snapshot = Snapshot(os.path.join(self.directory, name))
+            except (OSError, ValueError) as exc:
+                logger.warning("Failed to load news snapshot: %s", exc)
+                return self._snapshot
+            # Plain reference swap; concurrent readers see the old or the new version
+            self._snapshot, self._stamp = snapshot, stamp
+        return self._snapshot
@@ -0,0 +1,251 @@
+"""Per‑user topic subscriptions served from shared per‑category results.
+
+Every user used to receive the same digest for the global ``CATEGORIES``
+list.  A :class:`SubscriptionProfile` lets a user pick categories, a minimum
+importance and a digest size.  Digests are not computed per user:
+
+* :class:`CategoryTopicCache` loads the top topics of each category once
+  (until invalidated or expired) and shares them between all users;
+* :func:`merge_topics` combines a profile's category lists, each already
+  sorted by importance, with a k‑way merge that stops after ``limit`` topics;
+* :class:`DigestService` memoises digests per distinct profile, so users with
+  the same subscription share one result.  Profiles are kept in a bounded
+  LRU cache and reloaded after a TTL, so changes made by other processes are
+  picked up.
+
+The cost of serving digests therefore grows with the number of distinct
+categories (and distinct profiles), not with the number of users.  Profiles
+are persisted in the news database (see :mod:`packages.news.repo`).
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import heapq
+import threading
+import time
+
+from . import repo as news_repo
+
+
+DEFAULT_DIGEST_LIMIT = 10
+# Topics cached per category; digests cannot be longer than this
+DEFAULT_CACHE_DEPTH = 50
+DEFAULT_CACHE_TTL = 300.0
+# Profiles cached per process, and seconds before one is reloaded
+DEFAULT_MAX_PROFILES = 10_000
+DEFAULT_PROFILE_TTL = 60.0
+
+
+@dataclass(frozen=True)
+class SubscriptionProfile:
+    """A user's digest preferences.
+
+    Attributes
+    ----------
+    user_id: str
+        The subscriber.
+    categories: tuple of str
+        Subscribed categories.
+    min_importance: float
+        Topics below this importance are left out.
+    limit: int
+        Maximum number of topics in the digest.
+    """
+
+    user_id: str
+    categories: Tuple[str, ...]
+    min_importance: float = 0.0
+    limit: int = DEFAULT_DIGEST_LIMIT
+
+    @property
+    def signature(self) -> Tuple[Tuple[str, ...], float, int]:
+        """Everything that determines the digest, independent of the user."""
+        return (tuple(sorted(set(self.categories))), self.min_importance, self.limit)
+
+
+class CategoryTopicCache:
+    """Shared cache of the top topics per category.
+
+    Parameters
+    ----------
+    db_path: str
+        News database to read from.
+    depth: int
+        Number of topics loaded per category.
+    ttl: float
+        Seconds after which a category is reloaded, so that writes by other
+        processes (e.g. the news worker) are picked up.  Writers in the same
+        process should call :meth:`invalidate` instead.
+    loader: callable, optional
+        ``loader(category, limit)`` returning topics sorted by importance;
+        defaults to :func:`~packages.news.repo.fetch_top_topics`.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        depth: int = DEFAULT_CACHE_DEPTH,
+        ttl: float = DEFAULT_CACHE_TTL,
+        loader: Optional[Callable[[str, int], List[Dict]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.db_path = db_path
+        self.depth = depth
+        self.ttl = ttl
+        self.clock = clock
+        self._loader = loader or (lambda category, limit: news_repo.fetch_top_topics(category, db_path, limit))
+        self._entries: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+        self.loads = 0
+
+    def get(self, category: str) -> List[Dict]:
+        """Top topics of ``category`` (shared; do not modify)."""
+        now = self.clock()
+        entry = self._entries.get(category)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(category)
+            if entry is None or now - entry[0] >= self.ttl:
+                topics = [{**topic, 'category': category} for topic in self._loader(category, self.depth)]
+                entry = self._entries[category] = (now, topics)
+                self.loads += 1
+                self.version += 1
+        return entry[1]
+
+    def invalidate(self, category: Optional[str] = None) -> None:
+        """Drop one category, or everything, e.g. after the pipeline stored new topics."""
+        with self._lock:
+            if category is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(category, None)
+            self.version += 1
+
+
+def merge_topics(lists: Iterable[Sequence[Dict]], limit: int, min_importance: float = 0.0) -> List[Dict]:
+    """K‑way merge of topic lists sorted by importance, keeping the top ``limit``.
+
+    Topics shared between categories (same headline and links) appear once.
+    """
+    merged: List[Dict] = []
+    seen = set()
+    for topic in heapq.merge(*lists, key=lambda t: -t['importance']):
+        if topic['importance'] < min_importance or len(merged) >= limit:
+            break
+        key = (topic['headline'], tuple(topic['links']))
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(topic)
+    return merged
+
+
+class DigestService:
+    """Build per‑user digests from a :class:`CategoryTopicCache`.
+
+    Digests are memoised per profile signature and cache version, so the
+    number of merges is bounded by the number of distinct profiles.
+
+    Parameters
+    ----------
+    cache: CategoryTopicCache
+        Shared per‑category topics.
+    default_categories: sequence of str
+        Categories of users without a stored profile.
+    db_path: str, optional
+        News database holding the profiles.  Without it profiles only live in
+        memory, and are neither expired nor evicted.
+    max_profiles: int, default 10000
+        Maximum number of profiles cached; the least recently used is dropped
+        when the limit is exceeded.
+    profile_ttl: float, default 60.0
+        Seconds after which a cached profile (or the absence of one) is read
+        again from the database, so that profiles saved by other processes
+        are picked up.  Ignored without ``db_path``.
+    """
+
+    def __init__(
+        self,
+        cache: CategoryTopicCache,
+        default_categories: Sequence[str],
+        db_path: Optional[str] = None,
+        *,
+        max_profiles: int = DEFAULT_MAX_PROFILES,
+        profile_ttl: float = DEFAULT_PROFILE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.cache = cache
+        self.default_categories = tuple(default_categories)
+        self.db_path = db_path
+        self.max_profiles = max_profiles
+        self.profile_ttl = profile_ttl
+        self.clock = clock
+        self._digests: Dict[Tuple, Tuple[int, List[Dict]]] = {}
+        self._profiles: OrderedDict[str, Tuple[float, SubscriptionProfile]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def default_profile(self, user_id: str) -> SubscriptionProfile:
+        return SubscriptionProfile(user_id, self.default_categories)
+
+    def _cached(self, user_id: str, now: float) -> Optional[SubscriptionProfile]:
+        entry = self._profiles.get(user_id)
+        if entry is None or (self.db_path is not None and now - entry[0] >= self.profile_ttl):
+            return None
+        self._profiles.move_to_end(user_id)
+        return entry[1]
+
+    def _remember(self, profile: SubscriptionProfile, now: float) -> None:
+        self._profiles[profile.user_id] = (now, profile)
+        self._profiles.move_to_end(profile.user_id)
+        while self.db_path is not None and len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def profile(self, user_id: str) -> SubscriptionProfile:
+        """The user's stored profile, or the default one."""
+        with self._lock:
+            now = self.clock()
+            profile = self._cached(user_id, now)
+            if profile is None:
+                # Loaded under the lock, so a concurrent subscribe() cannot be overwritten by a stale read
+                stored = news_repo.fetch_subscription(self.db_path, user_id) if self.db_path is not None else None
+                if stored is not None:
+                    profile = SubscriptionProfile(
+                        user_id, tuple(stored['categories']), stored['min_importance'], stored['limit']
+                    )
+                else:
+                    profile = self.default_profile(user_id)
+                    if self.db_path is None:
+                        return profile
+                # Remember misses too, so unknown users cost one lookup per TTL
+                self._remember(profile, now)
+            return profile
+
+    def subscribe(self, profile: SubscriptionProfile) -> None:
+        """Store a profile (persisted when the service has a database)."""
+        with self._lock:
+            if self.db_path is not None:
+                news_repo.save_subscription(
+                    self.db_path, profile.user_id, list(profile.categories), profile.min_importance, profile.limit
+                )
+            self._remember(profile, self.clock())
+
+    def digest(self, profile: SubscriptionProfile) -> List[Dict]:
+        """Top topics for ``profile``; the returned list is shared, do not modify."""
+        categories, min_importance, limit = profile.signature
+        lists = [self.cache.get(category) for category in categories]
+        version = self.cache.version
+        memo = self._digests.get(profile.signature)
+        if memo is not None and memo[0] == version:
+            return memo[1]
+        topics = merge_topics(lists, min(limit, self.cache.depth), min_importance)
+        self._digests[profile.signature] = (version, topics)
+        return topics
+
+    def digest_for(self, user_id: str) -> List[Dict]:
+        return self.digest(self.profile(user_id))
@@ -10,8 +10,19 @@ you may replace it with a more sophisticated summarisation method.
 
 from __future__ import annotations
 
-from typing import List
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 import re
+
+import numpy as np
+from scipy import sparse
+
+from .batch import ArticleBatch
+from .cluster import ClusterVectors
+
+# Articles per cluster, closest to its centroid, whose sentences are ranked
+CANDIDATE_ARTICLES = 8
+
 # Attempt to import NLTK tokenizers and stopwords.  If NLTK data is not
 # available (as may be the case in offline environments), we fall back to
 # simple regex-based tokenisation and a small list of stopwords.
@@ -65,25 +76,17 @@ def summarize_text(text: str, max_sentences: int = 2) -> str:
     if len(sentences) <= max_sentences:
         return ' '.join(sentences)
 
-    # Build frequency table for words
-    freq = {}
-    for word in word_tokenize(text.lower()):
-        if word.lower() in STOPWORDS:
-            continue
-        freq[word.lower()] = freq.get(word.lower(), 0) + 1
+    # Tokenise each sentence once; the frequency table is built from the same
+    # tokens.  Tokens of lower‑cased text are already lower case.
+    tokens = [word_tokenize(sentence.lower()) for sentence in sentences]
+    freq = Counter(word for words in tokens for word in words if word not in STOPWORDS)
 
     # Score sentences by the sum of word frequencies
     sentence_scores = {}
-    for i, sentence in enumerate(sentences):
-        words = word_tokenize(sentence.lower())
+    for i, words in enumerate(tokens):
         if not words:
             continue
-        score = 0.0
-        for word in words:
-            if word.lower() in STOPWORDS:
-                continue
-            score += freq.get(word.lower(), 0)
-        sentence_scores[i] = score / len(words)
+        sentence_scores[i] = sum(freq[word] for word in words if word not in STOPWORDS) / len(words)
 
     # Select top sentences
     ranked_indices = sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:max_sentences]
@@ -96,7 +99,7 @@ def summarize_cluster(cluster: List) -> str:
 
     Parameters
     ----------
-    cluster: list of articles
+    cluster: list of articles or ArticleBatch
         The articles belonging to the cluster.
 
     Returns
@@ -104,10 +107,109 @@ def summarize_cluster(cluster: List) -> str:
     str
         A summary of the cluster.
     """
-    if not cluster:
+    if not len(cluster):
         return ''
-    # Concatenate descriptions; fall back to titles if descriptions are missing
-    combined_text = ' '.join(
-        article.description if article.description else article.title for article in cluster
-    )
-    return summarize_text(combined_text, max_sentences=2)
+    return summarize_text(' '.join(_texts(cluster)), max_sentences=2)
+
+
+def summarize_clusters(
+    clusters: Sequence,
+    vectors: Optional[Sequence[sparse.spmatrix]] = None,
+    transform: Optional[Callable[[Sequence[str]], sparse.spmatrix]] = None,
+    max_sentences: int = 2,
+) -> List[str]:
+    """Summarise several clusters, reusing the features they were clustered on.
+
+    Each cluster's centroid is the mean of its articles' TF‑IDF vectors, as
+    computed by the cluster stage.  The ``CANDIDATE_ARTICLES`` articles
+    closest to the centroid are found from those vectors alone; only their sentences are split and
+    vectorised with the same ``transform`` (in one batch for all clusters),
+    and the ``max_sentences`` sentences closest to the centroid form the
+    summary, in article order.  Sentences are ranked by the cluster's TF‑IDF
+    weights rather than raw word counts, and duplicates are dropped.
+
+    Parameters
+    ----------
+    clusters: sequence of list of articles or ArticleBatch
+        The clusters to summarise.
+    vectors: sequence of sparse matrix, optional
+        The rows of each cluster's articles, aligned with ``clusters``, e.g.
+        the :class:`~packages.news.cluster.ClusterVectors` returned by
+        :func:`~packages.news.cluster.cluster_articles_with_vectors`.
+    transform: callable, optional
+        Maps texts into the feature space of ``vectors``.  Without it (or
+        without ``vectors``) each cluster goes through
+        :func:`summarize_cluster` instead.
+    max_sentences: int, default 2
+        The maximum number of sentences per summary.
+
+    Returns
+    -------
+    list of str
+        One summary per cluster.
+    """
+    if vectors is None or transform is None:
+        return [summarize_cluster(cluster) for cluster in clusters]
+
+    summaries: List[str] = [''] * len(clusters)
+
+    def centroids(indices: List[int]) -> Tuple[sparse.csr_matrix, sparse.csr_matrix, np.ndarray]:
+        """Stacked rows, unnormalised centroids and row owners of ``indices``."""
+        # Only clusters whose articles or sentences need ranking read their
+        # vectors; ClusterVectors slices them all at once
+        if isinstance(vectors, ClusterVectors):
+            block = vectors.stack(indices)
+        else:
+            block = sparse.vstack([vectors[i] for i in indices]).tocsr()
+        owners = np.repeat(np.arange(len(indices)), [len(clusters[i]) for i in indices])
+        indicator = sparse.csr_matrix((np.ones(len(owners)), (owners, np.arange(len(owners)))))
+        # Scaling a centroid does not change the ranking within its cluster
+        return block, (indicator @ block).tocsr(), owners
+
+    def own_scores(X: sparse.csr_matrix, C: sparse.csr_matrix, owners: np.ndarray) -> np.ndarray:
+        return np.asarray((X @ C.T)[np.arange(len(owners)), owners]).ravel()
+
+    def top(scores: np.ndarray, count: int) -> np.ndarray:
+        """Positions of the ``count`` highest scores, in their original order."""
+        return np.sort(np.argsort(-scores, kind='stable')[:count])
+
+    # Articles of large clusters are narrowed to those closest to the centroid
+    nearest: Dict[int, np.ndarray] = {}
+    large = [i for i, cluster in enumerate(clusters) if len(cluster) > CANDIDATE_ARTICLES]
+    if large:
+        block, C, owners = centroids(large)
+        closeness = np.split(own_scores(block, C, owners), np.cumsum([len(clusters[i]) for i in large])[:-1])
+        for i, scores in zip(large, closeness):
+            nearest[i] = top(scores, CANDIDATE_ARTICLES)
+
+    ranked: List[int] = []
+    candidates: List[List[str]] = []
+    for i, cluster in enumerate(clusters):
+        texts = _texts(cluster)
+        if i in nearest:
+            texts = [texts[j] for j in nearest[i]]
+        sentences = list(dict.fromkeys(
+            sentence for text in dict.fromkeys(texts) for sentence in sent_tokenize(text)
+        ))
+        if len(sentences) <= max_sentences:
+            summaries[i] = ' '.join(sentences)
+        else:
+            ranked.append(i)
+            candidates.append(sentences)
+    if not ranked:
+        return summaries
+
+    # Sentence rows are L2 normalised by the transform, so this ranks by cosine
+    S = sparse.csr_matrix(transform([sentence for sentences in candidates for sentence in sentences]))
+    counts = [len(sentences) for sentences in candidates]
+    scores = own_scores(S, centroids(ranked)[1], np.repeat(np.arange(len(ranked)), counts))
+    for i, sentences, own in zip(ranked, candidates, np.split(scores, np.cumsum(counts)[:-1])):
+        summaries[i] = ' '.join(sentences[j] for j in top(own, max_sentences))
+    return summaries
+
+
+def _texts(cluster) -> List[str]:
+    """Article descriptions of a cluster, falling back to titles if missing."""
+    if isinstance(cluster, ArticleBatch):
+        return [description or title for title, description in zip(cluster.title, cluster.description)]
+    return [article.description if article.description else article.title for article in cluster]
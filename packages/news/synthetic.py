@@ -0,0 +1,175 @@
+"""Seeded synthetic news corpora for benchmarking the pipeline.
+
+The built‑in sample data (see :mod:`packages.news.sample_data`) contains only a
+few dozen articles, which says nothing about how the pipeline scales.
+:func:`generate_articles` expands those samples into corpora of any size with
+controllable structure:
+
+* ``duplicate_rate``: share of articles that re‑report an earlier story (the
+  near‑duplicates clustering is meant to merge);
+* ``burst_rate`` / ``burst_size``: share of new stories that turn into
+  bursts, i.e. many reports from different outlets in a short time window.
+  Burst reports are duplicates: while a burst is active it takes every
+  duplicate slot, so the realised duplicate share stays ``duplicate_rate``
+  and bursts make up about ``min(duplicate_rate, (1 - duplicate_rate) *
+  burst_rate * burst_size)`` of the articles;
+* ``publishers``: number of distinct outlets;
+* ``category_mix``: relative weight of each category;
+* ``uncategorised_rate``: share of articles without a category, so that
+  :func:`~packages.news.classify.classify_articles` has work to do.
+
+Articles are yielded lazily in chronological order and only a bounded window of
+recent stories is kept, so a million articles can be streamed to JSONL (see
+:mod:`packages.news.jsonl`) in constant memory.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterator, List, Mapping, Optional
+import random
+import re
+
+from .datatypes import Article
+from .sample_data import load_sample_articles
+
+
+_SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ra', 'to', 'vi', 'de', 'sa', 'po', 'li', 'an', 'er', 'os', 'ul', 'is', 'ma', 'ko', 'te', 'ri']
+_PREFIXES = ['', '', '', 'UPDATE: ', 'Breaking: ', 'Live: ', 'Analysis: ']
+_SUFFIXES = ['', '', ' - report', ' as officials react', ' amid criticism', ' say sources']
+# Number of recent stories eligible for re‑reporting
+_RECENT_STORIES = 2_000
+
+
+@dataclass
+class _Story:
+    story_id: int
+    title: str
+    description: str
+    category: str
+    remaining_burst: int = 0
+
+
+def _name(rng: random.Random, syllables: int) -> str:
+    return ''.join(rng.choice(_SYLLABLES) for _ in range(syllables)).capitalize()
+
+
+def _make_publishers(rng: random.Random, count: int, samples: List[Article]) -> List[str]:
+    names = sorted({a.publisher for a in samples})
+    while len(names) < count:
+        names.append(f"{_name(rng, 3)} {rng.choice(['Times', 'Post', 'News', 'Herald', 'Daily', 'Review', 'Journal'])}")
+    return names[:max(1, count)]
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def generate_articles(
+    n: int,
+    *,
+    seed: int = 0,
+    duplicate_rate: float = 0.3,
+    burst_rate: float = 0.02,
+    burst_size: int = 20,
+    publishers: int = 200,
+    category_mix: Optional[Mapping[str, float]] = None,
+    uncategorised_rate: float = 0.0,
+    hours: float = 24.0,
+    end: Optional[datetime] = None,
+) -> Iterator[Article]:
+    """Yield ``n`` synthetic articles derived from the sample data.
+
+    Parameters
+    ----------
+    n: int
+        Number of articles to generate.
+    seed: int, default 0
+        Random seed.  With a fixed ``end``, the output is identical between
+        runs.
+    duplicate_rate: float, default 0.3
+        Probability that an article re‑reports an earlier story rather than
+        starting a new one.  Burst reports count towards it.
+    burst_rate: float, default 0.02
+        Probability that a new story becomes a burst.
+    burst_size: int, default 20
+        Mean number of extra reports of a burst story.  They take the
+        duplicate slots while the burst lasts, so they are published close
+        together.
+    publishers: int, default 200
+        Number of distinct publishers.
+    category_mix: mapping, optional
+        Relative weight per category.  Defaults to equal weights over the
+        sample categories; categories without samples are ignored.
+    uncategorised_rate: float, default 0.0
+        Probability that an article is emitted without a category.
+    hours: float, default 24.0
+        Time span covered by the corpus.
+    end: datetime, optional
+        Publication time of the last article.  Defaults to now (naive UTC).
+    """
+    rng = random.Random(seed)
+    samples = load_sample_articles()
+    by_category: Dict[str, List[Article]] = {}
+    for article in samples:
+        by_category.setdefault(article.category, []).append(article)
+    mix = {c: w for c, w in (category_mix or {c: 1.0 for c in by_category}).items() if c in by_category and w > 0}
+    if not mix:
+        raise ValueError("category_mix does not contain any known category")
+    categories = list(mix)
+    weights = [mix[c] for c in categories]
+    outlets = _make_publishers(rng, publishers, samples)
+
+    end = end or datetime.utcnow()
+    start = end - timedelta(hours=hours)
+    step = hours * 3600.0 / max(n, 1)
+
+    recent: Deque[_Story] = deque(maxlen=_RECENT_STORIES)
+    bursts: List[_Story] = []
+    next_id = 0
+
+    for i in range(n):
+        published = start + timedelta(seconds=(i + rng.random()) * step)
+        story: Optional[_Story] = None
+        duplicate = False
+        if recent and rng.random() < duplicate_rate:
+            duplicate = True
+            if bursts:
+                story = rng.choice(bursts)
+                story.remaining_burst -= 1
+                if story.remaining_burst <= 0:
+                    bursts.remove(story)
+            else:
+                # Favour the most recent stories, as follow‑ups usually are
+                story = recent[-1 - min(int(rng.expovariate(1 / 50)), len(recent) - 1)]
+        else:
+            category = rng.choices(categories, weights=weights)[0]
+            base = rng.choice(by_category[category])
+            entity = _name(rng, rng.randint(2, 3))
+            place = _name(rng, 2)
+            story = _Story(
+                story_id=next_id,
+                title=f"{base.title} as {entity} responds in {place}",
+                description=f"{base.description} {entity} said the developments in {place} would be closely watched.",
+                category=category,
+            )
+            next_id += 1
+            recent.append(story)
+            if rng.random() < burst_rate:
+                story.remaining_burst = max(1, int(rng.expovariate(1 / max(burst_size, 1))))
+                bursts.append(story)
+
+        publisher = rng.choice(outlets)
+        title = story.title
+        if duplicate:
+            title = f"{rng.choice(_PREFIXES)}{title}{rng.choice(_SUFFIXES)}"
+        yield Article(
+            title=title,
+            link=f"https://{_slug(publisher)}.example.com/{_slug(story.category)}/{story.story_id}-{i}",
+            description=story.description,
+            published=published,
+            publisher=publisher,
+            category=None if rng.random() < uncategorised_rate else story.category,
+        )
@@ -0,0 +1,382 @@
+"""Persistent, memory‑mapped store of article vectors.
+
+Article vectors used to be recomputed from text on every run and discarded.
+:class:`VectorStore` keeps them on disk under ``data/news_vectors/`` as
+append‑only sparse CSR shards:
+
+* each shard holds ``indptr`` (int64), ``indices`` (int32) and ``data``
+  (float32) as ``.npy`` files plus the article IDs of its rows;
+* ``manifest.json`` lists the shards and is replaced atomically after a
+  shard is written, so readers never see a partial append;
+* arrays are opened with ``mmap_mode='r'``: reads are zero‑copy views, and
+  several worker processes reading the same store share the page cache
+  instead of each holding a copy.
+
+Rows are addressed by article ID or by position in append order, so a recent
+window can be loaded without touching older shards.  :func:`article_key`
+derives IDs from the link and a hash of the vectorised text: articles with a
+missing or repeated link, or whose text changed, never reuse another
+article's vector.
+
+Hashed TF‑IDF vectors (see :mod:`packages.news.features`) are very sparse, so
+CSR takes a few hundred bytes per article where dense float32 would need
+megabytes.
+
+Any number of processes may read a store, but only one appends: the first to
+open it holds ``writer.lock`` (see :mod:`packages.news.ownership`).  Other
+processes vectorise articles the store does not know in memory and pick up
+the owner's appends on their next call.  Every append adds a shard, so the
+owner merges them all once there are more than ``max_shards``.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from .features import DEFAULT_N_FEATURES, HashedTfidfVectorizer
+from .ownership import WriterLock
+
+
+DEFAULT_VECTOR_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'news_vectors')
+DEFAULT_MAX_SHARDS = 64
+_MANIFEST = 'manifest.json'
+_WRITER_LOCK = 'writer.lock'
+_SHARD_NUMBER = re.compile(r'^shard-(\d+)')
+_SHARD_SUFFIXES = ('.indptr.npy', '.indices.npy', '.data.npy', '.ids')
+
+
+def article_key(link: str, text: str) -> str:
+    """Store ID of an article: its link plus a hash of the text that is vectorised."""
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+    return f'{link.strip()}#{digest}'
+
+
+class _Shard:
+    """A read‑only, memory‑mapped CSR shard."""
+
+    def __init__(self, directory: str, name: str, start: int, n_features: int) -> None:
+        base = os.path.join(directory, name)
+        self.name = name
+        self.start = start
+        self.indptr = np.load(f'{base}.indptr.npy', mmap_mode='r')
+        self.indices = np.load(f'{base}.indices.npy', mmap_mode='r')
+        self.data = np.load(f'{base}.data.npy', mmap_mode='r')
+        with open(f'{base}.ids', encoding='utf-8') as handle:
+            self.ids = handle.read().split('\n')[:-1]
+        self.n_features = n_features
+
+    @property
+    def rows(self) -> int:
+        return len(self.ids)
+
+    def slice(self, begin: int, end: int) -> sparse.csr_matrix:
+        """Rows ``begin:end`` (shard‑local); data and indices are views of the mapping."""
+        lo, hi = int(self.indptr[begin]), int(self.indptr[end])
+        indptr = np.asarray(self.indptr[begin:end + 1], dtype=np.int64) - lo
+        return sparse.csr_matrix(
+            (self.data[lo:hi], self.indices[lo:hi], indptr), shape=(end - begin, self.n_features), copy=False
+        )
+
+
+def _reorder(parts: List[sparse.csr_matrix], positions: List[np.ndarray], n_features: int) -> sparse.csr_matrix:
+    """Stack row blocks and put row ``positions[k][j]`` of the result at that position."""
+    if not parts:
+        return sparse.csr_matrix((0, n_features), dtype=np.float32)
+    stacked = parts[0] if len(parts) == 1 else sparse.vstack(parts, format='csr')
+    order = np.concatenate(positions)
+    if np.array_equal(order, np.arange(order.shape[0])):
+        return stacked
+    return stacked[np.argsort(order, kind='stable')]
+
+
+class VectorStore:
+    """Append‑only store of sparse article vectors, memory‑mapped for reading.
+
+    Parameters
+    ----------
+    directory: str
+        Directory holding the shards; created if missing.
+    n_features: int
+        Width of the stored vectors.  Must match an existing store.
+    max_shards: int, default 64
+        The owner compacts the store into one shard when an append makes it
+        exceed this many shards.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_VECTOR_PATH,
+        n_features: int = DEFAULT_N_FEATURES,
+        *,
+        max_shards: int = DEFAULT_MAX_SHARDS,
+    ) -> None:
+        self.directory = directory
+        self.n_features = int(n_features)
+        self.max_shards = max(1, int(max_shards))
+        self._lock = threading.Lock()
+        self._shards: List[_Shard] = []
+        self._row_of: Dict[str, int] = {}
+        self._mtime: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+        self._writer = WriterLock(os.path.join(directory, _WRITER_LOCK))
+        self._writer.acquire()
+        self.refresh()
+
+    def __len__(self) -> int:
+        return sum(shard.rows for shard in self._shards)
+
+    def __contains__(self, article_id: str) -> bool:
+        return article_id in self._row_of
+
+    @property
+    def owner(self) -> bool:
+        """True if this instance may append to the store."""
+        return self._writer.acquire()
+
+    def close(self) -> None:
+        """Give up ownership of the store; reading stays possible."""
+        self._writer.release()
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, _MANIFEST)
+
+    def refresh(self) -> None:
+        """Re‑read the manifest to pick up shards appended by other processes.
+
+        Nothing is read while the manifest is unchanged.  Appended shards are
+        indexed incrementally; only a compaction rebuilds the whole index.
+        """
+        path = self._manifest_path()
+        for attempt in range(3):
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                return
+            if mtime == self._mtime:
+                return
+            with open(path, encoding='utf-8') as handle:
+                manifest = json.load(handle)
+            if manifest['n_features'] != self.n_features:
+                raise ValueError(f"Store has {manifest['n_features']} features, expected {self.n_features}")
+            try:
+                self._load(manifest['shards'])
+            except FileNotFoundError:
+                # A compaction removed shards of the manifest just read
+                if attempt == 2:
+                    raise
+                continue
+            self._mtime = mtime
+            return
+
+    def _load(self, names: Sequence[str]) -> None:
+        current = [shard.name for shard in self._shards]
+        if list(names[:len(current)]) == current:
+            # Only appends since the last refresh: index the new shards
+            shards, row_of = list(self._shards), self._row_of
+            start = len(self)
+            new_names = names[len(current):]
+        else:
+            shards, row_of, start, new_names = [], {}, 0, names
+        added: List[_Shard] = []
+        for name in new_names:
+            shard = _Shard(self.directory, name, start, self.n_features)
+            added.append(shard)
+            start += shard.rows
+        # Publish the shards before their IDs, so lock‑free readers never see
+        # an ID whose shard is missing
+        self._shards = shards + added
+        for shard in added:
+            for row, article_id in enumerate(shard.ids, shard.start):
+                row_of.setdefault(article_id, row)
+        self._row_of = row_of
+
+    def _write_manifest(self, names: Sequence[str]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f'{_MANIFEST}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump({'n_features': self.n_features, 'shards': list(names)}, handle)
+            os.replace(tmp_path, self._manifest_path())
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _next_shard_name(self, suffix: str = '') -> str:
+        # Names are never reused, so a reader still mapping a removed shard
+        # is not affected by a new one
+        numbers = [int(m.group(1)) for m in map(_SHARD_NUMBER.match, os.listdir(self.directory)) if m]
+        return f'shard-{max(numbers, default=-1) + 1:06d}{suffix}'
+
+    def _write_shard(self, name: str, ids: Sequence[str], matrix: sparse.csr_matrix) -> None:
+        base = os.path.join(self.directory, name)
+        np.save(f'{base}.indptr.npy', matrix.indptr.astype(np.int64))
+        np.save(f'{base}.indices.npy', matrix.indices.astype(np.int32))
+        np.save(f'{base}.data.npy', matrix.data.astype(np.float32))
+        with open(f'{base}.ids', 'w', encoding='utf-8') as handle:
+            handle.writelines(f'{article_id}\n' for article_id in ids)
+
+    def append(self, ids: Sequence[str], matrix: sparse.spmatrix) -> int:
+        """Append vectors for new article IDs; known and empty IDs are skipped.
+
+        Returns the number of rows written.
+
+        Raises
+        ------
+        RuntimeError
+            If another process owns the store.
+        """
+        matrix = sparse.csr_matrix(matrix)
+        if matrix.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {matrix.shape[1]}")
+        with self._lock:
+            return self._append(ids, matrix)
+
+    def _append(self, ids: Sequence[str], matrix: sparse.csr_matrix) -> int:
+        if not self.owner:
+            raise RuntimeError(f"{self.directory} is owned by another process")
+        self.refresh()
+        keep: List[int] = []
+        seen = set()
+        for i, article_id in enumerate(ids):
+            # IDs are stored one per line; duplicates keep the first occurrence
+            if article_id and '\n' not in article_id and article_id not in self._row_of and article_id not in seen:
+                seen.add(article_id)
+                keep.append(i)
+        if not keep:
+            return 0
+        name = self._next_shard_name()
+        self._write_shard(name, [ids[i] for i in keep], matrix[keep])
+        self._write_manifest([shard.name for shard in self._shards] + [name])
+        self.refresh()
+        if len(self._shards) > self.max_shards:
+            self._compact()
+        return len(keep)
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> sparse.csr_matrix:
+        """Vectors of rows ``start:end`` in append order, touching only the shards involved."""
+        total = len(self)
+        end = total if end is None else min(end, total)
+        parts = []
+        for shard in self._shards:
+            lo, hi = max(start, shard.start), min(end, shard.start + shard.rows)
+            if lo < hi:
+                parts.append(shard.slice(lo - shard.start, hi - shard.start))
+        if not parts:
+            return sparse.csr_matrix((0, self.n_features), dtype=np.float32)
+        return parts[0] if len(parts) == 1 else sparse.vstack(parts, format='csr')
+
+    def latest(self, n: int) -> Tuple[List[str], sparse.csr_matrix]:
+        """IDs and vectors of the ``n`` most recently appended articles."""
+        start = max(0, len(self) - n)
+        return self.ids(start), self.rows(start)
+
+    def ids(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        out: List[str] = []
+        end = len(self) if end is None else end
+        for shard in self._shards:
+            lo, hi = max(start, shard.start), min(end, shard.start + shard.rows)
+            if lo < hi:
+                out.extend(shard.ids[lo - shard.start:hi - shard.start])
+        return out
+
+    def get(self, ids: Iterable[str]) -> sparse.csr_matrix:
+        """Vectors for ``ids`` in the given order; raises KeyError for unknown IDs."""
+        rows = np.fromiter((self._row_of[article_id] for article_id in ids), dtype=np.int64)
+        parts, positions = [], []
+        for shard in self._shards:
+            mask = (rows >= shard.start) & (rows < shard.start + shard.rows)
+            if mask.any():
+                parts.append(shard.slice(0, shard.rows)[rows[mask] - shard.start])
+                positions.append(np.flatnonzero(mask))
+        return _reorder(parts, positions, self.n_features)
+
+    def vectors_for(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        vectorizer: HashedTfidfVectorizer,
+    ) -> sparse.csr_matrix:
+        """Return vectors for ``ids``, vectorising and storing only unknown articles.
+
+        Only the new articles are added to the vectoriser's statistics, each
+        once, so re‑processing an article neither recomputes its vector nor
+        counts it twice; concurrent calls are serialised for the same reason.
+        Articles with an empty ID are vectorised but never stored.  A store
+        owned by another process is only read.
+        """
+        with self._lock:
+            self.refresh()
+            known = [i for i, article_id in enumerate(ids) if article_id and article_id in self._row_of]
+            missing = [i for i, article_id in enumerate(ids) if not article_id or article_id not in self._row_of]
+            parts, positions = [], []
+            if known:
+                parts.append(self.get([ids[i] for i in known]))
+                positions.append(np.asarray(known))
+            if missing:
+                # Vectorise each distinct new article once
+                slot: Dict[object, int] = {}
+                rows = [slot.setdefault(ids[i] or ('', i), len(slot)) for i in missing]
+                first = {row: i for i, row in zip(reversed(missing), reversed(rows))}
+                order = [first[row] for row in range(len(slot))]
+                fresh = vectorizer.fit_transform([texts[i] for i in order]).astype(np.float32)
+                if self.owner:
+                    self._append([ids[i] for i in order], fresh)
+                parts.append(fresh[rows])
+                positions.append(np.asarray(missing))
+        return _reorder(parts, positions, self.n_features)
+
+    def similar(
+        self,
+        vector: sparse.spmatrix,
+        k: int = 10,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Top ``k`` stored articles by cosine similarity to ``vector``.
+
+        Only rows ``start:end`` are searched; stored vectors are L2‑normalised.
+        """
+        window = self.rows(start, end)
+        if not window.shape[0]:
+            return []
+        scores = np.asarray((window @ sparse.csr_matrix(vector).T).todense()).ravel()
+        top = np.argsort(-scores, kind='stable')[:k]
+        ids = self.ids(start, start + window.shape[0])
+        return [(ids[i], float(scores[i])) for i in top]
+
+    def compact(self) -> None:
+        """Merge all shards into one, e.g. after many small appends.
+
+        Raises
+        ------
+        RuntimeError
+            If another process owns the store.
+        """
+        with self._lock:
+            if not self.owner:
+                raise RuntimeError(f"{self.directory} is owned by another process")
+            self.refresh()
+            self._compact()
+
+    def _compact(self) -> None:
+        if len(self._shards) < 2:
+            return
+        old = [shard.name for shard in self._shards]
+        name = self._next_shard_name('-compact')
+        self._write_shard(name, self.ids(), self.rows())
+        self._write_manifest([name])
+        self.refresh()
+        for stale in old:
+            for suffix in _SHARD_SUFFIXES:
+                try:
+                    os.remove(os.path.join(self.directory, stale + suffix))
+                except OSError:
+                    pass
@@ -0,0 +1,231 @@
+"""Sliding‑window article store with time‑based eviction.
+
+The daily digest is meant to cover the last 24 hours, but ``load_articles``
+returns whatever the source provides and nothing ever expires.
+:class:`ArticleWindow` is a long‑lived store (kept by the API or a worker
+process, see ``scripts/news_worker.py``) that holds the live articles in a
+ring ordered by publication time:
+
+* adding an article is O(1) (in‑order arrivals append to the right);
+* :meth:`ArticleWindow.evict` pops expired articles from the left, so
+  eviction costs O(1) amortised per article;
+* per‑topic aggregates (article count, publisher counts, categories, latest
+  publication) are updated incrementally on eviction and topic assignment;
+  when a topic's newest article leaves it, its latest publication falls back
+  to the newest article it still holds.
+
+Topic assignments are the derived state: after a clustering pass the pipeline
+calls :meth:`ArticleWindow.assign_clusters`, and ranks the topics with
+:meth:`ArticleWindow.score_topics`, which scores them from the aggregates
+alone, touching neither evicted articles nor article text.
+
+The window is shared between the pipeline, which runs in a worker thread, and
+periodic eviction, so every method takes the window's lock.
+"""
+
+from __future__ import annotations
+
+from bisect import insort
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Collection, Deque, Dict, Iterable, List, Optional, Tuple
+import threading
+
+import numpy as np
+
+from .batch import ArticleBatch
+from .datatypes import Article
+
+
+DEFAULT_HORIZON = timedelta(hours=24)
+
+
+@dataclass
+class TopicStats:
+    """Incrementally maintained aggregates of one topic in the window."""
+
+    count: int = 0
+    publishers: Counter = field(default_factory=Counter)
+    categories: Counter = field(default_factory=Counter)
+    published: Counter = field(default_factory=Counter)
+    latest: Optional[datetime] = None
+
+    @property
+    def coverage(self) -> int:
+        """Number of distinct publishers."""
+        return len(self.publishers)
+
+
+class _Entry:
+    __slots__ = ('article', 'topic')
+
+    def __init__(self, article: Article) -> None:
+        self.article = article
+        self.topic: Optional[str] = None
+
+    def __lt__(self, other: '_Entry') -> bool:
+        return self.article.published < other.article.published
+
+
+def _decrement(counter: Counter, key) -> None:
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
+
+
+class ArticleWindow:
+    """Live articles of the last ``horizon``, with incremental topic aggregates.
+
+    Parameters
+    ----------
+    horizon: timedelta, default 24 hours
+        Articles published before ``now - horizon`` are evicted.
+    clock: callable
+        Returns the current time (naive UTC); overridable for replays.
+    """
+
+    def __init__(self, horizon: timedelta = DEFAULT_HORIZON, clock: Callable[[], datetime] = datetime.utcnow) -> None:
+        self.horizon = horizon
+        self.clock = clock
+        self._ring: Deque[_Entry] = deque()
+        self._by_link: Dict[str, _Entry] = {}
+        self.topics: Dict[str, TopicStats] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def __contains__(self, link: str) -> bool:
+        return link in self._by_link
+
+    def _cutoff(self, now: Optional[datetime] = None) -> datetime:
+        return (now or self.clock()) - self.horizon
+
+    def add(self, articles: Iterable[Article], now: Optional[datetime] = None) -> int:
+        """Add live articles and return how many were new.
+
+        Already known links and articles older than the horizon are skipped.
+        """
+        cutoff = self._cutoff(now)
+        added = 0
+        with self._lock:
+            for article in articles:
+                if article.published < cutoff or article.link in self._by_link:
+                    continue
+                entry = _Entry(article)
+                if self._ring and article.published < self._ring[-1].article.published:
+                    # Rare late arrival: keep the ring ordered (O(n) for this article only)
+                    insort(self._ring, entry)
+                else:
+                    self._ring.append(entry)
+                self._by_link[article.link] = entry
+                added += 1
+        return added
+
+    def evict(self, now: Optional[datetime] = None) -> int:
+        """Drop articles older than the horizon and return how many were dropped."""
+        cutoff = self._cutoff(now)
+        evicted = 0
+        with self._lock:
+            while self._ring and self._ring[0].article.published < cutoff:
+                entry = self._ring.popleft()
+                del self._by_link[entry.article.link]
+                self._unassign(entry)
+                evicted += 1
+        return evicted
+
+    def _unassign(self, entry: _Entry) -> None:
+        if entry.topic is None:
+            return
+        stats = self.topics[entry.topic]
+        stats.count -= 1
+        _decrement(stats.publishers, entry.article.publisher)
+        _decrement(stats.categories, entry.article.category or 'Unknown')
+        _decrement(stats.published, entry.article.published)
+        if not stats.count:
+            del self.topics[entry.topic]
+        elif entry.article.published == stats.latest and entry.article.published not in stats.published:
+            # The topic's newest article left it: fall back to the newest remaining one
+            stats.latest = max(stats.published)
+        entry.topic = None
+
+    def assign(self, links: Iterable[str], topic: str) -> None:
+        """Assign the articles with ``links`` to ``topic``, updating aggregates."""
+        with self._lock:
+            stats = self.topics.setdefault(topic, TopicStats())
+            for link in links:
+                entry = self._by_link.get(link)
+                if entry is None or entry.topic == topic:
+                    continue
+                self._unassign(entry)
+                entry.topic = topic
+                article = entry.article
+                stats.count += 1
+                stats.publishers[article.publisher] += 1
+                stats.categories[article.category or 'Unknown'] += 1
+                stats.published[article.published] += 1
+                if stats.latest is None or article.published > stats.latest:
+                    stats.latest = article.published
+            if not stats.count:
+                del self.topics[topic]
+
+    def assign_clusters(self, clusters: Iterable[ArticleBatch]) -> List[Optional[str]]:
+        """Record the topics found by a clustering pass and return their IDs.
+
+        A topic is identified by the link of its earliest article, so topics
+        keep their identity across passes while that article is live.  Empty
+        clusters get no topic (``None``).
+        """
+        topics: List[Optional[str]] = []
+        with self._lock:
+            for cluster in clusters:
+                topic = cluster.link[int(np.argmin(cluster.published))] if len(cluster) else None
+                if topic is not None:
+                    self.assign(cluster.link, topic)
+                topics.append(topic)
+        return topics
+
+    def articles(self, category: Optional[str] = None) -> List[Article]:
+        """Live articles in publication order, optionally for one category."""
+        with self._lock:
+            return [
+                entry.article for entry in self._ring
+                if category is None or (entry.article.category or 'Unknown') == category
+            ]
+
+    def batch(self, category: Optional[str] = None) -> ArticleBatch:
+        """Live articles as a columnar batch."""
+        return ArticleBatch.from_articles(self.articles(category))
+
+    def score_topics(
+        self,
+        category: Optional[str] = None,
+        now: Optional[datetime] = None,
+        topics: Optional[Collection[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Score live topics from their aggregates, best first.
+
+        Uses the same weighting as :func:`~packages.news.score.score_clusters`
+        (70% publisher coverage, 30% recency, each normalised across the
+        topics scored), without touching individual articles.  ``topics``
+        restricts scoring, and hence the normalisation, to those topic IDs;
+        by default every live topic of ``category`` is scored.
+        """
+        now = now or self.clock()
+        with self._lock:
+            candidates = self.topics.items() if topics is None else (
+                (topic, self.topics[topic]) for topic in topics if topic in self.topics
+            )
+            scored_topics = [
+                (topic, float(stats.coverage), (now - stats.latest).total_seconds() / 3600.0)
+                for topic, stats in candidates
+                if category is None or category in stats.categories
+            ]
+        if not scored_topics:
+            return []
+        max_cov = max(cov for _topic, cov, _age in scored_topics) or 1.0
+        max_age = max(age for _topic, _cov, age in scored_topics) or 1.0
+        scored = [(topic, 0.7 * cov / max_cov + 0.3 * (1.0 - age / max_age)) for topic, cov, age in scored_topics]
+        scored.sort(key=lambda pair: pair[1], reverse=True)
+        return scored
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Benchmark the columnar transaction analytics.
+
+Generates a synthetic transaction history (1M rows by default, using
+:class:`~packages.banks.synthetic.SyntheticBankDataset`), loads it into a
+:class:`~packages.banks.analytics.TransactionFrame` and times each aggregate.
+A plain Python loop over the same rows is timed as a reference.  Run it with
+`python scripts/bench_analytics.py [--rows N]` from the repository root.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Make `packages` importable when run from the repository root (see run_pipeline.py)
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from packages.banks.analytics import TransactionFrame
+from packages.banks.synthetic import SyntheticBankDataset
+
+
+def _timed(label: str, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def _synthetic_rows(n: int, users: int, seed: int):
+    dataset = SyntheticBankDataset(users=users, accounts_per_user=2, transactions_per_account=max(1, n // (2 * users)), seed=seed)
+    return [
+        (tx['account_id'], tx['date'], tx['amount'], tx['description'])
+        for tx in dataset.iter_transactions()
+    ]
+
+
+def _python_spend_by_merchant(rows):
+    totals = {}
+    for _account, _date, amount, merchant in rows:
+        if amount < 0:
+            totals[merchant] = totals.get(merchant, 0) - round(amount * 100)
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='number of transactions (default: 1M)')
+    parser.add_argument('--users', type=int, default=100, help='number of synthetic users')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"Generating ~{args.rows:,} transactions...")
+    rows = _synthetic_rows(args.rows, args.users, args.seed)
+
+    frame = _timed('TransactionFrame.from_rows', TransactionFrame.from_rows, rows)
+    _timed('spend_by_day', frame.spend_by_day)
+    _timed('spend_by_merchant', frame.spend_by_merchant, limit=20)
+    _timed('monthly_totals', frame.monthly_totals)
+    _timed('running_balance', frame.running_balance)
+    _timed('python loop: spend by merchant', _python_spend_by_merchant, rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""Measure API tail latency while a large pipeline save is running.
+
+Serves the FastAPI app in‑process (``httpx.ASGITransport``, same event loop)
+against a temporary database and keeps ``--concurrency`` clients requesting
+database‑backed routes (``/news/daily``, ``/news/breaking``, ``/news/search``)
+in three phases:
+
+* ``idle``: no write in progress;
+* ``async save``: ``save_pipeline_output`` of ``--topics`` topics through
+  :class:`~packages.news.async_repo.AsyncNewsRepository` (writer thread, WAL);
+* ``blocking save``: the same save called directly on the event loop, as the
+  routes used to do.
+
+Latency percentiles of the first two phases should be close; the third shows
+the stall the async repository avoids.  Run it with
+`python scripts/bench_api_concurrency.py [--topics N]` from the repository root.
+"""
+
+import argparse
+import asyncio
+import importlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+# Make `packages` importable when run from the repository root (see run_pipeline.py)
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from packages.news import repo as news_repo
+
+
+ROUTES = ('/news/daily', '/news/breaking', '/news/search?q=story')
+
+
+def _topics(n: int, categories: List[str], word: str = 'story') -> Dict[str, List[Dict]]:
+    per_category = max(1, n // len(categories))
+    return {
+        category: [
+            {
+                'headline': f'{category} {word} {i}',
+                'summary': f'Summary of {category} {word} {i} with a few more words to index.',
+                'importance': (i % 997) / 997,
+                'published': '2024-01-01T12:00:00',
+                'sources': [f'Publisher {i % 50}'],
+                'links': [f'https://example.com/{category}/{i}'],
+            }
+            for i in range(per_category)
+        ]
+        for category in categories
+    }
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _report(label: str, latencies: List[float]) -> None:
+    ms = [value * 1000 for value in latencies]
+    print(
+        f"{label:<14} {len(ms):>6} req  p50 {statistics.median(ms):7.2f} ms  p95 {_percentile(ms, 0.95):8.2f} ms"
+        f"  p99 {_percentile(ms, 0.99):8.2f} ms  max {max(ms):8.2f} ms"
+    )
+
+
+async def _load(client, stop: asyncio.Event, concurrency: int, minimum: int) -> List[float]:
+    """Request ROUTES round‑robin from ``concurrency`` clients until ``stop`` is set."""
+    latencies: List[float] = []
+
+    async def worker(offset: int) -> None:
+        i = offset
+        while not stop.is_set() or len(latencies) < minimum:
+            start = time.perf_counter()
+            response = await client.get(ROUTES[i % len(ROUTES)])
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+            i += 1
+
+    await asyncio.gather(*(worker(k) for k in range(concurrency)))
+    return latencies
+
+
+async def _phase(client, concurrency: int, minimum: int, background: Callable[[], Awaitable[None]]) -> List[float]:
+    stop = asyncio.Event()
+
+    async def run_background() -> None:
+        # Let the clients start first, so the write overlaps with requests
+        await asyncio.sleep(0.05)
+        try:
+            await background()
+        finally:
+            stop.set()
+
+    latencies, _ = await asyncio.gather(_load(client, stop, concurrency, minimum), run_background())
+    return latencies
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_PATH'] = os.path.join(tmp, 'news.db')
+        os.environ['BANK_DATABASE_PATH'] = os.path.join(tmp, 'bank.db')
+        os.environ['NEWS_IDF_PATH'] = os.path.join(tmp, 'news_idf.npz')
+        os.environ['NEWS_VECTOR_PATH'] = os.path.join(tmp, 'news_vectors')
+        os.environ['NEWS_SNAPSHOT_PATH'] = os.path.join(tmp, 'news_snapshots')
+        # The API uses package‑relative imports (see benchmark.py)
+        if str(repo_root.parent) not in sys.path:
+            sys.path.insert(0, str(repo_root.parent))
+        main = importlib.import_module(f'{repo_root.name}.apps.api.main')
+        db_path = os.environ['DATABASE_PATH']
+        # Topics in the database but no snapshot, so routes query SQLite
+        news_repo.save_pipeline_output(_topics(len(main.CATEGORIES) * 10, main.CATEGORIES), db_path)
+        # Different words, so searches measure contention rather than more matches
+        big = _topics(args.topics, main.CATEGORIES, word='bulk')
+
+        async with main.app.router.lifespan_context(main.app):
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                news_db = main.app.state.news_db
+
+                async def idle() -> None:
+                    await asyncio.sleep(args.idle_seconds)
+
+                async def async_save() -> None:
+                    start = time.perf_counter()
+                    await news_db.save_pipeline_output(big)
+                    print(f"async save of {args.topics:,} topics took {time.perf_counter() - start:.2f} s", file=sys.stderr)
+
+                async def blocking_save() -> None:
+                    start = time.perf_counter()
+                    news_repo.save_pipeline_output(big, db_path)
+                    print(f"blocking save of {args.topics:,} topics took {time.perf_counter() - start:.2f} s", file=sys.stderr)
+
+                phases = [('idle', idle), ('async save', async_save)]
+                if not args.skip_blocking:
+                    phases.append(('blocking save', blocking_save))
+                for label, background in phases:
+                    _report(label, await _phase(client, args.concurrency, args.concurrency, background))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--topics', type=int, default=20_000, help='topics written by the large save (default: 20000)')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent clients (default: 8)')
+    parser.add_argument('--idle-seconds', type=float, default=2.0, help='length of the idle phase')
+    parser.add_argument('--skip-blocking', action='store_true', help='skip the blocking-save phase')
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
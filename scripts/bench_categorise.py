@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""Benchmark the transaction categoriser.
+
+Generates a stream of realistic, heavily repeating transaction descriptions
+(merchant names decorated with card references, store numbers and dates) and
+measures how many transactions per minute
+:class:`~packages.banks.categorise.Categoriser` classifies on one core, both
+with a cold memo (every description new) and in steady state.  Run it with
+`python scripts/bench_categorise.py [--transactions N]` from the repository root.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Make `packages` importable when run from the repository root (see run_pipeline.py)
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from packages.banks.categorise import DEFAULT_RULES, Categoriser
+
+
+_TEMPLATES = [
+    "CARD PAYMENT TO {m} {n} ON {d:02d}/{mo:02d}",
+    "{m} {n} AMSTERDAM",
+    "POS {m} REF {n}",
+    "{m}",
+    "SEPA iDEAL {m} {n}",
+]
+
+
+def _descriptions(n: int, distinct: int, seed: int):
+    rng = random.Random(seed)
+    merchants = [kw.upper() for aliases in DEFAULT_RULES.values() for kw in aliases]
+    merchants += [f"UNKNOWN SHOP {i}" for i in range(40)]
+    pool = [
+        rng.choice(_TEMPLATES).format(m=rng.choice(merchants), n=rng.randint(100, 9999), d=rng.randint(1, 28), mo=rng.randint(1, 12))
+        for _ in range(distinct)
+    ]
+    # Zipf‑like popularity: a few descriptions dominate, as in real histories
+    weights = [1.0 / (rank + 1) for rank in range(distinct)]
+    return rng.choices(pool, weights=weights, k=n), pool
+
+
+def _report(label: str, count: int, elapsed: float) -> None:
+    print(f"{label:<28} {count:>10,} tx in {elapsed:6.2f} s  ->  {count / elapsed * 60 / 1e6:7.1f} M tx/min")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--transactions', type=int, default=2_000_000, help='number of transactions (default: 2M)')
+    parser.add_argument('--distinct', type=int, default=50_000, help='number of distinct descriptions')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    stream, pool = _descriptions(args.transactions, args.distinct, args.seed)
+
+    categoriser = Categoriser()
+    start = time.perf_counter()
+    categoriser.categorise_batch(pool)
+    _report('cold (distinct only)', len(pool), time.perf_counter() - start)
+
+    categoriser = Categoriser()
+    start = time.perf_counter()
+    categories = categoriser.categorise_batch(stream)
+    _report('stream incl. warm-up', len(stream), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    categoriser.categorise_batch(stream)
+    _report('steady state', len(stream), time.perf_counter() - start)
+
+    other = sum(1 for c in categories if c == categoriser.default)
+    print(f"uncategorised: {other / len(categories):.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Benchmark per‑user digests against per‑user database queries.
+
+Stores a synthetic set of topics in a temporary news database, simulates
+``--users`` subscribers with random category subsets, importance thresholds
+and digest sizes, and serves one digest per user twice: naively, with one
+:func:`~packages.news.repo.fetch_top_topics` query per subscribed category
+(timed on a sample and extrapolated), and through
+:class:`~packages.news.subscriptions.DigestService`, which shares the
+per‑category results between all users.  Run it with
+`python scripts/bench_subscriptions.py [--users N]` from the repository root.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Make `packages` importable when run from the repository root (see run_pipeline.py)
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from packages.news import repo as news_repo
+from packages.news.subscriptions import CategoryTopicCache, DigestService, SubscriptionProfile, merge_topics
+
+
+# Same categories as the API (apps/api/main.py)
+CATEGORIES = ["Greece", "Netherlands", "Data Science", "AI", "Finance"]
+
+
+def _topics(per_category: int, seed: int):
+    rng = random.Random(seed)
+    now = datetime(2024, 1, 1)
+    results = {}
+    for category in CATEGORIES:
+        results[category] = [
+            {
+                'headline': f'{category} story {i}',
+                'summary': f'Summary of {category} story {i}.',
+                'importance': round(rng.random(), 3),
+                'published': (now - timedelta(minutes=rng.randint(0, 24 * 60))).isoformat(),
+                'sources': [f'Publisher {rng.randint(1, 20)}'],
+                'links': [f'https://example.com/{category}/{i}'],
+            }
+            for i in range(per_category)
+        ]
+    return results
+
+
+def _profiles(n: int, seed: int):
+    rng = random.Random(seed)
+    for i in range(n):
+        categories = tuple(rng.sample(CATEGORIES, rng.randint(1, len(CATEGORIES))))
+        yield SubscriptionProfile(f'user-{i}', categories, rng.choice((0.0, 0.25, 0.5)), rng.choice((5, 10, 20)))
+
+
+def _naive_digest(profile: SubscriptionProfile, db_path: str):
+    lists = [
+        [{**topic, 'category': category} for topic in news_repo.fetch_top_topics(category, db_path, profile.limit)]
+        for category in profile.categories
+    ]
+    return merge_topics(lists, profile.limit, profile.min_importance)
+
+
+def _report(label: str, users: int, elapsed: float) -> None:
+    print(f"{label:<34} {users:>9,} users in {elapsed:7.2f} s  ->  {users / elapsed:>12,.0f} digests/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=100_000, help='number of simulated users (default: 100k)')
+    parser.add_argument('--topics', type=int, default=200, help='stored topics per category')
+    parser.add_argument('--sample', type=int, default=2_000, help='users timed for the naive baseline')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'news.db')
+        news_repo.init_db(db_path)
+        news_repo.save_pipeline_output(_topics(args.topics, args.seed), db_path)
+        profiles = list(_profiles(args.users, args.seed))
+
+        sample = profiles[:min(args.sample, len(profiles))]
+        start = time.perf_counter()
+        for profile in sample:
+            _naive_digest(profile, db_path)
+        naive = (time.perf_counter() - start) / len(sample) * len(profiles)
+        _report('per-user queries (extrapolated)', len(profiles), naive)
+
+        cache = CategoryTopicCache(db_path)
+        service = DigestService(cache, CATEGORIES)
+        start = time.perf_counter()
+        for profile in profiles:
+            service.digest(profile)
+        shared = time.perf_counter() - start
+        _report('shared per-category cache', len(profiles), shared)
+
+        # Same users after the pipeline stored new topics: one reload per category
+        cache.invalidate()
+        start = time.perf_counter()
+        for profile in profiles:
+            service.digest(profile)
+        _report('after invalidation', len(profiles), time.perf_counter() - start)
+
+        distinct = len({profile.signature for profile in profiles})
+        print(f"category loads: {cache.loads}  distinct profiles: {distinct:,}  speed-up: {naive / shared:,.0f}x")
+
+        # Digests served from the cache match the per-user queries (ties may be ordered differently)
+        for profile in sample[:200]:
+            expected = _naive_digest(profile, db_path)
+            assert [t['importance'] for t in service.digest(profile)] == [t['importance'] for t in expected], profile
+
+
+if __name__ == '__main__':
+    main()
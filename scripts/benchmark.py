@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+"""Benchmark suite for the news pipeline and API with regression gates.
+
+Times every pipeline stage (RSS parsing, classification, clustering, scoring,
+summarisation), the SQLite repository (including full‑text search) and the FastAPI routes on synthetic
+corpora of several sizes (see :mod:`packages.news.synthetic`), recording the
+median and best wall time and the peak traced memory of each.  Results are
+saved as JSON and can be compared against a stored baseline::
+
+    python scripts/benchmark.py run --sizes 1000,5000 --output baseline.json
+    # ... change code ...
+    python scripts/benchmark.py run --sizes 1000,5000 --output current.json
+    python scripts/benchmark.py compare baseline.json current.json --threshold 0.2
+
+``compare`` exits with status 1 when any stage is slower (or uses more memory)
+than the baseline by more than the threshold, so it can gate CI.
+"""
+
+import argparse
+import copy
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Make `packages` importable when run from the repository root (see run_pipeline.py)
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from packages.news.classify import classify_articles
+from packages.news.cluster import cluster_articles, cluster_articles_with_vectors
+from packages.news.features import HashedTfidfVectorizer
+from packages.news.ingest import _parse_rss, load_articles
+from packages.news.score import score_clusters
+from packages.news.summarize import summarize_cluster, summarize_clusters
+from packages.news.synthetic import generate_articles
+from packages.news import repo as news_repo
+
+
+# Differences below these floors are treated as noise by ``compare``.
+MIN_SECONDS = 0.002
+MIN_KIB = 256.0
+
+
+def measure(func: Callable[[], object], setup: Optional[Callable[[], object]] = None, repeat: int = 5) -> Dict[str, float]:
+    """Time ``func`` ``repeat`` times and trace its peak memory once.
+
+    ``setup`` (if given) runs before each call, outside the measurement, and
+    its return value is passed to ``func``.
+    """
+    times: List[float] = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        func(arg) if setup else func()
+        times.append(time.perf_counter() - start)
+    arg = setup() if setup else None
+    gc.collect()
+    tracemalloc.start()
+    func(arg) if setup else func()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'median_s': statistics.median(times),
+        'min_s': min(times),
+        'peak_kib': peak / 1024.0,
+        'repeat': repeat,
+    }
+
+
+def _rss(articles) -> bytes:
+    items = ''.join(
+        "<item><title>{}</title><link>{}</link><description>{}</description><pubDate>{}</pubDate></item>".format(
+            _escape(a.title), _escape(a.link), _escape(a.description), a.published.strftime('%a, %d %b %Y %H:%M:%S +0000')
+        )
+        for a in articles
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>bench</title>{items}</channel></rss>'.encode('utf-8')
+
+
+def _escape(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _by_category(articles):
+    groups: Dict[str, list] = {}
+    for article in articles:
+        groups.setdefault(article.category, []).append(article)
+    return groups
+
+
+def _topics(clusters_by_category) -> Dict[str, List[Dict]]:
+    results: Dict[str, List[Dict]] = {}
+    for category, clusters in clusters_by_category.items():
+        topics = []
+        for cluster in clusters:
+            best = max(cluster, key=lambda a: a.published)
+            topics.append({
+                'headline': best.title,
+                'summary': best.description,
+                'importance': 0.5,
+                'published': best.published.isoformat(),
+                'sources': sorted({a.publisher for a in cluster}),
+                'links': [a.link for a in cluster],
+            })
+        results[category] = topics
+    return results
+
+
+def bench_pipeline(size: int, repeat: int, seed: int) -> Dict[str, Dict[str, float]]:
+    """Benchmark each pipeline stage and the repository on ``size`` articles."""
+    articles = list(generate_articles(size, seed=seed, uncategorised_rate=1.0))
+    results: Dict[str, Dict[str, float]] = {}
+
+    rss = _rss(articles)
+    results['ingest._parse_rss'] = measure(lambda: _parse_rss(rss, 'Finance'), repeat=repeat)
+    results['classify_articles'] = measure(classify_articles, setup=lambda: copy.deepcopy(articles), repeat=repeat)
+
+    classify_articles(articles)
+    groups = _by_category(articles)
+    results['cluster_articles'] = measure(lambda: [cluster_articles(g) for g in groups.values()], repeat=repeat)
+    vectorizer = HashedTfidfVectorizer()
+    results['cluster_articles.hashed'] = measure(
+        lambda: [cluster_articles(g, vectorizer=vectorizer) for g in groups.values()], repeat=repeat
+    )
+
+    clusters = {c: cluster_articles(g) for c, g in groups.items()}
+    results['score_clusters'] = measure(lambda: [score_clusters(cl) for cl in clusters.values()], repeat=repeat)
+    results['summarize_cluster'] = measure(
+        lambda: [summarize_cluster(cluster) for cl in clusters.values() for cluster in cl], repeat=repeat
+    )
+    with_vectors = [cluster_articles_with_vectors(g) for g in groups.values()]
+    results['summarize_clusters'] = measure(
+        lambda: [summarize_clusters(cl, vectors, vectors.transform) for cl, vectors in with_vectors], repeat=repeat
+    )
+
+    topics = _topics(clusters)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Each save goes to a fresh database so that runs are comparable
+        counter = iter(range(10 ** 9))
+        results['repo.save_pipeline_output'] = measure(
+            lambda path: news_repo.save_pipeline_output(topics, path),
+            setup=lambda: os.path.join(tmp, f'save-{next(counter)}.db'),
+            repeat=repeat,
+        )
+        db_path = os.path.join(tmp, 'read.db')
+        news_repo.save_pipeline_output(topics, db_path)
+        categories = list(topics)
+        results['repo.fetch_daily_digest'] = measure(lambda: news_repo.fetch_daily_digest(db_path, categories), repeat=repeat)
+        results['repo.search_topics'] = measure(lambda: news_repo.search_topics(db_path, 'interest rates'), repeat=repeat)
+    return {f'{name}[n={size}]': {**stats, 'stage': name, 'size': size} for name, stats in results.items()}
+
+
+def bench_fixed(repeat: int) -> Dict[str, Dict[str, float]]:
+    """Benchmark size‑independent entry points: sample loading and API routes."""
+    results: Dict[str, Dict[str, float]] = {
+        'ingest.load_articles': measure(lambda: load_articles(use_sample=True), repeat=repeat),
+    }
+    try:
+        from fastapi.testclient import TestClient
+    except Exception as exc:  # fastapi/httpx missing
+        print(f"Skipping API benchmarks: {exc}", file=sys.stderr)
+        return {name: {**stats, 'stage': name, 'size': 0} for name, stats in results.items()}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_PATH'] = os.path.join(tmp, 'news.db')
+        os.environ['BANK_DATABASE_PATH'] = os.path.join(tmp, 'bank.db')
+        os.environ['NEWS_IDF_PATH'] = os.path.join(tmp, 'news_idf.npz')
+        os.environ['NEWS_VECTOR_PATH'] = os.path.join(tmp, 'news_vectors')
+        os.environ['NEWS_SNAPSHOT_PATH'] = os.path.join(tmp, 'news_snapshots')
+        # The API uses package‑relative imports, so import it through the
+        # repository's parent directory
+        if str(repo_root.parent) not in sys.path:
+            sys.path.insert(0, str(repo_root.parent))
+        main = importlib.import_module(f'{repo_root.name}.apps.api.main')
+        with TestClient(main.app) as client:
+            client.get('/news/daily')  # populate the database once
+            for route in ('/news/daily', '/news/breaking', '/news/search?q=bank', '/banks/balances', '/banks/transactions/acc-001'):
+                client.get(route)
+                results[f'GET {route}'] = measure(lambda: client.get(route).raise_for_status(), repeat=max(repeat, 20))
+            results['POST /news/update'] = measure(lambda: client.post('/news/update').raise_for_status(), repeat=repeat)
+    return {name: {**stats, 'stage': name, 'size': 0} for name, stats in results.items()}
+
+
+def run(args: argparse.Namespace) -> int:
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    results: Dict[str, Dict[str, float]] = {}
+    results.update(bench_fixed(args.repeat))
+    for size in sizes:
+        print(f"Benchmarking pipeline stages at n={size:,}...", file=sys.stderr)
+        results.update(bench_pipeline(size, args.repeat, args.seed))
+    report = {
+        'meta': {
+            'created': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    _print_results(results)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+        print(f"Saved results to {args.output}", file=sys.stderr)
+    if args.compare:
+        return compare_reports(_load(args.compare), report, args.threshold, args.memory_threshold)
+    return 0
+
+
+def _print_results(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'benchmark':<44} {'median ms':>10} {'min ms':>10} {'peak KiB':>10}")
+    for name, stats in sorted(results.items()):
+        print(f"{name:<44} {stats['median_s'] * 1000:10.2f} {stats['min_s'] * 1000:10.2f} {stats['peak_kib']:10.0f}")
+
+
+def _load(path: str) -> Dict:
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def compare_reports(baseline: Dict, current: Dict, threshold: float, memory_threshold: float) -> int:
+    """Print a comparison and return 1 if any benchmark regressed, else 0."""
+    regressions = 0
+    print(f"{'benchmark':<44} {'base ms':>10} {'now ms':>10} {'time':>8} {'memory':>8}")
+    for name, base in sorted(baseline['results'].items()):
+        now = current['results'].get(name)
+        if now is None:
+            print(f"{name:<44} {'missing from current run':>38}")
+            continue
+        time_ratio = now['median_s'] / base['median_s'] if base['median_s'] else 1.0
+        mem_ratio = now['peak_kib'] / base['peak_kib'] if base['peak_kib'] else 1.0
+        slow = time_ratio > 1 + threshold and now['median_s'] - base['median_s'] > MIN_SECONDS
+        heavy = mem_ratio > 1 + memory_threshold and now['peak_kib'] - base['peak_kib'] > MIN_KIB
+        flag = '  REGRESSION' if slow or heavy else ''
+        regressions += bool(flag)
+        print(
+            f"{name:<44} {base['median_s'] * 1000:10.2f} {now['median_s'] * 1000:10.2f} "
+            f"{time_ratio - 1:+8.0%} {mem_ratio - 1:+8.0%}{flag}"
+        )
+    if regressions:
+        print(f"{regressions} benchmark(s) regressed beyond the threshold", file=sys.stderr)
+        return 1
+    print("No regressions", file=sys.stderr)
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--sizes', default='1000,5000', help='comma-separated corpus sizes (default: 1000,5000)')
+    run_parser.add_argument('--repeat', type=int, default=5, help='timed repetitions per benchmark')
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--output', help='write results to this JSON file')
+    run_parser.add_argument('--compare', metavar='BASELINE', help='compare against a baseline after running')
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument('--threshold', type=float, default=0.2, help='allowed relative slowdown (default: 0.2)')
+        sub.add_argument('--memory-threshold', type=float, default=0.2, help='allowed relative memory growth (default: 0.2)')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        sys.exit(run(args))
+    sys.exit(compare_reports(_load(args.baseline), _load(args.current), args.threshold, args.memory_threshold))
+
+
+if __name__ == '__main__':
+    main()
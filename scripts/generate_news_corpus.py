@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Generate a synthetic news corpus as JSON Lines.
+
+Expands the built‑in sample articles into a corpus of any size with
+controllable duplicate rate, topic bursts, publisher count and category mix
+(see :mod:`packages.news.synthetic`).  Example::
+
+    python scripts/generate_news_corpus.py --articles 100000 --out corpus.jsonl
+
+Writes to stdout when ``--out`` is ``-`` (the default).
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Make `packages` importable when run from the repository root (see run_pipeline.py)
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from packages.news.jsonl import write_articles_jsonl
+from packages.news.synthetic import generate_articles
+
+
+def _category_mix(value: str):
+    """Parse ``"AI=2,Finance=1"`` into a mapping."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1.0)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=10_000, help='number of articles (default: 10000)')
+    parser.add_argument('--out', default='-', help="output JSONL path, or '-' for stdout")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--duplicate-rate', type=float, default=0.3)
+    parser.add_argument('--burst-rate', type=float, default=0.02)
+    parser.add_argument('--burst-size', type=int, default=20)
+    parser.add_argument('--publishers', type=int, default=200)
+    parser.add_argument('--category-mix', type=_category_mix, default=None, help='e.g. "AI=2,Finance=1,Greece=0.5"')
+    parser.add_argument('--uncategorised-rate', type=float, default=0.0)
+    parser.add_argument('--hours', type=float, default=24.0, help='time span covered by the corpus')
+    parser.add_argument('--end', type=datetime.fromisoformat, default=None, help='ISO timestamp of the last article (default: now)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = write_articles_jsonl(
+        generate_articles(
+            args.articles,
+            seed=args.seed,
+            duplicate_rate=args.duplicate_rate,
+            burst_rate=args.burst_rate,
+            burst_size=args.burst_size,
+            publishers=args.publishers,
+            category_mix=args.category_mix,
+            uncategorised_rate=args.uncategorised_rate,
+            hours=args.hours,
+            end=args.end,
+        ),
+        args.out,
+    )
+    print(f"Wrote {count:,} articles in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
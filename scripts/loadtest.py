@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+"""Load-test the API with concurrent virtual users and report latency per route.
+
+Virtual users, driven by asyncio, run a scenario against the FastAPI app
+in one of three ways:
+
+* in process (default): through ``httpx.ASGITransport`` with the app's
+  lifespan, against a temporary data directory.  Client and app share one
+  event loop, so anything that blocks the loop shows up directly;
+* ``--uvicorn``: a local uvicorn server started in a subprocess with the same
+  temporary data directory;
+* ``--url``: an already running server.
+
+Scenarios are weighted request mixes:
+
+* ``dashboard``: users poll the dashboard routes (daily digest, breaking news,
+  personal digest, balances, monthly totals) with a think time between polls;
+* ``update-storm``: news readers while some users keep triggering
+  ``POST /news/update``;
+* ``bank-fanout``: balances fanned out over several providers, transactions,
+  analytics and the occasional ``POST /banks/sync``.
+
+Concurrency follows ``--ramp`` (e.g. ``1,8,32``): each step runs for
+``--step-seconds`` with that many users.  For every step and route the report
+shows requests, errors, throughput and p50/p95/p99/max latency; ``--histogram``
+adds a latency histogram per route and ``--json`` saves everything, so runs
+before and after a caching or async change can be compared.  Run it with
+`python scripts/loadtest.py [--scenario NAME] [--ramp 1,8,32]` from the
+repository root.
+"""
+
+import argparse
+import asyncio
+import bisect
+import importlib
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+# Make `packages` importable when run from the repository root (see run_pipeline.py)
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+
+# (method, path, weight); ``{account}`` is replaced by a random account ID
+SCENARIOS: Dict[str, Dict] = {
+    'dashboard': {
+        'think': 0.5,
+        'requests': [
+            ('GET', '/news/daily', 3),
+            ('GET', '/news/breaking', 2),
+            ('GET', '/news/digest', 2),
+            ('GET', '/banks/balances', 2),
+            ('GET', '/banks/analytics/monthly', 1),
+        ],
+    },
+    'update-storm': {
+        'think': 0.0,
+        'requests': [
+            ('POST', '/news/update', 1),
+            ('GET', '/news/daily', 4),
+            ('GET', '/news/breaking', 2),
+            ('GET', '/news/digest', 2),
+            ('GET', '/news/search?q=bank', 2),
+        ],
+    },
+    'bank-fanout': {
+        'think': 0.0,
+        'requests': [
+            ('GET', '/banks/balances', 4),
+            ('GET', '/banks/transactions/{account}', 3),
+            ('GET', '/banks/analytics/spend-by-category', 2),
+            ('GET', '/banks/analytics/monthly', 1),
+            ('POST', '/banks/sync', 1),
+        ],
+    },
+}
+
+# Upper bucket edges of the latency histogram in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf'))
+
+# Providers enabled in process and for --uvicorn, so balances fan out
+DEFAULT_BANK_PROVIDERS = 'demo,synthetic'
+
+
+class RouteStats:
+    """Latencies, errors and a latency histogram of one route."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.buckets = [0] * len(BUCKETS_MS)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        if not ok:
+            self.errors += 1
+            return
+        self.latencies.append(seconds)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+
+    def summary(self, seconds: float) -> Dict:
+        """Counts, throughput and latencies in ms (None without successful requests)."""
+        ms = lambda value: None if value is None else round(value * 1000, 3)  # noqa: E731
+        return {
+            'requests': len(self.latencies) + self.errors,
+            'errors': self.errors,
+            'throughput': round(len(self.latencies) / seconds, 2) if seconds else 0.0,
+            'p50_ms': ms(self.percentile(0.50)),
+            'p95_ms': ms(self.percentile(0.95)),
+            'p99_ms': ms(self.percentile(0.99)),
+            'max_ms': ms(max(self.latencies, default=None)),
+            'histogram': {_bucket_label(i): count for i, count in enumerate(self.buckets)},
+        }
+
+
+def _bucket_label(index: int) -> str:
+    upper = BUCKETS_MS[index]
+    return f'>{BUCKETS_MS[index - 1]:g}ms' if upper == float('inf') else f'<={upper:g}ms'
+
+
+async def _user(client, scenario: Dict, accounts: Sequence[str], rng: random.Random, deadline: float,
+                stats: Dict[str, RouteStats]) -> None:
+    """Send requests of the scenario's mix until ``deadline``."""
+    import httpx
+
+    requests = scenario['requests']
+    weights = [weight for _, _, weight in requests]
+    while time.perf_counter() < deadline:
+        method, template, _ = rng.choices(requests, weights)[0]
+        path = template.format(account=rng.choice(accounts)) if '{account}' in template else template
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        stats[f'{method} {template}'].record(time.perf_counter() - start, ok)
+        if scenario['think']:
+            # Jitter, so that polling users do not synchronise
+            await asyncio.sleep(scenario['think'] * rng.uniform(0.5, 1.5))
+
+
+async def _step(client, scenario: Dict, accounts: Sequence[str], users: int, seconds: float, seed: int) -> Dict:
+    """Run ``users`` virtual users for ``seconds`` and summarise each route."""
+    stats = {f'{method} {template}': RouteStats() for method, template, _ in scenario['requests']}
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(
+        _user(client, scenario, accounts, random.Random(seed * 100_003 + k), deadline, stats) for k in range(users)
+    ))
+    # In‑flight requests finish after the deadline; count them in the step
+    elapsed = time.perf_counter() - start
+    total = RouteStats()
+    for route in stats.values():
+        total.latencies.extend(route.latencies)
+        total.errors += route.errors
+        total.buckets = [a + b for a, b in zip(total.buckets, route.buckets)]
+    return {
+        'users': users,
+        'seconds': round(elapsed, 3),
+        'routes': {label: route.summary(elapsed) for label, route in stats.items()},
+        'total': total.summary(elapsed),
+    }
+
+
+def _environment(tmp: str, overrides: Sequence[str]) -> Dict[str, str]:
+    """Data paths inside ``tmp`` plus ``KEY=VALUE`` overrides."""
+    env = {
+        'DATABASE_PATH': os.path.join(tmp, 'news.db'),
+        'BANK_DATABASE_PATH': os.path.join(tmp, 'bank.db'),
+        'NEWS_IDF_PATH': os.path.join(tmp, 'news_idf.npz'),
+        'NEWS_VECTOR_PATH': os.path.join(tmp, 'news_vectors'),
+        'NEWS_SNAPSHOT_PATH': os.path.join(tmp, 'news_snapshots'),
+        'BANK_PROVIDERS': DEFAULT_BANK_PROVIDERS,
+    }
+    for item in overrides:
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise SystemExit(f"--env expects KEY=VALUE, got {item!r}")
+        env[key] = value
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def _client(args: argparse.Namespace) -> AsyncIterator:
+    """An httpx client for the selected target."""
+    import httpx
+
+    timeout = httpx.Timeout(args.timeout)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+            yield client
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _environment(tmp, args.env)
+        if not args.uvicorn:
+            os.environ.update(env)
+            # The API uses package‑relative imports (see benchmark.py)
+            if str(repo_root.parent) not in sys.path:
+                sys.path.insert(0, str(repo_root.parent))
+            main = importlib.import_module(f'{repo_root.name}.apps.api.main')
+            async with main.app.router.lifespan_context(main.app):
+                transport = httpx.ASGITransport(app=main.app)
+                async with httpx.AsyncClient(transport=transport, base_url='http://test', timeout=timeout) as client:
+                    yield client
+            return
+
+        port = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', f'{repo_root.name}.apps.api.main:app',
+             '--port', str(port), '--log-level', 'warning'],
+            cwd=str(repo_root.parent),
+            env={**os.environ, **env},
+        )
+        try:
+            async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}', timeout=timeout) as client:
+                await _wait_until_up(client, server)
+                yield client
+        finally:
+            server.terminate()
+            server.wait()
+
+
+async def _wait_until_up(client, server: subprocess.Popen, attempts: int = 100) -> None:
+    import httpx
+
+    for _ in range(attempts):
+        if server.poll() is not None:
+            raise SystemExit(f"uvicorn exited with status {server.returncode}")
+        try:
+            await client.get('/openapi.json')
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise SystemExit("uvicorn did not start")
+
+
+async def _warm_up(client, scenario: Dict) -> List[str]:
+    """Request every GET route once and return the account IDs to use.
+
+    The first news request runs the pipeline on an empty database and the
+    first transactions request syncs the ledger; neither should be measured.
+    """
+    response = await client.get('/banks/balances')
+    accounts = [item['account_id'] for item in response.json()] if response.status_code < 400 else []
+    accounts = accounts or ['acc-001']
+    for method, template, _ in scenario['requests']:
+        if method == 'GET':
+            await client.get(template.format(account=accounts[0]) if '{account}' in template else template)
+    return accounts
+
+
+def _report(step: Dict, histogram: bool) -> None:
+    print(f"\n{step['users']} users, {step['seconds']:.1f} s")
+    print(f"{'route':<42} {'req':>7} {'err':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for label, row in [*step['routes'].items(), ('total', step['total'])]:
+        latencies = ' '.join(
+            f"{'-' if row[key] is None else format(row[key], '.2f'):>9}" for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')
+        )
+        print(f"{label:<42} {row['requests']:>7} {row['errors']:>5} {row['throughput']:>9.1f} {latencies}")
+    if not histogram:
+        return
+    for label, row in step['routes'].items():
+        counts = row['histogram']
+        peak = max(counts.values()) or 1
+        print(f"\n  {label}")
+        for bucket, count in counts.items():
+            if count:
+                print(f"  {bucket:>10} {count:>7} {'#' * max(1, round(40 * count / peak))}")
+
+
+def _parse_ramp(value: str) -> Tuple[int, ...]:
+    try:
+        ramp = tuple(int(part) for part in value.split(',') if part.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ramp {value!r}")
+    if not ramp or min(ramp) < 1:
+        raise argparse.ArgumentTypeError("ramp steps must be positive integers")
+    return ramp
+
+
+async def run(args: argparse.Namespace) -> List[Dict]:
+    scenario = SCENARIOS[args.scenario]
+    if args.think is not None:
+        scenario = {**scenario, 'think': args.think}
+    steps: List[Dict] = []
+    async with _client(args) as client:
+        accounts = await _warm_up(client, scenario)
+        for index, users in enumerate(args.ramp):
+            step = await _step(client, scenario, accounts, users, args.step_seconds, args.seed + index)
+            _report(step, args.histogram)
+            steps.append(step)
+    return steps
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='dashboard', help='request mix (default: dashboard)')
+    parser.add_argument('--ramp', type=_parse_ramp, default=(1, 8, 32), help='comma-separated users per step (default: 1,8,32)')
+    parser.add_argument('--step-seconds', type=float, default=5.0, help='duration of each ramp step (default: 5)')
+    parser.add_argument('--think', type=float, help="mean pause between a user's requests, overriding the scenario's")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--uvicorn', action='store_true', help='start a local uvicorn server instead of testing in process')
+    target.add_argument('--url', help='test a running server, e.g. http://127.0.0.1:8000')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help='environment for the in-process app or uvicorn, e.g. NEWS_READ_ONLY=1 (repeatable)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='request timeout in seconds (default: 30)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--histogram', action='store_true', help='print a latency histogram per route')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON')
+    args = parser.parse_args(argv)
+
+    steps = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump({'scenario': args.scenario, 'steps': steps}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""Long‑running news worker with a sliding article window.
+
+Polls the feeds in ``RSS_SOURCES`` with :class:`~packages.news.scheduler.FeedScheduler`,
+keeps the articles of the last ``--horizon-hours`` in an
+:class:`~packages.news.window.ArticleWindow` and re‑runs the pipeline over the
+live window whenever new items arrive, storing the topics in the news
+database and publishing a digest snapshot for the API (see
+:mod:`packages.news.snapshot`).  Between runs, expired articles are evicted
+on a timer.  Run it with `python scripts/news_worker.py` from the repository
+root; stop it with Ctrl‑C.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+# Make `packages` importable when run from the repository root (see run_pipeline.py)
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from packages.news.features import HashedTfidfVectorizer
+from packages.news.feedhealth import FeedHealthRegistry
+from packages.news.pipeline import run_pipeline
+from packages.news.scheduler import FeedScheduler
+from packages.news.vectorstore import VectorStore
+from packages.news.window import ArticleWindow
+
+
+logger = logging.getLogger('news_worker')
+
+
+async def _evict_periodically(window: ArticleWindow, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        # The pipeline uses the window from a worker thread; keep the loop free while waiting for it
+        evicted = await asyncio.to_thread(window.evict)
+        if evicted:
+            logger.info("Evicted %d expired articles; %d live", evicted, len(window))
+
+
+async def run(args: argparse.Namespace) -> None:
+    data_dir = repo_root / 'data'
+    vectorizer = HashedTfidfVectorizer.load(str(data_dir / 'news_idf.npz'))
+    vectors = VectorStore(str(data_dir / 'news_vectors'), vectorizer.n_features)
+    window = ArticleWindow(horizon=timedelta(hours=args.horizon_hours))
+
+    async def process(articles) -> None:
+        results = await asyncio.to_thread(
+            run_pipeline,
+            articles=articles,
+            store_to_db=True,
+            db_path=args.db,
+            vectorizer=vectorizer,
+            vector_store=vectors,
+            scope=args.scope,
+            window=window,
+            snapshot_dir=args.snapshot_dir or None,
+        )
+        logger.info("%d new articles, %d live, %d topics stored", len(articles), len(window), sum(map(len, results.values())))
+
+    health = FeedHealthRegistry.load(args.feed_health)
+    scheduler = FeedScheduler(process, max_concurrency=args.max_concurrency, health=health)
+    if not scheduler.feeds:
+        logger.warning("No feeds configured in RSS_SOURCES; nothing to poll")
+    evictor = asyncio.create_task(_evict_periodically(window, args.evict_interval))
+    if not vectorizer.owner:
+        logger.warning("Another process owns %s; IDF statistics are used read-only", vectorizer.path)
+    if not vectors.owner:
+        logger.warning("Another process owns %s; new vectors are not stored", vectors.directory)
+    if not health.owner:
+        logger.warning("Another process owns %s; feed health is used read-only", health.path)
+    try:
+        await scheduler.run()
+    finally:
+        evictor.cancel()
+        vectorizer.close()
+        vectors.close()
+        health.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--horizon-hours', type=float, default=24.0, help='size of the live window (default: 24)')
+    parser.add_argument('--db', default=str(repo_root / 'data' / 'news.db'), help='news database path')
+    parser.add_argument('--snapshot-dir', default=str(repo_root / 'data' / 'news_snapshots'),
+                        help="digest snapshot directory served by the API ('' to disable)")
+    parser.add_argument('--scope', choices=('category', 'global'), default='category', help='clustering scope')
+    parser.add_argument('--max-concurrency', type=int, default=8, help='maximum feeds fetched at once')
+    parser.add_argument('--feed-health', default=str(repo_root / 'data' / 'news_feed_health.json'),
+                        help='feed health file shared with the API (NEWS_FEED_HEALTH_PATH)')
+    parser.add_argument('--evict-interval', type=float, default=60.0, help='seconds between evictions')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
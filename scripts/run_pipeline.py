@@ -1,15 +1,39 @@
 #!/usr/bin/env python
-"""Run the news pipeline on sample data and print the results as JSON.
+"""Run the news pipeline on sample data or JSONL captures and print the results.
 
-This script is intended for demonstration and testing.  It loads the built‑in
-sample articles, runs the full pipeline and outputs the top topics per
-category.  You can run it with `python scripts/run_pipeline.py` from the
-repository root.
+Without arguments the script loads the built‑in sample articles, runs the full
+pipeline and prints the top topics per category as JSON.  You can run it with
+`python scripts/run_pipeline.py` from the repository root.
+
+For offline replays, articles are streamed from JSON Lines files (as written
+by :mod:`packages.news.jsonl` or ``scripts/generate_news_corpus.py``), or from
+stdin with ``-``, and topics are written as JSON Lines::
+
+    python scripts/run_pipeline.py --input capture.jsonl --output topics.jsonl
+    cat capture.jsonl | python scripts/run_pipeline.py --input - --profile --tracemalloc
+
+``--stages`` stops the pipeline early, e.g. ``classify,cluster`` writes the
+clusters without scoring or summarising them.  Categories are processed
+independently, serially or on a thread or process pool (``--executor``).
+``--profile`` runs every stage under cProfile and prints the hottest
+functions per stage (``--profile-dir`` also saves ``<stage>.prof`` files for
+``pstats`` or snakeviz); ``--tracemalloc`` reports the peak memory allocated
+by each stage.  Timings and reports go to stderr.
 """
 
+import argparse
+import cProfile
 import json
+import os
+import pstats
 import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 # Ensure the root of the repository (containing the `packages` directory) is
 # on the Python path.  This allows the script to import `packages.news` when
@@ -19,12 +43,248 @@ repo_root = Path(__file__).resolve().parents[1]
 if str(repo_root) not in sys.path:
     sys.path.insert(0, str(repo_root))
 
-from packages.news.pipeline import run_pipeline
+from packages.news.batch import ArticleBatch
+from packages.news.classify import classify_articles
+from packages.news.ingest import load_articles
+from packages.news.jsonl import read_articles_jsonl, write_topics_jsonl
+from packages.news.pipeline import cluster_category, run_pipeline, score_category, summarize_category
+
+
+STAGES = ('ingest', 'classify', 'cluster', 'score', 'summarize')
+
+# cProfile allows one active profiler per process on recent Pythons, so
+# profiled stages on the thread executor run one at a time
+_PROFILE_LOCK = threading.Lock()
+
+
+class StageRecorder:
+    """Time, profile and trace the pipeline stages run in one process.
+
+    Instances are plain data and picklable, so process workers return them
+    to the parent, which merges them with :meth:`merge`.
+    """
+
+    def __init__(self, profile: bool = False, trace: bool = False) -> None:
+        self.profile = profile
+        self.trace = trace
+        self.calls: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self.peak_bytes: Dict[str, int] = {}
+        # Raw cProfile statistics per stage, one entry per call
+        self.profiles: Dict[str, List[dict]] = {}
+
+    def run(self, stage: str, func: Callable, *args):
+        if self.profile:
+            with _PROFILE_LOCK:
+                return self._run(stage, func, args)
+        return self._run(stage, func, args)
+
+    def _run(self, stage: str, func: Callable, args: tuple):
+        profiler = cProfile.Profile() if self.profile else None
+        if self.trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            return func(*args)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + time.perf_counter() - start
+            self.calls[stage] = self.calls.get(stage, 0) + 1
+            if self.trace:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                self.peak_bytes[stage] = max(self.peak_bytes.get(stage, 0), peak)
+            if profiler is not None:
+                profiler.create_stats()
+                self.profiles.setdefault(stage, []).append(profiler.stats)
+
+    def merge(self, other: 'StageRecorder') -> None:
+        for stage, calls in other.calls.items():
+            self.calls[stage] = self.calls.get(stage, 0) + calls
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + other.seconds[stage]
+        for stage, peak in other.peak_bytes.items():
+            self.peak_bytes[stage] = max(self.peak_bytes.get(stage, 0), peak)
+        for stage, profiles in other.profiles.items():
+            self.profiles.setdefault(stage, []).extend(profiles)
+
+    def stats(self, stage: str) -> Optional[pstats.Stats]:
+        """Combined cProfile statistics of all calls of ``stage``."""
+        profiles = self.profiles.get(stage)
+        if not profiles:
+            return None
+        stats = pstats.Stats(_RawStats(profiles[0]))
+        for raw in profiles[1:]:
+            stats.add(_RawStats(raw))
+        return stats
+
+
+class _RawStats:
+    """Adapter giving ``pstats.Stats`` access to a raw statistics dictionary."""
+
+    def __init__(self, stats: dict) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def _run_category(
+    category: str, articles: ArticleBatch, stages: Sequence[str], profile: bool, trace: bool
+) -> Tuple[List[Dict], StageRecorder]:
+    """Run the selected per‑category stages and return the records to write."""
+    recorder = StageRecorder(profile, trace)
+    clusters, cluster_vectors = recorder.run('cluster', cluster_category, articles)
+    if 'score' not in stages:
+        return [{'size': len(cluster), 'links': list(cluster.link)} for cluster in clusters], recorder
+    scored = recorder.run('score', score_category, clusters, category)
+    if 'summarize' not in stages:
+        return [
+            {'importance': round(score, 3), 'size': len(cluster), 'links': list(cluster.link)}
+            for cluster, score in scored
+        ], recorder
+    return recorder.run('summarize', summarize_category, clusters, cluster_vectors, scored), recorder
+
+
+def _start_tracing() -> None:
+    tracemalloc.start()
+
+
+def _parse_stages(value: str) -> Tuple[str, ...]:
+    """Validate a comma‑separated stage list; ingest always runs."""
+    stages = tuple(dict.fromkeys(part.strip() for part in value.split(',') if part.strip()))
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+    # cluster, score and summarize each need the previous stage
+    dependent = [stage for stage in ('cluster', 'score', 'summarize') if stage in stages]
+    if dependent != ['cluster', 'score', 'summarize'][:len(dependent)]:
+        raise argparse.ArgumentTypeError("score needs cluster, and summarize needs score")
+    return ('ingest',) + tuple(stage for stage in STAGES[1:] if stage in stages)
+
+
+def _load(inputs: Sequence[str], recorder: StageRecorder) -> ArticleBatch:
+    if not inputs:
+        return recorder.run('ingest', lambda: ArticleBatch.from_articles(load_articles(use_sample=True)))
+    # Stream every file straight into the columnar batch
+    return recorder.run('ingest', lambda: ArticleBatch.from_articles(chain.from_iterable(map(read_articles_jsonl, inputs))))
+
+
+def _executor(kind: str, workers: Optional[int], trace: bool):
+    if kind == 'thread':
+        return ThreadPoolExecutor(max_workers=workers)
+    if kind == 'process':
+        return ProcessPoolExecutor(max_workers=workers, initializer=_start_tracing if trace else None)
+    return None
+
+
+def run(args: argparse.Namespace) -> Tuple[Dict[str, List[Dict]], StageRecorder]:
+    recorder = StageRecorder(args.profile, args.tracemalloc)
+    articles = _load(args.input, recorder)
+    if 'classify' in args.stages:
+        recorder.run('classify', classify_articles, articles)
+    groups = {
+        category or 'Unknown': batch for category, batch in articles.by_category().items()
+    }
+    if 'cluster' not in args.stages:
+        results = {
+            category: [{'title': a.title, 'link': a.link, 'published': a.published.isoformat(), 'publisher': a.publisher} for a in batch]
+            for category, batch in groups.items()
+        }
+        return results, recorder
+
+    executor = _executor(args.executor, args.workers, args.tracemalloc)
+    jobs = [(category, batch, args.stages, args.profile, args.tracemalloc) for category, batch in groups.items()]
+    if executor is None:
+        outputs = [_run_category(*job) for job in jobs]
+    else:
+        with executor:
+            outputs = list(executor.map(_run_category, *zip(*jobs)))
+    results: Dict[str, List[Dict]] = {}
+    for (category, *_rest), (records, worker) in zip(jobs, outputs):
+        results[category] = records
+        recorder.merge(worker)
+    return results, recorder
+
+
+def _report(recorder: StageRecorder, stages: Sequence[str], elapsed: float, args: argparse.Namespace) -> None:
+    err = sys.stderr
+    header = f"{'stage':<10} {'calls':>6} {'seconds':>9}"
+    if args.tracemalloc:
+        header += f" {'peak KiB':>11}"
+    print(header, file=err)
+    for stage in stages:
+        if stage not in recorder.calls:
+            continue
+        line = f"{stage:<10} {recorder.calls[stage]:>6} {recorder.seconds[stage]:>9.3f}"
+        if args.tracemalloc:
+            line += f" {recorder.peak_bytes.get(stage, 0) / 1024.0:>11,.1f}"
+        print(line, file=err)
+    print(f"{'total':<10} {'':>6} {elapsed:>9.3f}  (wall, executor={args.executor})", file=err)
+    if not args.profile:
+        return
+    if args.profile_dir:
+        os.makedirs(args.profile_dir, exist_ok=True)
+    for stage in stages:
+        stats = recorder.stats(stage)
+        if stats is None:
+            continue
+        print(f"\n=== cProfile: {stage} ===", file=err)
+        stats.stream = err
+        stats.sort_stats(args.profile_sort).print_stats(args.profile_top)
+        if args.profile_dir:
+            stats.dump_stats(os.path.join(args.profile_dir, f'{stage}.prof'))
+    if args.profile_dir:
+        print(f"Saved per-stage profiles to {args.profile_dir}", file=err)
 
 
 def main() -> None:
-    results = run_pipeline(use_sample=True)
-    print(json.dumps(results, indent=2))
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--input', '-i', action='append', default=[], metavar='PATH',
+                        help="JSONL article file, or '-' for stdin; repeatable (default: sample data)")
+    parser.add_argument('--output', '-o', default='-', help="output path, or '-' for stdout")
+    parser.add_argument('--format', choices=('json', 'jsonl'), default=None,
+                        help='json (per-category object) or jsonl (one topic per line); default: jsonl with --input')
+    parser.add_argument('--stages', type=_parse_stages, default=STAGES,
+                        help='comma-separated stages to run (default: %s)' % ','.join(STAGES[1:]))
+    parser.add_argument('--executor', choices=('serial', 'thread', 'process'), default='serial',
+                        help='how categories are processed (default: serial)')
+    parser.add_argument('--workers', type=int, default=None, help='pool size for thread/process executors')
+    parser.add_argument('--profile', action='store_true', help='profile every stage with cProfile')
+    parser.add_argument('--profile-dir', default=None, help='also save <stage>.prof files here')
+    parser.add_argument('--profile-sort', default='cumulative', help='pstats sort key (default: cumulative)')
+    parser.add_argument('--profile-top', type=int, default=15, help='functions listed per stage (default: 15)')
+    parser.add_argument('--tracemalloc', action='store_true', help='report the peak memory of every stage')
+    args = parser.parse_args()
+
+    if not args.input and args.stages == STAGES and args.format in (None, 'json') and not (args.profile or args.tracemalloc):
+        # Plain demonstration run, exactly what the API computes
+        results = run_pipeline(use_sample=True)
+        _write(results, 'json', args.output)
+        return
+
+    if args.tracemalloc and args.executor == 'thread':
+        print("Note: tracemalloc peaks include allocations of concurrently running threads", file=sys.stderr)
+    start = time.perf_counter()
+    results, recorder = run(args)
+    elapsed = time.perf_counter() - start
+    _write(results, args.format or ('jsonl' if args.input else 'json'), args.output)
+    _report(recorder, args.stages, elapsed, args)
+
+
+def _write(results: Dict[str, List[Dict]], fmt: str, output: str) -> None:
+    if fmt == 'jsonl':
+        write_topics_jsonl(results, output)
+    elif output == '-':
+        print(json.dumps(results, indent=2))
+    else:
+        with open(output, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2)
+            handle.write('\n')
 
 
 if __name__ == '__main__':
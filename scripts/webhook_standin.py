@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""Stand-in for bank providers that posts synthetic transaction webhooks.
+
+Sends ``--events`` signed notifications for a few accounts to
+``POST /banks/webhooks/{provider}`` from ``--concurrency`` concurrent senders.
+Like real providers, it also redelivers some events (``--duplicates``) and
+sends some with a bad signature (``--bad-signatures``).  It then checks the
+responses:
+
+* redeliveries are acknowledged as duplicates;
+* badly signed events are rejected with 401;
+* the rest are queued.
+
+Against the in-process app (the default, with a temporary ledger and the
+``demo`` and ``synthetic`` providers) it waits for the queue to drain.  It
+then reports how many batches and account deltas the events cost, and how
+many transactions reached the ledger.  With ``--url`` it posts to a running
+server, whose ``BANK_WEBHOOK_SECRETS`` must contain ``--secret``.  Run it
+with `python scripts/webhook_standin.py [--events N]` from the repository
+root.
+"""
+
+import argparse
+import asyncio
+import collections
+import importlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+# Make `packages` importable when run from the repository root (see run_pipeline.py)
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from packages.banks.webhooks import SIGNATURE_HEADER, HMACVerifier
+
+
+# (provider, account ID) pairs of the demo user in the in-process app
+ACCOUNTS: List[Tuple[str, str]] = [
+    ('demo', 'acc-001'),
+    ('demo', 'acc-002'),
+    ('synthetic', 'demo-acc-00'),
+    ('synthetic', 'demo-acc-01'),
+]
+
+
+def _events(args: argparse.Namespace, rng: random.Random) -> List[Tuple[str, bytes, bool]]:
+    """``(provider, body, correctly signed)`` for every delivery, redeliveries included."""
+    deliveries = []
+    for i in range(args.events):
+        provider, account_id = rng.choice(ACCOUNTS)
+        body = json.dumps({
+            'event_id': f'evt-{args.seed}-{i}',
+            'event_type': 'transactions.updated',
+            'user_id': 'demo',
+            'account_ids': [account_id],
+        }).encode()
+        deliveries.append((provider, body, rng.random() >= args.bad_signatures))
+    deliveries += [delivery for delivery in deliveries if delivery[2] and rng.random() < args.duplicates]
+    rng.shuffle(deliveries)
+    return deliveries
+
+
+@asynccontextmanager
+async def _client(args: argparse.Namespace) -> AsyncIterator[Tuple[object, Optional[object]]]:
+    """An httpx client and, in process, the running app."""
+    import httpx
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url) as client:
+            yield client, None
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_PATH'] = os.path.join(tmp, 'news.db')
+        os.environ['BANK_DATABASE_PATH'] = os.path.join(tmp, 'bank.db')
+        os.environ['NEWS_IDF_PATH'] = os.path.join(tmp, 'news_idf.npz')
+        os.environ['NEWS_VECTOR_PATH'] = os.path.join(tmp, 'news_vectors')
+        os.environ['NEWS_SNAPSHOT_PATH'] = os.path.join(tmp, 'news_snapshots')
+        os.environ['BANK_PROVIDERS'] = 'demo,synthetic'
+        os.environ['BANK_WEBHOOK_SECRETS'] = ','.join(f'{name}={args.secret}' for name in ('demo', 'synthetic'))
+        # The API uses package‑relative imports (see benchmark.py)
+        if str(repo_root.parent) not in sys.path:
+            sys.path.insert(0, str(repo_root.parent))
+        main = importlib.import_module(f'{repo_root.name}.apps.api.main')
+        async with main.app.router.lifespan_context(main.app):
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                yield client, main.app
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    signer = HMACVerifier(args.secret)
+    wrong = HMACVerifier(args.secret + '-wrong')
+    deliveries = _events(args, rng)
+    statuses: Dict[str, int] = collections.Counter()
+    pending = asyncio.Queue()
+    for delivery in deliveries:
+        pending.put_nowait(delivery)
+
+    async with _client(args) as (client, app):
+        async def sender() -> None:
+            while not pending.empty():
+                provider, body, valid = pending.get_nowait()
+                headers = {SIGNATURE_HEADER: (signer if valid else wrong).sign(body), 'Content-Type': 'application/json'}
+                response = await client.post(f'/banks/webhooks/{provider}', content=body, headers=headers)
+                statuses[response.json().get('status') if response.status_code == 202 else str(response.status_code)] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(sender() for _ in range(args.concurrency)))
+        sent = time.perf_counter() - start
+        print(f"posted {len(deliveries)} deliveries in {sent:.2f} s ({len(deliveries) / sent:.0f}/s): {dict(statuses)}")
+        if app is None:
+            return
+        ingestor = app.state.bank_webhooks
+        await ingestor.drain()
+        print(f"drained after {time.perf_counter() - start:.2f} s: {ingestor.stats()}")
+        engine = app.state.transaction_sync
+        stored = {account_id: len(engine.transactions(account_id, limit=100_000)) for _, account_id in ACCOUNTS}
+        print(f"ledger transactions per account: {stored}")
+
+    expected_bad = sum(1 for _, _, valid in deliveries if not valid)
+    if statuses.get('401', 0) != expected_bad:
+        raise SystemExit(f"expected {expected_bad} rejected deliveries, got {statuses.get('401', 0)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=2000, help='distinct webhook events (default: 2000)')
+    parser.add_argument('--duplicates', type=float, default=0.1, help='share of events delivered twice (default: 0.1)')
+    parser.add_argument('--bad-signatures', type=float, default=0.02, help='share of events with a bad signature')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent senders (default: 16)')
+    parser.add_argument('--secret', default='standin-secret', help='webhook signing secret')
+    parser.add_argument('--url', help='post to a running server instead of the in-process app')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
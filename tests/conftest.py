@@ -0,0 +1,36 @@
+"""Shared pytest setup.
+
+Makes ``packages`` importable from the repository root, and the API (which
+uses package‑relative imports) importable as ``<repo>.apps.api.main``, the
+same way the scripts do.
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+for path in (repo_root, repo_root.parent):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """The API module, reloaded with every data path inside ``tmp_path``."""
+    settings = {
+        'DATABASE_PATH': tmp_path / 'news.db',
+        'BANK_DATABASE_PATH': tmp_path / 'bank.db',
+        'NEWS_IDF_PATH': tmp_path / 'news_idf.npz',
+        'NEWS_VECTOR_PATH': tmp_path / 'news_vectors',
+        'NEWS_SNAPSHOT_PATH': tmp_path / 'news_snapshots',
+        'NEWS_FEED_HEALTH_PATH': tmp_path / 'news_feed_health.json',
+        'BANK_PROVIDERS': 'demo',
+    }
+    for name, value in settings.items():
+        monkeypatch.setenv(name, str(value))
+    monkeypatch.delenv('NEWS_POLLING', raising=False)
+    monkeypatch.delenv('NEWS_READ_ONLY', raising=False)
+    return importlib.reload(importlib.import_module(f'{repo_root.name}.apps.api.main'))
@@ -0,0 +1,100 @@
+"""ProviderAggregator: concurrency, timeouts and partial failures."""
+
+import asyncio
+import time
+
+from packages.banks import AsyncBankProvider, BankProvider, ProviderAggregator
+
+
+class FakeProvider(AsyncBankProvider):
+    """Async provider answering after ``delay`` seconds, or raising ``error``."""
+
+    def __init__(self, account_id, delay=0.0, error=None):
+        self.account_id = account_id
+        self.delay = delay
+        self.error = error
+
+    async def _answer(self, payload):
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return payload
+
+    async def get_balances(self):
+        return await self._answer([{'account_id': self.account_id, 'currency': 'EUR', 'amount': 1.0}])
+
+    async def get_transactions(self, account_id):
+        return await self._answer([{'id': 'tx-1', 'account_id': account_id}] if account_id == self.account_id else [])
+
+    async def get_accounts(self):
+        return await self._answer([{'account_id': self.account_id}])
+
+
+class BlockingProvider(BankProvider):
+    """Synchronous provider whose calls block for ``delay`` seconds."""
+
+    def __init__(self, account_id, delay):
+        self.account_id = account_id
+        self.delay = delay
+
+    def get_balances(self):
+        time.sleep(self.delay)
+        return [{'account_id': self.account_id, 'currency': 'EUR', 'amount': 2.0}]
+
+    def get_transactions(self, account_id):
+        return []
+
+    def get_accounts(self):
+        return [{'account_id': self.account_id}]
+
+
+def test_merges_and_tags_results():
+    aggregator = ProviderAggregator({'a': FakeProvider('acc-a'), 'b': FakeProvider('acc-b')})
+    result = asyncio.run(aggregator.get_balances())
+    assert not result.partial
+    assert sorted((item['provider'], item['account_id']) for item in result.items) == [('a', 'acc-a'), ('b', 'acc-b')]
+
+
+def test_slow_provider_times_out_without_failing_the_request():
+    aggregator = ProviderAggregator({'fast': FakeProvider('acc-f'), 'slow': FakeProvider('acc-s', delay=5.0)}, timeout=0.1)
+    start = time.perf_counter()
+    result = asyncio.run(aggregator.get_balances())
+    assert time.perf_counter() - start < 1.0
+    assert result.errors == {'slow': 'timeout'}
+    assert [item['account_id'] for item in result.items] == ['acc-f']
+
+
+def test_per_provider_timeout_override():
+    providers = {'a': FakeProvider('acc-a', delay=0.2), 'b': FakeProvider('acc-b', delay=0.2)}
+    result = asyncio.run(ProviderAggregator(providers, timeout=0.05, timeouts={'b': 1.0}).get_balances())
+    assert result.errors == {'a': 'timeout'}
+    assert [item['provider'] for item in result.items] == ['b']
+
+
+def test_failing_provider_is_reported():
+    providers = {'ok': FakeProvider('acc-ok'), 'bad': FakeProvider('acc-bad', error=RuntimeError('upstream 503'))}
+    result = asyncio.run(ProviderAggregator(providers).get_accounts())
+    assert result.partial
+    assert result.errors == {'bad': 'upstream 503'}
+    assert [item['account_id'] for item in result.items] == ['acc-ok']
+
+
+def test_every_provider_failing_returns_empty_result():
+    providers = {'a': FakeProvider('acc-a', error=ValueError()), 'b': FakeProvider('acc-b', delay=5.0)}
+    result = asyncio.run(ProviderAggregator(providers, timeout=0.05).get_balances())
+    assert result.items == []
+    assert result.errors == {'a': 'ValueError', 'b': 'timeout'}
+
+
+def test_transactions_only_from_owning_provider():
+    providers = {'a': FakeProvider('acc-a'), 'b': FakeProvider('acc-b')}
+    result = asyncio.run(ProviderAggregator(providers).get_transactions('acc-b'))
+    assert [(item['provider'], item['account_id']) for item in result.items] == [('b', 'acc-b')]
+
+
+def test_blocking_providers_run_concurrently():
+    providers = {name: BlockingProvider(f'acc-{name}', delay=0.3) for name in 'abc'}
+    start = time.perf_counter()
+    result = asyncio.run(ProviderAggregator(providers).get_balances())
+    assert time.perf_counter() - start < 0.8
+    assert len(result.items) == 3 and not result.partial
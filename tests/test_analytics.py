@@ -0,0 +1,61 @@
+"""TransactionFrame aggregates and the /banks/analytics routes."""
+
+from fastapi.testclient import TestClient
+
+from packages.banks import ledger
+from packages.banks.analytics import TransactionFrame, day_to_iso, month_to_iso
+
+ROWS = [
+    ('acc-1', '2024-01-30', -12.5, 'Tesco'),
+    ('acc-1', '2024-01-30', 2000.0, 'Salary'),
+    ('acc-1', '2024-02-01', -7.25, 'Tesco'),
+    ('acc-2', '2024-02-03', -100.0, 'Landlord'),
+]
+
+
+def test_aggregates():
+    frame = TransactionFrame.from_rows(ROWS)
+    days, spend = frame.spend_by_day()
+    assert [(day_to_iso(d), int(c)) for d, c in zip(days, spend)] == [
+        ('2024-01-30', 1250), ('2024-02-01', 725), ('2024-02-03', 10000),
+    ]
+    assert frame.spend_by_merchant() == [('Landlord', 10000), ('Tesco', 1975)]
+    months, income, out = frame.monthly_totals()
+    assert [month_to_iso(m) for m in months] == ['2024-01', '2024-02']
+    assert income.tolist() == [200000, 0] and out.tolist() == [1250, 10725]
+    days, balance = frame.for_account('acc-1').running_balance(opening_cents=100)
+    assert balance.tolist() == [198850, 198125]
+
+
+def test_rows_without_a_date_are_skipped():
+    frame = TransactionFrame.from_rows(ROWS + [('acc-1', '', -5.0, 'Unknown')])
+    assert len(frame) == len(ROWS)
+    assert TransactionFrame.from_rows([('acc-1', '', -5.0, 'x')]).spend_by_day()[0].size == 0
+    assert len(TransactionFrame.from_records([{'account_id': 'acc-1', 'amount': -1.0}])) == 0
+
+
+def test_rows_with_malformed_dates_are_skipped():
+    bad = [('acc-1', '2024-13-01', -5.0, 'x'), ('acc-1', 'yesterday', -5.0, 'x'), ('acc-1', 'NaT', -5.0, 'x')]
+    frame = TransactionFrame.from_rows(ROWS + bad)
+    assert len(frame) == len(ROWS)
+    assert frame.spend_by_merchant() == TransactionFrame.from_rows(ROWS).spend_by_merchant()
+    assert len(TransactionFrame.from_rows(bad)) == 0
+
+
+def test_routes_serve_ledger_with_undated_rows(api):
+    with TestClient(api.app) as client:
+        transactions = [
+            {'id': f'tx-{i}', 'account_id': account, 'date': date, 'amount': amount, 'description': merchant}
+            for i, (account, date, amount, merchant) in enumerate(ROWS)
+        ]
+        transactions.append({'id': 'tx-undated', 'account_id': 'acc-1', 'amount': -3.0, 'description': 'Undated'})
+        transactions.append({'id': 'tx-bad', 'account_id': 'acc-1', 'date': '31/01/2024', 'amount': -3.0, 'description': 'Bad'})
+        ledger.apply_delta(api.BANK_DATABASE_PATH, 'demo', 'acc-1', transactions, None)
+
+        response = client.get('/banks/analytics/spend-by-day')
+        assert response.status_code == 200
+        assert [row['date'] for row in response.json()] == ['2024-01-30', '2024-02-01', '2024-02-03']
+        response = client.get('/banks/analytics/spend-by-merchant', params={'account_id': 'acc-1', 'limit': 1})
+        assert response.json() == [{'merchant': 'Tesco', 'spend': 19.75}]
+        for route in ('spend-by-category', 'monthly', 'running-balance'):
+            assert client.get(f'/banks/analytics/{route}').status_code == 200
@@ -0,0 +1,92 @@
+"""API tail latency while the news pipeline stores a large result."""
+
+import asyncio
+import importlib
+import threading
+import time
+
+import httpx
+
+ROUTES = ('/news/breaking', '/news/search?q=story', '/news/subscriptions/alice')
+
+
+def _topics(n, categories, word):
+    return {
+        category: [
+            {
+                'headline': f'{category} {word} {i}',
+                'summary': f'Summary of {category} {word} {i} with a few more words to index.',
+                'importance': (i % 997) / 997,
+                'published': '2024-01-01T12:00:00',
+                'sources': [f'Publisher {i % 50}'],
+                'links': [f'https://example.com/{category}/{word}/{i}'],
+            }
+            for i in range(n // len(categories))
+        ]
+        for category in categories
+    }
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _load(client, stop):
+    latencies = []
+
+    async def worker(offset):
+        i = offset
+        while not stop.is_set():
+            start = time.perf_counter()
+            response = await client.get(ROUTES[i % len(ROUTES)])
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+            i += 1
+
+    await asyncio.gather(*(worker(k) for k in range(4)))
+    return latencies
+
+
+def test_pipeline_save_runs_on_the_writer_thread_and_routes_stay_responsive(api, monkeypatch):
+    news_repo = importlib.import_module(api.persist_results.__module__.rsplit('.', 1)[0] + '.repo')
+    news_repo.save_pipeline_output(_topics(50, api.CATEGORIES, 'story'), api.DATABASE_PATH)
+    big = _topics(10_000, api.CATEGORIES, 'bulk')
+    monkeypatch.setattr(api, 'run_pipeline', lambda **kwargs: big)
+    save = news_repo.save_pipeline_output
+    writers, seconds = [], []
+
+    def timed_save(*args):
+        writers.append(threading.current_thread().name)
+        start = time.perf_counter()
+        save(*args)
+        seconds.append(time.perf_counter() - start)
+
+    monkeypatch.setattr(news_repo, 'save_pipeline_output', timed_save)
+
+    async def phase(client, background):
+        stop = asyncio.Event()
+
+        async def run():
+            await asyncio.sleep(0.05)
+            try:
+                await background()
+            finally:
+                stop.set()
+
+        latencies, _ = await asyncio.gather(_load(client, stop), run())
+        return latencies
+
+    async def main():
+        async with api.app.router.lifespan_context(api.app):
+            transport = httpx.ASGITransport(app=api.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                idle = await phase(client, lambda: asyncio.sleep(0.5))
+                saving = await phase(client, lambda: api._run_news_pipeline(api.app))
+        return idle, saving
+
+    idle, saving = asyncio.run(main())
+    assert writers == ['news-db-write_0']
+    # A save on the event loop would hold some request for the whole save
+    assert max(saving) < seconds[0] / 2
+    assert _percentile(saving, 0.95) < 4 * _percentile(idle, 0.95) + 0.05
@@ -0,0 +1,68 @@
+"""Categoriser keyword matching, normalisation and memoisation."""
+
+import random
+
+import pytest
+
+from packages.banks.categorise import DEFAULT_RULES, Categoriser, normalise_description
+
+
+@pytest.fixture(scope='module')
+def categoriser():
+    return Categoriser()
+
+
+@pytest.mark.parametrize('description, category', [
+    ('UBER EATS AMSTERDAM 1234', 'eating_out'),
+    ('UBER *TRIP HELP.UBER.COM', 'transport'),
+    ('CARD PAYMENT TO AMAZON PRIME 12/03', 'subscriptions'),
+    ('AMZN MKTP DE 3X4Y', 'shopping'),
+    ('Albert Heijn 1403 Amsterdam', 'groceries'),
+])
+def test_longest_keyword_wins(categoriser, description, category):
+    assert categoriser.categorise(description) == category
+
+
+@pytest.mark.parametrize('description', ['SPARTAN RACE', 'RENTOKIL', 'BPM TAX', 'STARBUCKSY'])
+def test_partial_words_do_not_match(categoriser, description):
+    assert categoriser.categorise(description) == 'other'
+
+
+def test_case_digits_and_punctuation_are_folded(categoriser):
+    assert normalise_description('CARD PAYMENT TO TESCO STORES 3297 ON 12/03') == 'tesco stores'
+    assert {categoriser.categorise(d) for d in ('TESCO', 'tesco', 'Tesco-Stores #12', 'pos tEsCo')} == {'groceries'}
+
+
+def test_ties_go_to_the_rule_listed_first():
+    categoriser = Categoriser({'a': ['foo bar'], 'b': ['foo bar', 'bar']})
+    assert categoriser.categorise('x foo bar y') == 'a'
+    assert categoriser.categorise('bar') == 'b'
+
+
+def _reference(rules, description):
+    """Brute force: longest whole-word keyword, first rule on ties."""
+    text = f' {normalise_description(description)} '
+    best = None
+    for category, keyword in ((c, normalise_description(k)) for c, ks in rules.items() for k in ks):
+        if keyword and f' {keyword} ' in text and (best is None or len(keyword) > best[0]):
+            best = (len(keyword), category)
+    return best[1] if best else 'other'
+
+
+def test_automaton_matches_brute_force():
+    rng = random.Random(7)
+    words = [k for keywords in DEFAULT_RULES.values() for k in keywords] + ['stores', 'amsterdam', 'eats', 'x']
+    categoriser = Categoriser()
+    for _ in range(2000):
+        description = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 5)))
+        assert categoriser.categorise(description) == _reference(DEFAULT_RULES, description), description
+
+
+def test_batch_matches_single_calls_and_memoises():
+    rng = random.Random(3)
+    words = ['TESCO', 'UBER', 'UBER EATS', 'NETFLIX.COM', 'SALARY', 'UNKNOWN SHOP', '1234', 'card payment']
+    descriptions = [' '.join(rng.choice(words) for _ in range(3)) for _ in range(500)]
+    batch = Categoriser(max_cache_size=50)
+    assert batch.categorise_batch(descriptions) == [Categoriser().categorise(d) for d in descriptions]
+    assert len(batch._raw) <= 50
+    assert batch.categorise_batch(descriptions) == batch.categorise_batch(descriptions)
@@ -0,0 +1,43 @@
+"""HashedTfidfVectorizer persistence: concurrent saves and single ownership."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from packages.news.features import HashedTfidfVectorizer
+
+TEXTS = ['central bank raises rates', 'greek elections tomorrow', 'new ai model released']
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    path = str(tmp_path / 'idf.npz')
+    vectorizer = HashedTfidfVectorizer.load(path, n_features=2 ** 12)
+
+    def update_and_save(i):
+        vectorizer.partial_fit([TEXTS[i % len(TEXTS)]])
+        vectorizer.save()
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(update_and_save, range(64)))
+    vectorizer.close()
+    assert HashedTfidfVectorizer.load(path).n_documents == 64
+    assert sorted(p.name for p in tmp_path.iterdir() if p.suffix == '.tmp') == []
+
+
+def test_only_the_owner_writes(tmp_path):
+    path = str(tmp_path / 'idf.npz')
+    owner = HashedTfidfVectorizer.load(path, n_features=2 ** 12)
+    reader = HashedTfidfVectorizer.load(path, n_features=2 ** 12)
+    assert owner.owner and not reader.owner
+
+    owner.fit_transform(TEXTS)
+    reader.fit_transform(TEXTS[:1])
+    assert owner.checkpoint() is True
+    # The reader discards its own counts and picks up the owner's
+    assert reader.checkpoint() is False
+    assert reader.n_documents == 3
+    np.testing.assert_array_equal(reader.df, owner.df)
+
+    owner.close()
+    assert reader.owner
+    reader.close()
@@ -0,0 +1,155 @@
+"""FeedHealthRegistry circuit breaking, adaptive timeouts, persistence and parse failures."""
+
+import asyncio
+
+import pytest
+
+from packages.news import ingest
+from packages.news.feedhealth import FeedHealthRegistry
+from packages.news.scheduler import FeedScheduler
+
+URL = 'https://feeds.example.com/a'
+
+
+class Clock:
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class Response:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+def _registry(clock, **kwargs):
+    return FeedHealthRegistry(failure_threshold=3, base_backoff=60, max_backoff=300, clock=clock, **kwargs)
+
+
+def test_circuit_opens_after_threshold_and_backoff_doubles_to_max():
+    clock = Clock()
+    health = _registry(clock)
+    for _ in range(2):
+        health.record_failure(URL, 'boom')
+    assert health.state(URL) == 'closed'
+    backoffs = []
+    for _ in range(4):
+        health.record_failure(URL, 'boom')
+        assert health.state(URL) == 'open'
+        backoffs.append(health.feeds[URL].open_until - clock.now)
+        clock.now = health.feeds[URL].open_until
+        assert health.state(URL) == 'half-open'
+    assert backoffs == [60, 120, 240, 300]
+
+
+def test_half_open_allows_one_probe_and_success_closes():
+    clock = Clock()
+    health = _registry(clock)
+    for _ in range(3):
+        health.record_failure(URL, 'boom')
+    assert not health.allow(URL)
+    clock.now += 60
+    assert health.allow(URL)
+    # The probe is in flight: nobody else gets through
+    assert not health.allow(URL)
+    assert health.state(URL) == 'open'
+    health.record_success(URL, 0.2)
+    assert health.state(URL) == 'closed'
+    assert health.allow(URL) and health.allow(URL)
+
+
+def test_timeout_adapts_to_p95_and_doubles_per_failure():
+    health = _registry(Clock(), default_timeout=10.0, min_timeout=1.0, multiplier=3.0)
+    for _ in range(4):
+        health.record_success(URL, 0.5)
+    assert health.timeout(URL) == 10.0
+    health.record_success(URL, 0.5)
+    assert health.timeout(URL) == pytest.approx(1.5)
+    timeouts = []
+    for _ in range(3):
+        health.record_failure(URL, 'timeout')
+        timeouts.append(health.timeout(URL))
+    assert timeouts == pytest.approx([3.0, 6.0, 10.0])
+
+    fast = 'https://feeds.example.com/fast'
+    for _ in range(5):
+        health.record_success(fast, 0.01)
+    assert health.timeout(fast) == 1.0
+
+
+def test_save_and_refresh_round_trip(tmp_path):
+    path = str(tmp_path / 'health.json')
+    owner_clock, reader_clock = Clock(100.0), Clock(200.0)
+    owner = FeedHealthRegistry.load(path, clock=owner_clock)
+    reader = FeedHealthRegistry.load(path, clock=reader_clock)
+    try:
+        assert owner.owner and not reader.owner
+        for latency in (0.1, 0.2, 0.3):
+            owner.record_success(URL, latency)
+        owner.record_failure('https://feeds.example.com/b', 'boom')
+        assert owner.checkpoint()
+        assert sorted(tmp_path.iterdir()) == [tmp_path / 'health.json', tmp_path / 'health.json.lock']
+
+        # The reader's own, newer fetch of b survives the merge
+        reader.record_success('https://feeds.example.com/b', 0.4)
+        with pytest.raises(RuntimeError, match='owned'):
+            reader.save()
+        assert not reader.checkpoint()
+        assert reader.feeds[URL].to_dict() == owner.feeds[URL].to_dict()
+        assert reader.feeds['https://feeds.example.com/b'].successes == 1
+        assert not reader.refresh()
+
+        owner.close()
+        assert reader.owner
+        reader.save()
+        saved = FeedHealthRegistry(path)
+        assert saved.refresh()
+        assert saved.feeds['https://feeds.example.com/b'].successes == 1
+    finally:
+        owner.close()
+        reader.close()
+
+
+def test_corrupt_file_is_ignored(tmp_path):
+    path = tmp_path / 'health.json'
+    path.write_text('{"feeds": [')
+    health = FeedHealthRegistry.load(str(path))
+    try:
+        assert health.feeds == {}
+        assert not health.refresh()
+        health.record_success(URL, 0.1)
+        health.save()
+        assert FeedHealthRegistry(str(path)).refresh()
+    finally:
+        health.close()
+
+
+def test_unparsable_feed_counts_as_failure(monkeypatch):
+    health = _registry(Clock())
+    monkeypatch.setattr(ingest.requests, 'get', lambda url, timeout: Response(b'<rss><channel>'))
+    assert ingest._fetch_feed(URL, 'Finance', health) == []
+    assert (health.feeds[URL].successes, health.feeds[URL].failures) == (0, 1)
+
+
+def test_scheduler_counts_unparsable_feed_as_failure():
+    class Session:
+        def get(self, url, headers=None, timeout=None):
+            return Response(b'not xml')
+
+    clock = Clock()
+    health = _registry(clock)
+    scheduler = FeedScheduler(
+        lambda articles: None, sources={'Finance': [URL]}, session=Session(), clock=clock, health=health, jitter=0
+    )
+    scheduler.feeds[URL].next_poll = clock.now
+    assert asyncio.run(scheduler.poll_due()) == []
+    assert (health.feeds[URL].successes, health.feeds[URL].failures) == (0, 1)
+    assert scheduler.feeds[URL].failures == 1
@@ -0,0 +1,49 @@
+"""Synthetic news corpora: determinism and realised duplicate and burst rates."""
+
+import subprocess
+import sys
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from packages.news.jsonl import write_articles_jsonl
+from packages.news.synthetic import generate_articles
+
+END = datetime(2024, 6, 1, 12, 0)
+SCRIPT = Path(__file__).resolve().parents[1] / 'scripts' / 'generate_news_corpus.py'
+
+
+def test_same_seed_gives_identical_jsonl(tmp_path):
+    paths = [tmp_path / f'{name}.jsonl' for name in ('a', 'b', 'other')]
+    for path, seed in zip(paths, (5, 5, 6)):
+        write_articles_jsonl(generate_articles(2_000, seed=seed, uncategorised_rate=0.1, end=END), str(path))
+    assert paths[0].read_bytes() == paths[1].read_bytes()
+    assert paths[0].read_bytes() != paths[2].read_bytes()
+    script = tmp_path / 'script.jsonl'
+    subprocess.run(
+        [sys.executable, str(SCRIPT), '--articles', '2000', '--seed', '5', '--uncategorised-rate', '0.1',
+         '--end', END.isoformat(), '--out', str(script)],
+        check=True, capture_output=True,
+    )
+    assert script.read_bytes() == paths[0].read_bytes()
+
+
+def _story_sizes(articles):
+    # Links end in <story id>-<article index>
+    return Counter(article.link.rsplit('/', 1)[1].split('-')[0] for article in articles)
+
+
+@pytest.mark.parametrize('duplicate_rate, burst_rate, burst_size', [(0.3, 0.0, 20), (0.3, 0.02, 20), (0.5, 0.02, 5)])
+def test_realised_rates_match_the_options(duplicate_rate, burst_rate, burst_size):
+    n = 20_000
+    sizes = _story_sizes(generate_articles(
+        n, seed=1, duplicate_rate=duplicate_rate, burst_rate=burst_rate, burst_size=burst_size, end=END,
+    ))
+    # Bursts take duplicate slots, so they do not raise the duplicate share
+    assert (n - len(sizes)) / n == pytest.approx(duplicate_rate, abs=0.02)
+    if burst_rate:
+        bursts = int(len(sizes) * burst_rate)
+        largest = sorted(sizes.values(), reverse=True)[:bursts]
+        assert sum(largest) / bursts == pytest.approx(burst_size + 1, rel=0.5)
@@ -0,0 +1,64 @@
+"""run_pipeline: the public per-category stages and global clustering."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from packages.news import pipeline
+from packages.news.batch import ArticleBatch
+from packages.news.classify import classify_articles
+from packages.news.datatypes import Article
+from packages.news.pipeline import cluster_category, run_pipeline, score_category, summarize_category
+from packages.news.sample_data import load_sample_articles
+from packages.news.summarize import summarize_clusters
+
+
+def test_stages_match_run_pipeline():
+    articles = load_sample_articles()
+    batch = ArticleBatch.from_articles(articles)
+    classify_articles(batch)
+    staged = {}
+    for category, group in batch.by_category().items():
+        clusters, cluster_vectors = cluster_category(group)
+        staged[category] = summarize_category(clusters, cluster_vectors, score_category(clusters, category))
+    assert staged == run_pipeline(articles=articles)
+
+
+def _cross_category_story():
+    now = datetime.utcnow()
+    text = 'Central banks fund new AI chip makers as rates fall'
+    description = 'Central banks and investors are funding new AI chip makers, betting on cheaper credit as rates fall.'
+    return [
+        Article(text, f'https://{publisher}.example.com/chips', description, now - timedelta(minutes=i), publisher, category)
+        for i, (publisher, category) in enumerate([('markets', 'Finance'), ('techwire', 'AI')])
+    ]
+
+
+def test_global_scope_lists_a_shared_story_once_under_each_category(monkeypatch):
+    articles = load_sample_articles() + _cross_category_story()
+    summarised = []
+
+    def counting_summarize(clusters, *args, **kwargs):
+        summarised.extend(tuple(cluster.link) for cluster in clusters)
+        return summarize_clusters(clusters, *args, **kwargs)
+
+    monkeypatch.setattr(pipeline, 'summarize_clusters', counting_summarize)
+    results = run_pipeline(articles=articles, scope='global')
+
+    links = ['https://markets.example.com/chips', 'https://techwire.example.com/chips']
+    shared = [
+        (category, topic) for category, topics in results.items() for topic in topics
+        if sorted(topic['links']) == links
+    ]
+    assert sorted(category for category, _ in shared) == ['AI', 'Finance']
+    finance, ai = (topic for _, topic in sorted(shared, key=lambda item: item[0] != 'Finance'))
+    assert finance['summary'] == ai['summary'] and finance['headline'] == ai['headline']
+    assert sorted(finance['categories']) == ['AI', 'Finance']
+    # Every selected cluster is summarised exactly once, however many categories list it
+    assert len(summarised) == len(set(summarised))
+    assert set(summarised) == {tuple(topic['links']) for topics in results.values() for topic in topics}
+
+
+def test_unknown_scope_raises():
+    with pytest.raises(ValueError, match='bogus'):
+        run_pipeline(articles=load_sample_articles(), scope='bogus')
@@ -0,0 +1,90 @@
+"""ProviderRegistry clients and the OAuth token exchange of HTTP providers."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from packages.banks import PlaidProvider, ProviderRegistry, TinkProvider
+from packages.banks.session import TokenCache
+
+
+class FakeResponse:
+    def __init__(self, payload, status=200):
+        self.payload = payload
+        self.status = status
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f'HTTP {self.status}')
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Records token requests and answers with an incrementing token."""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.posts = []
+
+    def post(self, url, data=None, timeout=None):
+        self.posts.append((url, data))
+        return FakeResponse({'access_token': f'token-{len(self.posts)}', 'expires_in': 3600}, self.status)
+
+    def close(self):
+        pass
+
+
+def test_client_credentials_exchange_is_cached():
+    session = FakeSession()
+    provider = TinkProvider('alice', session, TokenCache(), client_id='id', client_secret='secret')
+    assert provider.access_token() == 'token-1'
+    assert provider.access_token() == 'token-1'
+    url, data = session.posts[0]
+    assert url == TinkProvider.token_url and len(session.posts) == 1
+    assert data == {'grant_type': 'client_credentials', 'client_id': 'id', 'client_secret': 'secret'}
+
+
+def test_missing_credentials_raise(monkeypatch):
+    monkeypatch.delenv('TINK_CLIENT_ID', raising=False)
+    monkeypatch.delenv('TINK_CLIENT_SECRET', raising=False)
+    provider = TinkProvider('alice', FakeSession(), TokenCache())
+    with pytest.raises(ValueError, match='TINK_CLIENT_ID'):
+        provider.access_token()
+
+
+def test_rejected_exchange_is_not_cached():
+    session = FakeSession(status=401)
+    provider = TinkProvider('alice', session, TokenCache(), client_id='id', client_secret='wrong')
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            provider.access_token()
+    assert len(session.posts) == 2
+
+
+def test_clients_share_the_token_cache_and_are_reused():
+    registry = ProviderRegistry({'tink': lambda user, session, tokens: TinkProvider(user, FakeSession(), tokens)})
+    client = registry.get('tink', 'alice')
+    assert registry.get('tink', 'alice') is client
+    assert registry.get('tink', 'bob') is not client
+    assert client.token_cache is registry.token_cache
+    registry.close()
+
+
+def test_package_import_does_not_need_requests():
+    code = "import sys, packages.banks; print('requests' in sys.modules)"
+    repo_root = Path(__file__).resolve().parents[1]
+    out = subprocess.run([sys.executable, '-c', code], cwd=repo_root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == 'False'
+
+
+def test_plaid_item_tokens_are_per_user(monkeypatch):
+    monkeypatch.setenv('PLAID_ACCESS_TOKENS', 'alice=item-a, bob=item-b')
+    tokens = TokenCache()
+    assert PlaidProvider('alice', FakeSession(), tokens).access_token() == 'item-a'
+    assert PlaidProvider('bob', FakeSession(), tokens).access_token() == 'item-b'
+    with pytest.raises(ValueError, match='carol'):
+        PlaidProvider('carol', FakeSession(), tokens).access_token()
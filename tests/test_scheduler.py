@@ -0,0 +1,125 @@
+"""FeedScheduler interval adaptation, conditional requests and the new-articles callback."""
+
+import asyncio
+
+import pytest
+
+from packages.news.feedhealth import FeedHealthRegistry
+from packages.news.scheduler import FeedScheduler
+
+URL = 'https://feed.example.com/rss'
+
+
+def _rss(*ids):
+    items = ''.join(
+        f'<item><title>Story {i}</title><link>https://example.com/{i}</link><description>d</description></item>'
+        for i in ids
+    )
+    return f'<rss><channel>{items}</channel></rss>'.encode()
+
+
+class Response:
+    def __init__(self, status_code=200, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f'HTTP {self.status_code}')
+
+
+class FakeSession:
+    """Serves a feed with an ETag, answering 304 when the client sends it back."""
+
+    def __init__(self):
+        self.items = []
+        self.fail = False
+        self.requests = []
+
+    @property
+    def etag(self):
+        return f'"v{len(self.items)}"'
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if self.fail:
+            raise ConnectionError('feed down')
+        if (headers or {}).get('If-None-Match') == self.etag:
+            return Response(304)
+        return Response(200, _rss(*self.items), {'ETag': self.etag})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def setup():
+    clock, session, calls = Clock(), FakeSession(), []
+    scheduler = FeedScheduler(
+        calls.append, {'News': [URL]}, min_interval=10, max_interval=10_000, initial_interval=100,
+        backoff=2.0, jitter=0.0, session=session, clock=clock,
+        health=FeedHealthRegistry(failure_threshold=100, clock=clock),
+    )
+    return scheduler, scheduler.feeds[URL], session, clock, calls
+
+
+def _poll(scheduler, clock, at):
+    clock.now = at
+    return asyncio.run(scheduler.poll_due())
+
+
+def test_interval_shrinks_with_new_items_and_grows_when_quiet(setup):
+    scheduler, state, session, clock, calls = setup
+    session.items = list(range(10))
+    _poll(scheduler, clock, 100)
+    # 10 new items in the 100 s interval: aim halfway towards 10 s per item
+    assert state.interval == pytest.approx(55)
+    _poll(scheduler, clock, state.next_poll)
+    assert state.interval == pytest.approx(110)
+
+
+def test_failures_grow_the_interval_one_step_each(setup):
+    scheduler, state, session, clock, calls = setup
+    session.fail = True
+    intervals = []
+    for _ in range(4):
+        _poll(scheduler, clock, max(clock.now, state.next_poll))
+        intervals.append(state.interval)
+    assert intervals == [200, 400, 800, 1600]
+    assert state.failures == 4
+    for _ in range(10):
+        _poll(scheduler, clock, state.next_poll)
+    assert state.interval == 10_000
+
+
+def test_etag_is_sent_back_and_304_finds_nothing(setup):
+    scheduler, state, session, clock, calls = setup
+    session.items = [1, 2]
+    _poll(scheduler, clock, 100)
+    assert session.requests[0] == {}
+    assert _poll(scheduler, clock, state.next_poll) == []
+    assert session.requests[1] == {'If-None-Match': '"v2"'}
+    assert scheduler.health.feeds[URL].successes == 2
+
+
+def test_callback_runs_only_for_new_items(setup):
+    scheduler, state, session, clock, calls = setup
+    session.items = [1, 2]
+    assert len(_poll(scheduler, clock, 100)) == 2
+    session.items = [1, 2, 3]
+    new = _poll(scheduler, clock, state.next_poll)
+    assert [article.link for article in new] == ['https://example.com/3']
+    # Unchanged feed (304) and a changed feed with only seen items
+    _poll(scheduler, clock, state.next_poll)
+    session.items = [3, 2, 1, 2]
+    _poll(scheduler, clock, state.next_poll)
+    assert [[article.link for article in batch] for batch in calls] == [
+        ['https://example.com/1', 'https://example.com/2'], ['https://example.com/3'],
+    ]
+    assert _poll(scheduler, clock, state.next_poll - 1) == []
@@ -0,0 +1,77 @@
+"""Full-text topic search: FTS5 triggers, query quoting, ranking and the LIKE fallback."""
+
+import sqlite3
+
+import pytest
+
+from packages.news import repo as news_repo
+
+
+def _topic(headline, summary='Nothing to see.', importance=0.5, sources=('Pub',)):
+    return {
+        'headline': headline, 'summary': summary, 'importance': importance,
+        'published': '2024-01-01T12:00:00', 'sources': list(sources), 'links': [f'https://example.com/{headline}'],
+    }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'news.db')
+    news_repo.save_pipeline_output({
+        'Finance': [_topic('Central bank raises rates'), _topic('Markets calm', 'The central bank kept quiet.')],
+        'Greece': [_topic('Athens budget passes', 'Parliament approved the budget.')],
+    }, path)
+    return path
+
+
+def _headlines(db_path, query, **kwargs):
+    return [topic['headline'] for topic in news_repo.search_topics(db_path, query, **kwargs)]
+
+
+def test_index_follows_inserts_updates_and_deletes(db_path):
+    assert _headlines(db_path, 'athens') == ['Athens budget passes']
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE clusters SET headline = 'Thessaloniki budget passes' WHERE headline LIKE 'Athens%';")
+        conn.execute("DELETE FROM clusters WHERE headline = 'Markets calm';")
+    assert _headlines(db_path, 'athens') == []
+    assert _headlines(db_path, 'thessaloniki') == ['Thessaloniki budget passes']
+    assert _headlines(db_path, 'quiet') == []
+    news_repo.save_pipeline_output({'AI': [_topic('New model released')]}, db_path)
+    assert _headlines(db_path, 'model') == ['New model released']
+
+
+@pytest.mark.parametrize('query', ['"bank', 'bank"', 'ban*', 'NEAR(central bank)', '-bank', 'bank -', 'bank OR', 'AND', '*', ':'])
+def test_operator_characters_are_quoted(db_path, query):
+    news_repo.search_topics(db_path, query)
+
+
+def test_all_terms_and_prefixes_match(db_path):
+    assert _headlines(db_path, 'central bank rates') == ['Central bank raises rates']
+    assert set(_headlines(db_path, 'budg*')) == {'Athens budget passes'}
+    assert _headlines(db_path, 'NEAR(central bank)') == _headlines(db_path, 'near central bank')
+
+
+def test_category_filter(db_path):
+    assert set(_headlines(db_path, 'bank')) == {'Central bank raises rates', 'Markets calm'}
+    assert _headlines(db_path, 'bank', categories=['Greece']) == []
+    assert _headlines(db_path, 'budget', categories=['Greece', 'AI']) == ['Athens budget passes']
+
+
+def test_headline_matches_rank_above_summary_matches(db_path):
+    results = news_repo.search_topics(db_path, 'central bank')
+    assert [topic['headline'] for topic in results] == ['Central bank raises rates', 'Markets calm']
+    assert results[0]['rank'] < results[1]['rank']
+    assert '<mark>' in results[0]['snippet']
+
+
+def test_like_fallback_without_fts5(tmp_path, monkeypatch):
+    # A module that does not exist fails like a build without FTS5
+    monkeypatch.setattr(news_repo, '_FTS_SCHEMA', ('CREATE VIRTUAL TABLE clusters_fts USING no_such_module(x);',))
+    path = str(tmp_path / 'news.db')
+    news_repo.save_pipeline_output({
+        'Finance': [_topic('Central bank raises rates', importance=0.4), _topic('Markets calm', 'The central bank kept quiet.', 0.9)],
+    }, path)
+    results = news_repo.search_topics(path, 'central "bank')
+    assert [topic['headline'] for topic in results] == ['Markets calm', 'Central bank raises rates']
+    assert results[0]['rank'] is None
+    assert _headlines(path, 'bank', categories=['Greece']) == []
@@ -0,0 +1,40 @@
+"""Concurrent snapshot publishing."""
+
+import os
+import threading
+from datetime import datetime
+
+from packages.news.snapshot import SnapshotReader, publish_snapshot
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+def _topics(i):
+    return {'Finance': [{
+        'headline': f'headline {i}', 'summary': 'summary', 'importance': 0.5,
+        'published': NOW.isoformat(), 'sources': ['pub'], 'links': [f'https://example.com/{i}'],
+    }]}
+
+
+def test_concurrent_publishers_get_distinct_versions(tmp_path):
+    directory = str(tmp_path)
+    paths, errors = [], []
+    start = threading.Barrier(8)
+
+    def publish(i):
+        start.wait()
+        try:
+            for j in range(5):
+                paths.append(publish_snapshot(_topics(i * 10 + j), directory, now=NOW, keep=100))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=publish, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(set(paths)) == 40
+    assert SnapshotReader(directory).current().version == 40
+    assert not [name for name in os.listdir(directory) if name.endswith('.tmp')]
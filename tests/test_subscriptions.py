@@ -0,0 +1,73 @@
+"""DigestService profile caching: bounds, expiry and cross-process updates."""
+
+import os
+import threading
+
+from packages.news import repo as news_repo
+from packages.news.subscriptions import CategoryTopicCache, DigestService, SubscriptionProfile
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _service(db_path, clock, **kwargs):
+    cache = CategoryTopicCache(db_path, loader=lambda category, limit: [])
+    return DigestService(cache, ['Finance'], db_path, clock=clock, **kwargs)
+
+
+def test_profile_cache_is_bounded(tmp_path):
+    service = _service(str(tmp_path / 'news.db'), Clock(), max_profiles=3)
+    for i in range(10):
+        assert service.profile(f'user-{i}').categories == ('Finance',)
+    assert list(service._profiles) == ['user-7', 'user-8', 'user-9']
+
+
+def test_profiles_saved_by_another_process_are_seen_after_the_ttl(tmp_path):
+    db_path = str(tmp_path / 'news.db')
+    clock = Clock()
+    service = _service(db_path, clock, profile_ttl=10.0)
+    other = _service(db_path, Clock())
+    assert service.profile('alice').categories == ('Finance',)
+    other.subscribe(SubscriptionProfile('alice', ('Tech',), 0.2, 5))
+    assert service.profile('alice').categories == ('Finance',)
+    clock.now = 11.0
+    assert service.profile('alice') == SubscriptionProfile('alice', ('Tech',), 0.2, 5)
+
+
+def test_concurrent_read_does_not_recache_a_stale_profile(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'news.db')
+    news_repo.save_subscription(db_path, 'alice', ['Finance'], 0.0, 10)
+    service = _service(db_path, Clock())
+    fetched, release = threading.Event(), threading.Event()
+    fetch = news_repo.fetch_subscription
+
+    def slow_fetch(*args):
+        stored = fetch(*args)
+        fetched.set()
+        release.wait(5)
+        return stored
+
+    monkeypatch.setattr(news_repo, 'fetch_subscription', slow_fetch)
+    reader = threading.Thread(target=service.profile, args=('alice',))
+    reader.start()
+    fetched.wait(5)
+    writer = threading.Thread(target=service.subscribe, args=(SubscriptionProfile('alice', ('Tech',)),))
+    writer.start()
+    release.set()
+    reader.join()
+    writer.join()
+    assert service.profile('alice').categories == ('Tech',)
+
+
+def test_in_memory_profiles_are_kept_and_misses_not_cached():
+    service = DigestService(CategoryTopicCache(os.devnull, loader=lambda c, n: []), ['Finance'], max_profiles=1)
+    service.subscribe(SubscriptionProfile('alice', ('Tech',)))
+    service.subscribe(SubscriptionProfile('bob', ('World',)))
+    service.profile('carol')
+    assert service.profile('alice').categories == ('Tech',)
+    assert list(service._profiles) == ['bob', 'alice']
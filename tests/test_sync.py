@@ -0,0 +1,94 @@
+"""TransactionSyncEngine deltas and GET /banks/transactions with a deterministic fake provider."""
+
+from fastapi.testclient import TestClient
+
+from packages.banks import BankProvider, TransactionSyncEngine
+
+
+class FakeProvider(BankProvider):
+    """Two accounts whose histories grow by appending to ``history``."""
+
+    def __init__(self):
+        self.history = {
+            'acc-1': [self.tx('acc-1', i, f'2024-01-0{i + 1}') for i in range(3)],
+            'acc-2': [self.tx('acc-2', 0, '2024-01-01')],
+        }
+        self.calls = []
+        self.fail = False
+
+    @staticmethod
+    def tx(account_id, i, date, amount=-10.0):
+        return {'id': f'{account_id}-{i}', 'account_id': account_id, 'date': date, 'amount': amount, 'description': f'tx {i}'}
+
+    def get_accounts(self):
+        return [{'account_id': account_id} for account_id in self.history]
+
+    def get_balances(self):
+        return []
+
+    def get_transactions(self, account_id):
+        self.calls.append(account_id)
+        if self.fail:
+            raise RuntimeError('provider down')
+        return list(self.history.get(account_id, []))
+
+
+def test_initial_sync_then_delta(tmp_path):
+    engine = TransactionSyncEngine(str(tmp_path / 'bank.db'))
+    provider = FakeProvider()
+    results = engine.sync_all({'fake': provider})
+    assert {(r.account_id, r.fetched, r.cursor) for r in results} == {('acc-1', 3, '2024-01-03'), ('acc-2', 1, '2024-01-01')}
+
+    provider.history['acc-1'].append(provider.tx('acc-1', 3, '2024-01-05'))
+    result = engine.sync_account('fake', provider, 'acc-1')
+    # Only the boundary day and newer are re-fetched
+    assert (result.fetched, result.cursor) == (2, '2024-01-05')
+    assert [tx['id'] for tx in engine.transactions('acc-1')] == ['acc-1-3', 'acc-1-2', 'acc-1-1', 'acc-1-0']
+
+
+def test_failed_sync_keeps_cursor(tmp_path):
+    engine = TransactionSyncEngine(str(tmp_path / 'bank.db'))
+    provider = FakeProvider()
+    engine.sync_account('fake', provider, 'acc-1')
+    provider.fail = True
+    result = engine.sync_account('fake', provider, 'acc-1')
+    assert result.error == 'provider down' and result.cursor == '2024-01-03'
+    assert len(engine.transactions('acc-1')) == 3
+
+
+def test_transactions_route_syncs_once_and_validates_limit(api):
+    provider = FakeProvider()
+    with TestClient(api.app) as client:
+        registry = client.app.state.bank_registry
+        for name in registry.names:
+            registry.register(name, lambda user_id, session, tokens: provider)
+
+        response = client.get('/banks/transactions/acc-1', params={'limit': 2})
+        assert response.status_code == 200
+        assert [tx['id'] for tx in response.json()] == ['acc-1-2', 'acc-1-1']
+        calls = len(provider.calls)
+        response = client.get('/banks/transactions/acc-1', params={'since': '2024-01-02'})
+        assert [tx['id'] for tx in response.json()] == ['acc-1-2', 'acc-1-1']
+        # Served from the ledger without contacting the provider
+        assert len(provider.calls) == calls
+
+        for limit in (-1, 0, 1001):
+            assert client.get('/banks/transactions/acc-1', params={'limit': limit}).status_code == 422
+
+
+def test_unknown_account_syncs_each_provider_once_then_404s(api):
+    provider = FakeProvider()
+    listed = []
+    get_accounts = provider.get_accounts
+    provider.get_accounts = lambda: listed.append(1) or get_accounts()
+    with TestClient(api.app) as client:
+        registry = client.app.state.bank_registry
+        for name in registry.names:
+            registry.register(name, lambda user_id, session, tokens: provider)
+
+        for _ in range(5):
+            assert client.get('/banks/transactions/does-not-exist').status_code == 404
+        assert len(listed) == len(registry.names)
+        # Listed accounts are served from that one sync
+        assert client.get('/banks/transactions/acc-2').json()[0]['id'] == 'acc-2-0'
+        assert len(listed) == len(registry.names)
@@ -0,0 +1,30 @@
+"""SyntheticBankProvider: determinism, date spread and weekday effects."""
+
+from collections import Counter
+
+from packages.banks import SyntheticBankProvider
+from packages.banks.synthetic import _WEEKDAY_TABLES
+
+
+def test_histories_are_seeded_and_chronological():
+    a = list(SyntheticBankProvider('u', seed=3, transactions_per_account=500).iter_transactions('u-acc-00'))
+    b = list(SyntheticBankProvider('u', seed=3, transactions_per_account=500).iter_transactions('u-acc-00'))
+    assert a == b
+    dates = [tx['date'] for tx in a]
+    assert dates == sorted(dates)
+
+
+def test_transactions_are_spread_evenly_up_to_the_last_day():
+    provider = SyntheticBankProvider('u', accounts=2, transactions_per_account=36_500, days=365)
+    days = Counter(tx['date'] for tx in provider.iter_transactions('u-acc-01'))
+    assert min(days) >= provider.start_date.isoformat()
+    assert max(days) == provider.end_date.isoformat()
+    # 100 per day on average; the old clamping piled the overshoot onto the last day
+    assert days[provider.end_date.isoformat()] < 200
+    assert len(days) == 365
+
+
+def test_only_saturday_and_sunday_are_boosted():
+    weekdays = {tuple(table) for table in _WEEKDAY_TABLES[:5]}
+    assert len(weekdays) == 1
+    assert _WEEKDAY_TABLES[5] == _WEEKDAY_TABLES[6] != _WEEKDAY_TABLES[4]
@@ -0,0 +1,77 @@
+"""VectorStore keys, concurrency, single writer and automatic compaction."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from packages.news.features import HashedTfidfVectorizer
+from packages.news.vectorstore import VectorStore, article_key
+
+N_FEATURES = 2 ** 12
+
+
+def _texts(n, prefix='story'):
+    return [f'{prefix} {i} about markets and elections number {i}' for i in range(n)]
+
+
+def test_empty_and_repeated_links_do_not_share_vectors(tmp_path):
+    store = VectorStore(str(tmp_path / 'vectors'), N_FEATURES)
+    vectorizer = HashedTfidfVectorizer(N_FEATURES)
+    texts = ['rates rise again', 'football final tonight', 'rates rise again']
+    links = ['', '', 'https://example.com/a']
+    ids = [article_key(link, text) for link, text in zip(links, texts)]
+    vectors = store.vectors_for(ids, texts, vectorizer).toarray()
+    assert abs(vectors[0] - vectors[1]).sum() > 0
+    np.testing.assert_allclose(vectors[2], vectors[0])
+    assert len(store) == 3
+
+    # Same link, different text: not the stored vector
+    assert article_key('https://example.com/a', 'completely different text') not in store
+    # Empty IDs are vectorised but never stored
+    assert store.vectors_for(['', ''], ['rates fall', 'rates fall'], vectorizer).shape[0] == 2
+    assert len(store) == 3
+
+
+def test_concurrent_calls_count_each_article_once(tmp_path):
+    store = VectorStore(str(tmp_path / 'vectors'), N_FEATURES)
+    vectorizer = HashedTfidfVectorizer(N_FEATURES)
+    texts = _texts(50)
+    ids = [article_key(f'https://example.com/{i}', text) for i, text in enumerate(texts)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: store.vectors_for(ids, texts, vectorizer), range(16)))
+    assert vectorizer.n_documents == 50
+    assert len(store) == 50
+
+
+def test_single_writer_and_reader_refresh(tmp_path):
+    directory = str(tmp_path / 'vectors')
+    owner = VectorStore(directory, N_FEATURES)
+    reader = VectorStore(directory, N_FEATURES)
+    assert owner.owner and not reader.owner
+    vectorizer = HashedTfidfVectorizer(N_FEATURES)
+    texts = _texts(10)
+    ids = [article_key('', text) for text in texts]
+
+    reader.vectors_for(ids, texts, vectorizer)
+    assert len(reader) == 0 and len(owner) == 0
+    owner.vectors_for(ids, texts, vectorizer)
+    reader.refresh()
+    assert len(reader) == 10 and all(article_id in reader for article_id in ids)
+    owner.close()
+    assert reader.owner
+
+
+def test_compacts_past_max_shards(tmp_path):
+    directory = tmp_path / 'vectors'
+    store = VectorStore(str(directory), N_FEATURES, max_shards=4)
+    vectorizer = HashedTfidfVectorizer(N_FEATURES)
+    texts = _texts(12)
+    ids = [article_key('', text) for text in texts]
+    returned = [store.vectors_for(ids[i:i + 1], texts[i:i + 1], vectorizer).toarray()[0] for i in range(12)]
+    assert len(store._shards) <= 4
+    assert store.ids() == ids
+    np.testing.assert_allclose(store.get(ids).toarray(), np.vstack(returned))
+    reader = VectorStore(str(directory), N_FEATURES)
+    assert reader.ids() == ids
+    # Shard files of merged shards are removed
+    assert len(list(directory.glob('*.ids'))) == len(store._shards)
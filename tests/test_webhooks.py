@@ -0,0 +1,171 @@
+"""Webhook verification, parsing and queueing."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from packages.banks import BankProvider, ledger
+from packages.banks.sync import TransactionSyncEngine
+from packages.banks.webhooks import (
+    SIGNATURE_HEADER,
+    HMACVerifier,
+    WebhookEvent,
+    WebhookIngestor,
+    WebhookVerificationError,
+    parse_event,
+)
+
+NOW = 1_700_000_000.0
+
+
+class CountingProvider(BankProvider):
+    """Two accounts; counts the delta fetches per account."""
+
+    def __init__(self):
+        self.fetches = {}
+
+    def get_accounts(self):
+        return [{'account_id': 'acc-1'}, {'account_id': 'acc-2'}]
+
+    def get_balances(self):
+        return []
+
+    def get_transactions(self, account_id):
+        return [{'id': f'{account_id}-0', 'account_id': account_id, 'date': '2024-01-01', 'amount': -1.0}]
+
+    def get_transactions_since(self, account_id, cursor=None):
+        self.fetches[account_id] = self.fetches.get(account_id, 0) + 1
+        return super().get_transactions_since(account_id, cursor)
+
+
+def _verifier():
+    return HMACVerifier('secret', clock=lambda: NOW)
+
+
+def test_verify_accepts_signed_body_and_rejects_tampering():
+    verifier = _verifier()
+    body = b'{"event_id": "evt-1"}'
+    headers = {SIGNATURE_HEADER: verifier.sign(body)}
+    verifier.verify(headers, body)
+    with pytest.raises(WebhookVerificationError, match='Invalid'):
+        verifier.verify(headers, body + b' ')
+    with pytest.raises(WebhookVerificationError, match='expired'):
+        verifier.verify({SIGNATURE_HEADER: verifier.sign(body, NOW - 301)}, body)
+
+
+@pytest.mark.parametrize('header', ['t=1700000000,v1=é', 't=1700000000,v1=ÿ' * 2, 't=abc,v1=00', 'v1=00'])
+def test_verify_rejects_malformed_signatures(header):
+    with pytest.raises(WebhookVerificationError):
+        _verifier().verify({SIGNATURE_HEADER: header}, b'{}')
+
+
+def test_parse_event_reads_accounts():
+    event = parse_event('demo', json.dumps({'id': 'evt-1', 'account_ids': ['a', 7]}).encode(), {}, 'user')
+    assert event.account_ids == ('a', '7')
+    assert event.user_id == 'user'
+    single = parse_event('demo', json.dumps({'id': 'evt-2', 'account_id': 'acc-001'}).encode(), {}, 'user')
+    assert single.account_ids == ('acc-001',)
+
+
+@pytest.mark.parametrize('accounts', [5, 'abc', {'a': 1}, [['a']], [None], [True]])
+def test_parse_event_rejects_malformed_accounts(accounts):
+    with pytest.raises(ValueError, match='account'):
+        parse_event('demo', json.dumps({'id': 'evt-1', 'account_ids': accounts}).encode(), {}, 'user')
+
+
+def test_webhook_route_rejects_malformed_requests(api, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    # The API's own class, so its WebhookVerificationError is the one the route catches
+    verifier = api.HMACVerifier('secret')
+    monkeypatch.setitem(api.BANK_WEBHOOK_VERIFIERS, 'demo', verifier)
+    body = json.dumps({'event_id': 'evt-1', 'account_ids': 5}).encode()
+    with TestClient(api.app) as client:
+        response = client.post('/banks/webhooks/demo', content=body, headers={SIGNATURE_HEADER: verifier.sign(body)})
+        bad = client.post('/banks/webhooks/demo', content=b'{}', headers={SIGNATURE_HEADER: 't=1,v1=é'.encode('latin-1')})
+    assert response.status_code == 400
+    assert bad.status_code == 401
+
+
+def test_concurrent_submits_never_drop_a_retry_as_duplicate(tmp_path, monkeypatch):
+    engine = TransactionSyncEngine(str(tmp_path / 'bank.db'))
+    ingestor = WebhookIngestor(engine, lambda user_id, names: {}, max_queue=1)
+    release = threading.Event()
+    record = ledger.record_webhook_event
+
+    def slow_record(*args):
+        # Hold the first caller until the second one has been turned away
+        release.wait(5)
+        return record(*args)
+
+    monkeypatch.setattr(ledger, 'record_webhook_event', slow_record)
+    events = [WebhookEvent('demo', f'evt-{i}', 'user') for i in range(2)]
+
+    async def main():
+        first = asyncio.create_task(ingestor.submit(events[0]))
+        await asyncio.sleep(0.05)
+        with pytest.raises(asyncio.QueueFull):
+            await ingestor.submit(events[1])
+        release.set()
+        assert await first
+        ingestor.queue.get_nowait()
+        # The provider's retry of the refused event is queued, not a duplicate
+        assert await ingestor.submit(events[1])
+
+    asyncio.run(main())
+    assert ingestor.counters['duplicates'] == 0
+
+
+def _ingest(tmp_path, events, **kwargs):
+    """Submit ``events``, run the ingestor until the queue is drained, and return it."""
+    provider = CountingProvider()
+    engine = TransactionSyncEngine(str(tmp_path / 'bank.db'))
+    ingestor = WebhookIngestor(
+        engine, lambda user_id, names: {name: provider for name in names if name == 'demo'}, **kwargs
+    )
+
+    async def main():
+        for event in events:
+            await ingestor.submit(event)
+        worker = asyncio.create_task(ingestor.run())
+        await asyncio.wait_for(ingestor.drain(), 5)
+        ingestor.stop()
+        await worker
+
+    asyncio.run(main())
+    return ingestor, provider
+
+
+def test_batch_fetches_each_account_once(tmp_path):
+    events = [WebhookEvent('demo', f'evt-{i}', 'user', ('acc-1',)) for i in range(4)]
+    events.append(WebhookEvent('demo', 'evt-4', 'user', ('acc-1', 'acc-2')))
+    ingestor, provider = _ingest(tmp_path, events, max_delay=0.05)
+    assert provider.fetches == {'acc-1': 1, 'acc-2': 1}
+    assert ingestor.counters['batches'] == 1
+    assert ingestor.counters['accounts_synced'] == 2
+    assert ingestor.stats()['queued'] == 0
+
+
+def test_run_drains_queue_in_batches_of_max_batch(tmp_path):
+    events = [WebhookEvent('demo', f'evt-{i}', 'user', ('acc-1',)) for i in range(5)]
+    ingestor, provider = _ingest(tmp_path, events, max_batch=2, max_delay=0.05)
+    assert ingestor.counters['batches'] == 3
+    assert provider.fetches == {'acc-1': 3}
+
+
+def test_event_without_accounts_syncs_whole_provider(tmp_path):
+    events = [WebhookEvent('demo', 'evt-0', 'user', ('acc-1',)), WebhookEvent('demo', 'evt-1', 'user')]
+    ingestor, provider = _ingest(tmp_path, events, max_delay=0.05)
+    # The provider-wide sync covers the named account too
+    assert provider.fetches == {'acc-1': 1, 'acc-2': 1}
+    assert ledger.fetch_sync_state(ingestor.engine.db_path, 'demo', ledger.PROVIDER_MARKER) is not None
+
+
+def test_events_from_unknown_providers_are_skipped(tmp_path):
+    events = [WebhookEvent('other', 'evt-0', 'user', ('acc-1',)), WebhookEvent('demo', 'evt-1', 'user', ('acc-2',))]
+    ingestor, provider = _ingest(tmp_path, events, max_delay=0.05)
+    assert provider.fetches == {'acc-2': 1}
+    assert ingestor.counters['accounts_synced'] == 1
+    assert ingestor.counters['errors'] == 0
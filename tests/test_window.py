@@ -0,0 +1,104 @@
+"""ArticleWindow eviction, topic aggregates, locking and pipeline scoring."""
+
+import threading
+from datetime import datetime, timedelta
+
+from packages.news.datatypes import Article
+from packages.news.pipeline import run_pipeline
+from packages.news.sample_data import load_sample_articles
+from packages.news.score import score_clusters
+from packages.news.window import ArticleWindow
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+def _article(i, hours_ago, publisher='pub', category='Finance'):
+    return Article(
+        title=f'title {i}', link=f'https://example.com/{i}', published=NOW - timedelta(hours=hours_ago),
+        publisher=publisher, description=f'description {i}', category=category,
+    )
+
+
+def test_evicts_expired_articles_and_their_topics():
+    window = ArticleWindow(clock=lambda: NOW)
+    assert window.add([_article(i, hours_ago=30 - i * 2) for i in range(10)]) == 7
+    window.assign(['https://example.com/3', 'https://example.com/4'], 'topic-a')
+    assert window.topics['topic-a'].count == 2
+    assert window.evict(now=NOW + timedelta(hours=1)) == 1
+    assert window.topics['topic-a'].count == 1
+    window.evict(now=NOW + timedelta(hours=3))
+    assert 'topic-a' not in window.topics
+    assert [a.link for a in window.articles()][0] == 'https://example.com/5'
+
+
+def test_score_topics_matches_score_clusters():
+    articles = load_sample_articles()
+    window = ArticleWindow(horizon=timedelta(days=3650))
+    window.add(articles)
+    batch = window.batch()
+    clusters = [batch.take([i, i + 1]) for i in range(0, len(batch) - 1, 2)]
+    topics = window.assign_clusters(clusters)
+    expected = [sorted(c.link) for c, _ in score_clusters(clusters)]
+    ranked = dict(zip(topics, clusters))
+    assert [sorted(ranked[topic].link) for topic, _ in window.score_topics()] == expected
+
+
+def test_concurrent_add_and_evict_keep_aggregates_consistent():
+    clock = [NOW]
+    window = ArticleWindow(horizon=timedelta(hours=1), clock=lambda: clock[0])
+    articles = [_article(i, hours_ago=-i / 600, publisher=f'p{i % 7}') for i in range(6000)]
+
+    def producer():
+        for start in range(0, len(articles), 100):
+            window.add(articles[start:start + 100])
+            window.assign([a.link for a in articles[start:start + 100]], f'topic-{start // 300}')
+
+    def evictor():
+        for step in range(200):
+            window.evict(now=NOW + timedelta(minutes=step // 2))
+
+    threads = [threading.Thread(target=producer), threading.Thread(target=evictor)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(stats.count for stats in window.topics.values()) == len(window)
+
+
+def test_pipeline_ranks_window_topics_in_both_scopes():
+    for scope in ('category', 'global'):
+        window = ArticleWindow(horizon=timedelta(days=3650))
+        results = run_pipeline(articles=load_sample_articles(), window=window, scope=scope)
+        assert window.topics
+        for topics in results.values():
+            importances = [topic['importance'] for topic in topics]
+            assert importances == sorted(importances, reverse=True)
+
+
+def test_latest_falls_back_when_newest_article_changes_topic():
+    window = ArticleWindow(clock=lambda: NOW)
+    window.add([_article(i, hours_ago=10 - i) for i in range(3)])
+    window.assign([f'https://example.com/{i}' for i in range(3)], 'topic-a')
+    assert window.topics['topic-a'].latest == NOW - timedelta(hours=8)
+    window.assign(['https://example.com/2'], 'topic-b')
+    assert window.topics['topic-a'].latest == NOW - timedelta(hours=9)
+    assert window.topics['topic-b'].latest == NOW - timedelta(hours=8)
+    window.assign(['https://example.com/2'], 'topic-a')
+    assert window.topics['topic-a'].latest == NOW - timedelta(hours=8)
+
+
+def test_score_topics_normalises_over_requested_topics_only():
+    window = ArticleWindow(clock=lambda: NOW)
+    window.add([
+        _article(0, hours_ago=20, publisher='a'), _article(1, hours_ago=20, publisher='b'),
+        _article(2, hours_ago=20, publisher='c'), _article(3, hours_ago=4, publisher='a'),
+        _article(4, hours_ago=2, publisher='a'),
+    ])
+    window.assign(['https://example.com/0', 'https://example.com/1', 'https://example.com/2'], 'stale')
+    window.assign(['https://example.com/3'], 'older')
+    window.assign(['https://example.com/4'], 'newer')
+    scores = dict(window.score_topics(topics=['older', 'newer', 'gone']))
+    assert set(scores) == {'older', 'newer'}
+    # Coverage normalises to 1 and age to the older topic's 4 hours
+    assert scores['newer'] == 0.7 + 0.3 * 0.5
+    assert scores['older'] == 0.7